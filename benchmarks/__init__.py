@@ -0,0 +1 @@
+"""本地性能基准脚本，不参与正式挂课/考试流程。"""
@@ -0,0 +1,152 @@
+"""
+用本地 OpenAI 接口桩测量 AI 考试每道题的耗时，对比不同并发数和请求方式。
+
+用法:
+    python -m benchmarks.ai_exam --questions 20 --concurrency 1,5,10
+    python -m benchmarks.ai_exam --request-types chat --latency-ms 1500 --tokens-per-second 30 --reasoning-tokens 200
+    python -m benchmarks.ai_exam --requests-only --error-rate 0.1 --seed 1
+
+默认在 benchmarks/fake_platform.py 的模拟试卷页上运行 ai_exam（需要本机可用的 Playwright 浏览器），
+耗时包含提取题目、等待 AI 作答、点击选项和交卷；--requests-only 时不启动浏览器，只按
+AI_EXAM_CONCURRENCY 的方式并发调用 get_ai_answers，用于单独观察接口往返和流式读取的开销。
+AI 请求经由真实的 AsyncOpenAI 客户端发往接口桩，接口桩默认按试卷标准答案作答；答案缓存不启用。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from openai import AsyncOpenAI
+from playwright.async_api import async_playwright
+
+from benchmarks.fake_platform import FakeExam, FakePlatform
+from benchmarks.openai_stub import add_stub_arguments, run_stub_server, settings_from_args
+from core.browser import launch_async_browser
+from core.exam_answers import get_ai_answers
+from core.exam_flow import ai_exam
+
+STUB_MODEL = "stub-model"
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _question_data(exam: FakeExam) -> list[dict]:
+    questions = []
+    for index, question in enumerate(exam.questions):
+        if question.type == "judge":
+            options = [{"label": "T", "text": "正确"}, {"label": "F", "text": "错误"}]
+        else:
+            options = [
+                {"label": chr(ord("A") + option_index), "text": text}
+                for option_index, text in enumerate(question.options)
+            ]
+        questions.append({"index": index, "type": question.type, "text": question.stem, "options": options})
+    return questions
+
+
+async def _answer_questions(client, questions: list[dict], concurrency: int) -> list[list[str]]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def answer(question_data):
+        async with semaphore:
+            return await get_ai_answers(client, STUB_MODEL, question_data)
+
+    return await asyncio.gather(*(answer(question_data) for question_data in questions))
+
+
+async def _run_requests_only(client, exam: FakeExam, concurrency: int) -> int:
+    answers = await _answer_questions(client, _question_data(exam), concurrency)
+    correct = sum(
+        1 for question, answer in zip(exam.questions, answers) if answer == question.answer_labels()
+    )
+    return round(correct * 100 / len(exam.questions)) if exam.questions else 100
+
+
+async def _run_paper(context, client, exam: FakeExam) -> int:
+    page = await context.new_page()
+    try:
+        await page.goto(exam.url, wait_until="load")
+        await ai_exam(client, STUB_MODEL, page, exam.url, auto_submit=True)
+    finally:
+        await page.close()
+    return exam.last_score
+
+
+async def run_benchmark(args) -> None:
+    platform = FakePlatform(
+        courses=0,
+        subjects=1,
+        subject_courses=0,
+        questions=args.questions,
+        exam_mode=args.exam_mode,
+        latency_ms=args.platform_latency_ms,
+    )
+    exam = next(iter(platform.exams.values()))
+    settings = settings_from_args(args)
+
+    with ExitStack() as stack:
+        server = stack.enter_context(run_stub_server(settings, answer_key=platform.answer_for))
+        client = AsyncOpenAI(api_key="stub", base_url=server.base_url)
+        context = None
+        browser = None
+        playwright_manager = None
+        if not args.requests_only:
+            playwright_manager = async_playwright()
+            playwright = await playwright_manager.start()
+            browser = await launch_async_browser(playwright, headless=not args.headed)
+            context = await browser.new_context()
+            await platform.install(context)
+
+        try:
+            for request_type in _csv(args.request_types):
+                for concurrency in (int(value) for value in _csv(args.concurrency)):
+                    server.stats.reset()
+                    with patch("core.exam_answers.AI_REQUEST_TYPE", request_type), patch(
+                        "core.exam_flow.AI_EXAM_CONCURRENCY", concurrency
+                    ):
+                        started_at = time.perf_counter()
+                        if args.requests_only:
+                            score = await _run_requests_only(client, exam, concurrency)
+                        else:
+                            score = await _run_paper(context, client, exam)
+                        elapsed = time.perf_counter() - started_at
+                    stats = server.stats
+                    per_question = elapsed / len(exam.questions) if exam.questions else 0
+                    print(
+                        f"{request_type} 并发 {concurrency}: {len(exam.questions)} 题, 耗时 {elapsed:.2f} 秒, "
+                        f"每题 {per_question:.2f} 秒, 接口请求 {stats.requests} 次（失败 {stats.errors}）, "
+                        f"得分 {score}"
+                    )
+        finally:
+            await client.close()
+            if browser is not None:
+                await browser.close()
+            if playwright_manager is not None:
+                await playwright_manager.__aexit__(None, None, None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--exam-mode", choices=("multi", "single"), default="multi")
+    parser.add_argument("--concurrency", default="1,5,10", help="逗号分隔的 AI_EXAM_CONCURRENCY 取值")
+    parser.add_argument("--request-types", default="responses,chat", help="逗号分隔的 AI_REQUEST_TYPE 取值")
+    parser.add_argument("--platform-latency-ms", type=int, default=50, help="模拟平台接口响应延迟（毫秒）")
+    parser.add_argument("--requests-only", action="store_true", help="不启动浏览器，只测 AI 请求")
+    parser.add_argument("--headed", action="store_true", help="以有界面模式运行浏览器")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
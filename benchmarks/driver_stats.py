@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DriverRoundTrips:
+    count: int = 0
+    by_method: Counter = field(default_factory=Counter)
+    # 各协议方法从发出到返回的累计耗时，并发标签页的耗时会叠加
+    seconds_by_method: Counter = field(default_factory=Counter)
+
+    def seconds_for(self, predicate) -> float:
+        return sum(seconds for method, seconds in self.seconds_by_method.items() if predicate(method))
+
+
+@contextmanager
+def count_driver_round_trips():
+    """统计 Playwright 客户端发往驱动进程的请求次数（依赖内部实现，仅用于基准测试）。"""
+    from playwright._impl._connection import Channel
+
+    stats = DriverRoundTrips()
+    original_inner_send = Channel._inner_send
+
+    async def counting_inner_send(self, method, *args, **kwargs):
+        stats.count += 1
+        stats.by_method[method] += 1
+        started_at = time.perf_counter()
+        try:
+            return await original_inner_send(self, method, *args, **kwargs)
+        finally:
+            stats.seconds_by_method[method] += time.perf_counter() - started_at
+
+    Channel._inner_send = counting_inner_send
+    try:
+        yield stats
+    finally:
+        Channel._inner_send = original_inner_send
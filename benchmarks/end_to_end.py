@@ -0,0 +1,246 @@
+"""
+在本地模拟平台上端到端运行 run_afk_once 和 run_ai_exam_batch，统计墙钟耗时、驱动往返和等待开销。
+
+用法:
+    python -m benchmarks.end_to_end
+    python -m benchmarks.end_to_end --courses 4 --chapters 3 --play-seconds 5 --concurrency 2
+    python -m benchmarks.end_to_end --exam-mode single --latency-ms 200 --ai-latency-ms 800 --pace-ms 0
+
+模拟平台见 benchmarks/fake_platform.py：通过 context.route 接管平台域名，无需网络和登录凭证。
+运行期间队列只保存在内存中，不读写项目目录下的队列文件；答案缓存关闭，AI 作答由平台答案
+代替（可用 --ai-latency-ms 模拟模型耗时）。接口预检和最长优先排序依赖真实平台接口，基准中关闭。
+
+指标说明:
+    驱动往返: Playwright 客户端发往驱动进程的请求次数，按协议方法统计最多的几项
+    视频内容时长: 平台侧至少有一个视频在播放的时长，挂课开销 = 墙钟耗时 - 视频内容时长
+    固定等待: waitForTimeout 累计耗时；条件等待: 其余 waitFor* 累计耗时；
+    节奏等待: AFK_PACING 按操作类型插入的等待；三项均为各标签页累计值
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from playwright.async_api import async_playwright
+
+from benchmarks.driver_stats import DriverRoundTrips, count_driver_round_trips
+from benchmarks.fake_platform import FakePlatform
+from core.afk_runner import run_afk_once
+from core.browser import build_browser_context_options, launch_async_browser
+from core.config import AFK_PACING, EXAM_URLS_FILE, LEARNING_URLS_FILE
+from core.exam_queue import read_exam_urls
+from core.exam_runner import run_ai_exam_batch
+from core.learning_queue import write_learning_urls
+from core.queue_store import QueueStore, use_queue_store
+
+TOP_METHODS = 5
+
+
+class _LocalBrowserSession:
+    """让 create_browser_context 复用已接入模拟平台的浏览器上下文。"""
+
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+
+    async def acquire(self, *args, **kwargs):
+        return self.browser, self.context
+
+
+class _MemoryQueueStore(QueueStore):
+    """只在内存中保存队列，不读写项目目录下的真实队列文件。"""
+
+    def read(self, file_path, loader):
+        return super().read(file_path, lambda _path: [])
+
+    def write(self, file_path, entries, persist):
+        super().write(file_path, entries, lambda _entries: None)
+
+
+class _PacingLedger(dict):
+    """替换 AFK_PACING，记录 pace() 插入的等待时长。"""
+
+    def __init__(self, delays):
+        super().__init__(delays)
+        self.seconds = 0.0
+
+    def __getitem__(self, action):
+        delay_ms = super().__getitem__(action)
+        self.seconds += delay_ms / 1000
+        return delay_ms
+
+
+@dataclass
+class PhaseResult:
+    wall_seconds: float
+    round_trips: DriverRoundTrips
+    pacing_seconds: float
+    api_requests: int
+    ai_seconds: float = 0.0
+
+
+def _answer_key(platform: FakePlatform, latency: float, ledger: list[float]):
+    async def get_answers(client, model, question_data):
+        started_at = time.perf_counter()
+        if latency:
+            await asyncio.sleep(latency)
+        answers = platform.answer_for(question_data["text"])
+        ledger.append(time.perf_counter() - started_at)
+        return answers
+
+    return get_answers
+
+
+async def _measure_phase(run, platform: FakePlatform, pacing: _PacingLedger, ai_ledger: list[float]):
+    pacing.seconds = 0.0
+    ai_ledger.clear()
+    api_requests = platform.api_requests
+    with count_driver_round_trips() as stats:
+        started_at = time.perf_counter()
+        await run()
+        wall_seconds = time.perf_counter() - started_at
+    return PhaseResult(
+        wall_seconds=wall_seconds,
+        round_trips=stats,
+        pacing_seconds=pacing.seconds,
+        api_requests=platform.api_requests - api_requests,
+        ai_seconds=sum(ai_ledger),
+    )
+
+
+def _print_waits(result: PhaseResult) -> None:
+    stats = result.round_trips
+    fixed = stats.seconds_for(lambda method: method == "waitForTimeout")
+    conditional = stats.seconds_for(
+        lambda method: method.startswith("waitFor") and method != "waitForTimeout"
+    )
+    print(
+        f"  固定等待 {fixed:.1f} 秒, 条件等待 {conditional:.1f} 秒, "
+        f"节奏等待 {result.pacing_seconds:.1f} 秒（各标签页累计）"
+    )
+
+
+def _print_round_trips(result: PhaseResult, unit: str, units: int) -> None:
+    stats = result.round_trips
+    per_unit = stats.count / units if units else 0
+    top = ", ".join(f"{method} {count}" for method, count in stats.by_method.most_common(TOP_METHODS))
+    print(f"  驱动往返 {stats.count} 次（每{unit} {per_unit:.0f} 次）, 最多: {top}")
+    print(f"  平台接口请求 {result.api_requests} 次")
+
+
+def _print_report(platform: FakePlatform, afk: PhaseResult, exam: PhaseResult | None, exam_count: int) -> None:
+    learning_count = len(platform.learning_urls())
+    content = platform.playback.busy_seconds()
+    print(
+        f"挂课: {learning_count} 条学习链接, {platform.video_chapter_count()} 个视频章节, "
+        f"墙钟 {afk.wall_seconds:.1f} 秒"
+    )
+    _print_round_trips(afk, "条学习链接", learning_count)
+    print(
+        f"  视频内容时长 {content:.1f} 秒, 挂课开销 {max(0.0, afk.wall_seconds - content):.1f} 秒"
+    )
+    _print_waits(afk)
+
+    if exam is None:
+        print("AI 考试: 挂课后没有待考链接")
+        return
+    attempted = [item for item in platform.exams.values() if item.attempts]
+    passed = sum(1 for item in attempted if item.passed)
+    question_count = sum(len(item.questions) for item in attempted)
+    print(
+        f"AI 考试: {exam_count} 条考试链接, {question_count} 道题, 墙钟 {exam.wall_seconds:.1f} 秒, "
+        f"通过 {passed}/{len(attempted)}"
+    )
+    _print_round_trips(exam, "条考试链接", exam_count)
+    print(f"  AI 作答等待 {exam.ai_seconds:.1f} 秒（各题累计）")
+    _print_waits(exam)
+
+
+async def run_benchmark(args) -> None:
+    platform = FakePlatform(
+        courses=args.courses,
+        subjects=args.subjects,
+        subject_courses=args.subject_courses,
+        chapters=args.chapters,
+        video_seconds=args.video_seconds,
+        play_seconds=args.play_seconds,
+        questions=args.questions,
+        exam_mode=args.exam_mode,
+        rating_popup=args.rating_popup,
+        latency_ms=args.latency_ms,
+    )
+    delays = dict(AFK_PACING)
+    if args.pace_ms is not None:
+        delays = {action: max(0, args.pace_ms) for action in delays}
+    pacing = _PacingLedger(delays)
+    ai_ledger: list[float] = []
+    headless = not args.headed
+
+    async with async_playwright() as playwright:
+        browser = await launch_async_browser(playwright, headless=headless)
+        try:
+            context = await browser.new_context(**build_browser_context_options(headless=headless))
+            await platform.install(context)
+            with ExitStack() as stack:
+                stack.enter_context(use_queue_store(_MemoryQueueStore()))
+                for target, value in (
+                    ("core.browser._ACTIVE_BROWSER_SESSION", _LocalBrowserSession(browser, context)),
+                    ("core.pacing.AFK_PACING", pacing),
+                    ("core.afk_runner.AFK_PREFILTER", False),
+                    ("core.afk_runner.AFK_LONGEST_FIRST", False),
+                    ("core.answer_cache.AI_ANSWER_CACHE_ENABLED", False),
+                    ("core.exam_runner._build_exam_client", lambda: (None, "fake-platform")),
+                    (
+                        "core.exam_flow.get_ai_answers",
+                        _answer_key(platform, max(0, args.ai_latency_ms) / 1000, ai_ledger),
+                    ),
+                ):
+                    stack.enter_context(patch(target, value))
+
+                write_learning_urls(platform.learning_urls(), file_path=LEARNING_URLS_FILE)
+                afk = await _measure_phase(
+                    lambda: run_afk_once(concurrency=args.concurrency),
+                    platform,
+                    pacing,
+                    ai_ledger,
+                )
+                exam_count = len(read_exam_urls(EXAM_URLS_FILE))
+                exam = None
+                if exam_count:
+                    exam = await _measure_phase(run_ai_exam_batch, platform, pacing, ai_ledger)
+        finally:
+            await browser.close()
+
+    _print_report(platform, afk, exam, exam_count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--courses", type=int, default=2, help="单独课程数量，每门课程带一场课后考试")
+    parser.add_argument("--subjects", type=int, default=1, help="主题数量，每个主题带一场主题考试")
+    parser.add_argument("--subject-courses", type=int, default=2, help="每个主题内的课程数量")
+    parser.add_argument("--chapters", type=int, default=2, help="每门课程的视频章节数量")
+    parser.add_argument("--video-seconds", type=int, default=60, help="章节显示的视频时长（秒）")
+    parser.add_argument("--play-seconds", type=float, default=3.0, help="平台确认章节学完所需的播放时长（秒）")
+    parser.add_argument("--questions", type=int, default=10, help="每场考试的题目数量，0 表示不生成考试")
+    parser.add_argument("--exam-mode", choices=("multi", "single"), default="multi")
+    parser.add_argument("--rating-popup", action="store_true", help="课程页显示评分弹窗")
+    parser.add_argument("--latency-ms", type=int, default=50, help="平台接口响应延迟（毫秒）")
+    parser.add_argument("--ai-latency-ms", type=int, default=0, help="每道题 AI 作答的模拟耗时（毫秒）")
+    parser.add_argument("--pace-ms", type=int, default=None, help="覆盖 AFK_PACING 的全部间隔（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=1, help="挂课并发标签页数量")
+    parser.add_argument("--headed", action="store_true", help="以有界面模式运行浏览器")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
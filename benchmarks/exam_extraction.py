@@ -0,0 +1,76 @@
+"""
+对比多题目试卷的逐元素提取与批量脚本提取。
+
+用法: python -m benchmarks.exam_extraction --questions 50 --options 5
+需要本机可用的 Playwright 浏览器，默认以无头模式运行。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmarks.driver_stats import count_driver_round_trips
+from core.browser import launch_async_browser
+from core.exam_parsing import (
+    extract_multi_questions_data_bulk,
+    extract_multi_questions_data_by_locator,
+)
+
+
+def build_paper_html(question_count: int, option_count: int) -> str:
+    items = []
+    for index in range(question_count):
+        options = "".join(
+            f'<dd><span class="option-num">{chr(ord("A") + option_index)}.</span>'
+            f'<span class="answer-options">第 {index + 1} 题选项 {option_index + 1}</span></dd>'
+            for option_index in range(option_count)
+        )
+        items.append(
+            f'<div class="question-type-item" data-dynamic-key="q-{index}">'
+            f'<span class="o-score">单选题（2分）</span>'
+            f'<div class="stem-content-main">第 {index + 1} 题题干</div>'
+            f'<dl class="preview-list">{options}</dl>'
+            f"</div>"
+        )
+    return f"<html><body>{''.join(items)}</body></html>"
+
+
+async def _measure(page, extractor) -> tuple[float, int, int]:
+    with count_driver_round_trips() as stats:
+        started_at = time.perf_counter()
+        questions = await extractor(page)
+        elapsed = time.perf_counter() - started_at
+    return elapsed, stats.count, len(questions)
+
+
+async def run_benchmark(question_count: int, option_count: int) -> None:
+    async with async_playwright() as playwright:
+        browser = await launch_async_browser(playwright, headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_paper_html(question_count, option_count))
+
+        for label, extractor in (
+            ("逐元素提取", extract_multi_questions_data_by_locator),
+            ("批量脚本提取", extract_multi_questions_data_bulk),
+        ):
+            elapsed, round_trips, extracted = await _measure(page, extractor)
+            print(
+                f"{label}: {extracted} 题, 耗时 {elapsed:.3f} 秒, 驱动往返 {round_trips} 次"
+            )
+        await browser.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--options", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.questions, args.options))
+
+
+if __name__ == "__main__":
+    main()
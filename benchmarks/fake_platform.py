@@ -0,0 +1,609 @@
+"""
+本地模拟学习平台，供端到端基准测试使用。
+
+通过 context.route 接管 kc.zhixueyun.com 和 www.mylearning.cn 的全部请求，链接格式与真实
+平台一致（课程/主题/试卷链接使用 hash 路由），页面按代码依赖的选择器渲染：
+    主题页: .item.current-hover、.section-type、.finished-status、.inline-block.operation
+    课程页: .top、span.course-title-text、div.course-progress div.progress、
+            dl.chapter-list-box.required[data-sectiontype]、.text-overflow、.section-item-wrapper、
+            .vjs-progress-control、.vjs-duration-display、.tab-container、.neer-status、
+            table.table、.btn.new-radius、评分弹窗 .ant-modal-content ul.ant-rate
+    试卷页: .question-type-item[data-dynamic-key]、.o-score、.stem-content-main、.preview-list dd、
+            单题模式的 .single-title .rich-text-style、.single-btns、.single-btn-next、
+            交卷按钮"我要交卷"、确认按钮"确 定"、结果弹窗 [data-region='modal:modal']
+学习进度、考试成绩和评分状态保存在 Python 侧，重新打开或刷新页面后保持一致。
+视频章节点击后每秒上报一次 /api/study-record/progress，播放 play_seconds 秒后由平台标记为已学完。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from core.config import (
+    ZHIXUEYUN_COURSE_PREFIX,
+    ZHIXUEYUN_EXAM_PREFIX,
+    ZHIXUEYUN_SUBJECT_PREFIX,
+)
+
+PLATFORM_HOST = "kc.zhixueyun.com"
+CONTROLLER_HOST = "www.mylearning.cn"
+PASS_SCORE = 60
+
+CONTROLLER_HTML = "<html><head><title>我的学习</title></head><body>本地模拟平台</body></html>"
+
+SPA_HTML = r"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>模拟学习平台</title>
+<style>
+body { font-family: sans-serif; margin: 16px; }
+.selected { background: #cde; }
+.ant-modal-content, [data-region='modal:modal'], .confirm { border: 1px solid #888; padding: 8px; margin: 8px 0; }
+</style></head>
+<body><div id="app">加载中</div>
+<script>
+const app = document.getElementById("app");
+let renderToken = 0;
+
+async function api(path, body) {
+  const options = body === undefined ? {} : {
+    method: "POST",
+    headers: { "content-type": "application/json" },
+    body: JSON.stringify(body),
+  };
+  const response = await fetch(path, options);
+  return response.json();
+}
+
+function escapeHtml(value) {
+  return String(value).replace(/[&<>"]/g, (ch) => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;" })[ch]);
+}
+
+function clock(seconds) {
+  const minutes = Math.floor(seconds / 60);
+  return String(minutes).padStart(2, "0") + ":" + String(seconds % 60).padStart(2, "0");
+}
+
+function chapterStatus(chapter) {
+  if (chapter.type === "9") return "考试";
+  if (chapter.learned) return "已完成";
+  return "时长 " + clock(chapter.seconds) + " 需再学 " + clock(chapter.seconds);
+}
+
+async function renderCourse(courseId, token) {
+  const course = await api("/api/course/" + courseId);
+  if (token !== renderToken) return;
+  const chapters = course.chapters.map((chapter, index) =>
+    '<dl class="chapter-list-box required" data-sectiontype="' + chapter.type + '" data-index="' + index + '">' +
+    '<dt class="text-overflow">' + escapeHtml(chapter.title) + "</dt>" +
+    '<dd class="section-item-wrapper">' + chapterStatus(chapter) + "</dd></dl>"
+  ).join("");
+  const rating = course.ratingPending
+    ? '<div class="ant-modal-content"><ul class="ant-rate">' +
+      [1, 2, 3, 4, 5].map(() => '<li><div role="radio">★</div></li>').join("") +
+      '</ul><button class="rate-confirm">确 定</button></div>'
+    : "";
+  app.innerHTML =
+    '<div class="top">课程目录</div>' +
+    '<span class="course-title-text">' + escapeHtml(course.title) + "</span>" +
+    '<div class="course-progress"><div class="progress">' + course.progress + "%</div></div>" +
+    rating + '<div class="chapters">' + chapters + "</div>" +
+    '<div class="player-area"></div><div class="exam-area"></div>';
+
+  const confirm = app.querySelector(".rate-confirm");
+  if (confirm) {
+    confirm.addEventListener("click", async () => {
+      await api("/api/course/" + courseId + "/rate", {});
+      const modal = app.querySelector(".ant-modal-content");
+      if (modal) modal.remove();
+    });
+  }
+  app.querySelectorAll("dl.chapter-list-box").forEach((box) => {
+    box.addEventListener("click", () => openChapter(course, box));
+  });
+}
+
+function openChapter(course, box) {
+  const chapter = course.chapters[Number(box.dataset.index)];
+  if (chapter.type === "9") {
+    renderCourseExamTab(course);
+    return;
+  }
+  if (chapter.learned || box.dataset.playing) return;
+  box.dataset.playing = "1";
+  app.querySelector(".player-area").innerHTML =
+    '<div class="video-js"><div class="vjs-progress-control"></div>' +
+    '<span class="vjs-duration-display">' + clock(chapter.seconds) + "</span></div>";
+  const report = async (event) => {
+    const result = await api("/api/study-record/progress", {
+      course: course.id, chapter: Number(box.dataset.index), event,
+    });
+    if (result.learned) {
+      clearInterval(timer);
+      chapter.learned = true;
+      box.querySelector(".section-item-wrapper").textContent = chapterStatus(chapter);
+      app.querySelector(".course-progress .progress").textContent = result.progress + "%";
+    }
+  };
+  const timer = setInterval(() => report("heartbeat"), 1000);
+  report("start");
+}
+
+function renderCourseExamTab(course) {
+  const exam = course.exam;
+  const status = exam.attempts
+    ? '<div class="neer-status">最高分: ' + exam.bestScore + "</div>" +
+      '<table class="table"><tbody><tr><td>第' + exam.attempts + '次</td><td>' + exam.lastScore +
+      "</td><td>" + escapeHtml(exam.submittedAt) + "</td><td>" + (exam.passed ? "及格" : "不及格") + "</td></tr></tbody></table>"
+    : '<table class="table"><tbody></tbody></table>';
+  app.querySelector(".exam-area").innerHTML =
+    '<div class="tab-container">' + status +
+    '<div class="btn new-radius">' + (exam.attempts ? "重新考试" : "开始考试") + "</div></div>";
+  app.querySelector(".btn.new-radius").addEventListener("click", () => {
+    window.open(exam.url, "_blank");
+  });
+}
+
+async function renderSubject(subjectId, token) {
+  const subject = await api("/api/subject/" + subjectId);
+  if (token !== renderToken) return;
+  app.innerHTML = '<h2>' + escapeHtml(subject.title) + "</h2>" + subject.items.map((item) =>
+    '<div class="item current-hover" data-resource-id="' + item.resourceId + '">' +
+    '<span class="section-type">' + item.kind + "</span>" +
+    '<span class="finished-status">' + (item.done ? "已完成" : "未完成") + "</span>" +
+    (item.done && item.kind === "课程" ? '<i class="iconfont m-right icon-reload"></i>' : "") +
+    '<span class="inline-block operation" data-url="' + item.url + '">' + (item.done ? "重新学习" : "开始学习") + "</span></div>"
+  ).join("");
+  app.querySelectorAll(".operation").forEach((button) => {
+    button.addEventListener("click", () => window.open(button.dataset.url, "_blank"));
+  });
+}
+
+function optionsHtml(question) {
+  if (question.type === "judge") {
+    return ["正确", "错误"].map((text, index) =>
+      '<dd data-option="' + index + '"><span class="pointer">' + text + "</span></dd>").join("");
+  }
+  return question.options.map((text, index) =>
+    '<dd data-option="' + index + '"><span class="option-num">' + String.fromCharCode(65 + index) +
+    '.</span><span class="answer-options">' + escapeHtml(text) + "</span></dd>").join("");
+}
+
+const TYPE_LABELS = { single: "单选题", multiple: "多选题", judge: "判断题" };
+
+function bindOptions(root, paper, questionIndex) {
+  root.querySelectorAll(".preview-list dd").forEach((option) => {
+    option.addEventListener("click", () => {
+      const question = paper.questions[questionIndex];
+      const value = Number(option.dataset.option);
+      const chosen = paper.answers[questionIndex];
+      if (question.type === "multiple") {
+        const position = chosen.indexOf(value);
+        if (position >= 0) chosen.splice(position, 1); else chosen.push(value);
+        option.classList.toggle("selected");
+      } else {
+        paper.answers[questionIndex] = [value];
+        root.querySelectorAll(".preview-list dd").forEach((other) => other.classList.remove("selected"));
+        option.classList.add("selected");
+      }
+    });
+  });
+}
+
+async function renderPaper(examId, token) {
+  const paper = await api("/api/exam/" + examId);
+  if (token !== renderToken) return;
+  paper.answers = paper.questions.map(() => []);
+  if (paper.mode === "single") {
+    renderSingleQuestion(paper, 0);
+  } else {
+    app.innerHTML = paper.questions.map((question, index) =>
+      '<div class="question-type-item" data-dynamic-key="q-' + index + '">' +
+      '<span class="o-score">' + TYPE_LABELS[question.type] + "（2分）</span>" +
+      '<div class="stem-content-main">' + escapeHtml(question.stem) + "</div>" +
+      '<dl class="preview-list">' + optionsHtml(question) + "</dl></div>"
+    ).join("") + '<div class="submit-area"><span class="submit-btn">我要交卷</span></div>';
+    app.querySelectorAll(".question-type-item").forEach((item, index) => bindOptions(item, paper, index));
+  }
+  bindSubmit(paper);
+}
+
+function renderSingleQuestion(paper, index) {
+  const question = paper.questions[index];
+  const last = index === paper.questions.length - 1;
+  app.innerHTML =
+    '<span class="o-score">' + TYPE_LABELS[question.type] + "（2分）</span>" +
+    '<div class="single-title"><div class="rich-text-style">' + escapeHtml(question.stem) + "</div></div>" +
+    '<dl class="preview-list">' + optionsHtml(question) + "</dl>" +
+    '<div class="single-btns"><span class="single-btn-next' + (last ? " next-disabled" : "") + '">下一题</span></div>' +
+    '<div class="submit-area"><span class="submit-btn">我要交卷</span></div>';
+  bindOptions(app, paper, index);
+  app.querySelector(".single-btn-next").addEventListener("click", () => {
+    if (!last) {
+      renderSingleQuestion(paper, index + 1);
+      bindSubmit(paper);
+    }
+  });
+}
+
+function bindSubmit(paper) {
+  app.querySelector(".submit-btn").addEventListener("click", () => {
+    const confirmBox = document.createElement("div");
+    confirmBox.className = "confirm";
+    confirmBox.innerHTML = '<span>确认交卷？</span><button class="submit-confirm">确 定</button>';
+    app.appendChild(confirmBox);
+    confirmBox.querySelector("button").addEventListener("click", async () => {
+      const result = await api("/api/exam/" + paper.id + "/submit", { answers: paper.answers });
+      confirmBox.remove();
+      const modal = document.createElement("div");
+      modal.setAttribute("data-region", "modal:modal");
+      modal.innerHTML = "<div>得分 " + result.score + '</div><div class="btn white border">确定</div>';
+      app.appendChild(modal);
+      modal.querySelector(".btn").addEventListener("click", () => {
+        modal.remove();
+        if (window.opener) setTimeout(() => window.close(), 100);
+      });
+    });
+  });
+}
+
+async function render() {
+  renderToken += 1;
+  const token = renderToken;
+  const hash = location.hash;
+  let match;
+  if ((match = hash.match(/^#\/study\/course\/detail\/([^?/&]+)/))) return renderCourse(match[1], token);
+  if ((match = hash.match(/^#\/study\/subject\/detail\/([^?/&]+)/))) return renderSubject(match[1], token);
+  if ((match = hash.match(/^#\/exam\/exam\/answer-paper\/([^?/&]+)/))) return renderPaper(match[1], token);
+  app.innerHTML = "<div>首页</div>";
+}
+
+window.addEventListener("hashchange", render);
+render();
+</script></body></html>
+"""
+
+
+def _stable_id(kind: str, index: int) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"course-afk-benchmark/{kind}/{index}"))
+
+
+@dataclass
+class FakeQuestion:
+    type: str
+    stem: str
+    options: list[str]
+    answer: list[int]
+
+    def answer_labels(self) -> list[str]:
+        if self.type == "judge":
+            return ["正确" if self.answer[0] == 0 else "错误"]
+        return [chr(ord("A") + index) for index in self.answer]
+
+
+@dataclass
+class FakeExam:
+    id: str
+    title: str
+    questions: list[FakeQuestion]
+    mode: str = "multi"
+    attempts: int = 0
+    best_score: int = 0
+    last_score: int = 0
+    submitted_at: str = ""
+
+    @property
+    def url(self) -> str:
+        return f"{ZHIXUEYUN_EXAM_PREFIX}{self.id}"
+
+    @property
+    def passed(self) -> bool:
+        return self.attempts > 0 and self.best_score >= PASS_SCORE
+
+    def score(self, answers: list[list[int]]) -> int:
+        if not self.questions:
+            return 100
+        correct = sum(
+            1
+            for question, chosen in zip(self.questions, answers)
+            if sorted(chosen or []) == sorted(question.answer)
+        )
+        return round(correct * 100 / len(self.questions))
+
+
+@dataclass
+class FakeChapter:
+    type: str
+    title: str
+    seconds: int = 0
+    learned: bool = False
+
+
+@dataclass
+class FakeCourse:
+    id: str
+    title: str
+    chapters: list[FakeChapter]
+    exam: FakeExam | None = None
+    rating_pending: bool = False
+
+    @property
+    def url(self) -> str:
+        return f"{ZHIXUEYUN_COURSE_PREFIX}{self.id}"
+
+    def is_chapter_learned(self, chapter: FakeChapter) -> bool:
+        if chapter.type == "9":
+            return self.exam is not None and self.exam.passed
+        return chapter.learned
+
+    @property
+    def progress(self) -> int:
+        if not self.chapters:
+            return 100
+        learned = sum(1 for chapter in self.chapters if self.is_chapter_learned(chapter))
+        return learned * 100 // len(self.chapters)
+
+
+@dataclass
+class FakeSubject:
+    id: str
+    title: str
+    courses: list[FakeCourse]
+    exam: FakeExam | None = None
+
+    @property
+    def url(self) -> str:
+        return f"{ZHIXUEYUN_SUBJECT_PREFIX}{self.id}"
+
+
+@dataclass
+class PlaybackStats:
+    """平台侧记录的视频播放区间，用于从墙钟时间中扣除模拟的视频时长。"""
+
+    intervals: list[tuple[float, float]] = field(default_factory=list)
+
+    def busy_seconds(self) -> float:
+        """至少有一个视频在播放的总秒数（重叠区间只计一次）。"""
+        total = 0.0
+        current_start = current_end = None
+        for start, end in sorted(self.intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+
+def build_questions(count: int, *, prefix: str) -> list[FakeQuestion]:
+    questions = []
+    for index in range(count):
+        kind = ("single", "multiple", "judge")[index % 3]
+        if kind == "judge":
+            questions.append(FakeQuestion("judge", f"{prefix}第 {index + 1} 题（判断）", [], [index % 2]))
+            continue
+        options = [f"{prefix}第 {index + 1} 题选项 {option + 1}" for option in range(4)]
+        answer = [index % 4] if kind == "single" else sorted({index % 4, (index + 2) % 4})
+        questions.append(FakeQuestion(kind, f"{prefix}第 {index + 1} 题", options, answer))
+    return questions
+
+
+class FakePlatform:
+    """按配置生成课程、主题和试卷，并在浏览器上下文中接管平台请求。"""
+
+    def __init__(
+        self,
+        *,
+        courses: int = 2,
+        subjects: int = 1,
+        subject_courses: int = 2,
+        chapters: int = 2,
+        video_seconds: int = 60,
+        play_seconds: float = 3.0,
+        questions: int = 10,
+        exam_mode: str = "multi",
+        rating_popup: bool = False,
+        latency_ms: int = 50,
+    ):
+        self.play_seconds = play_seconds
+        self.latency = max(0, latency_ms) / 1000
+        self.playback = PlaybackStats()
+        self.api_requests = 0
+        self.courses: dict[str, FakeCourse] = {}
+        self.subjects: dict[str, FakeSubject] = {}
+        self.exams: dict[str, FakeExam] = {}
+        self._playing: dict[tuple[str, int], float] = {}
+        self._counters: dict[str, int] = {}
+
+        def new_exam(title: str) -> FakeExam:
+            exam = FakeExam(
+                id=self._next_id("exam"),
+                title=title,
+                questions=build_questions(questions, prefix=f"{title} "),
+                mode=exam_mode,
+            )
+            self.exams[exam.id] = exam
+            return exam
+
+        def new_course(title: str, *, with_exam: bool) -> FakeCourse:
+            course = FakeCourse(
+                id=self._next_id("course"),
+                title=title,
+                chapters=[
+                    FakeChapter("6", f"{title} 第 {index + 1} 节", seconds=video_seconds)
+                    for index in range(chapters)
+                ],
+                rating_pending=rating_popup,
+            )
+            if with_exam:
+                course.exam = new_exam(f"{title}考试")
+                course.chapters.append(FakeChapter("9", f"{title} 课后考试"))
+            self.courses[course.id] = course
+            return course
+
+        self.standalone_courses = [
+            new_course(f"课程 {index + 1}", with_exam=questions > 0) for index in range(courses)
+        ]
+        for index in range(subjects):
+            subject = FakeSubject(
+                id=self._next_id("subject"),
+                title=f"主题 {index + 1}",
+                courses=[
+                    new_course(f"主题 {index + 1} 课程 {course_index + 1}", with_exam=False)
+                    for course_index in range(subject_courses)
+                ],
+                exam=new_exam(f"主题 {index + 1} 试卷") if questions > 0 else None,
+            )
+            self.subjects[subject.id] = subject
+
+    def _next_id(self, kind: str) -> str:
+        index = self._counters.get(kind, 0)
+        self._counters[kind] = index + 1
+        return _stable_id(kind, index)
+
+    def learning_urls(self) -> list[str]:
+        return [course.url for course in self.standalone_courses] + [
+            subject.url for subject in self.subjects.values()
+        ]
+
+    def answer_for(self, stem: str) -> list[str]:
+        for exam in self.exams.values():
+            for question in exam.questions:
+                if question.stem == stem.strip():
+                    return question.answer_labels()
+        return []
+
+    def video_chapter_count(self) -> int:
+        return sum(
+            1 for course in self.courses.values() for chapter in course.chapters if chapter.type == "6"
+        )
+
+    def _course_json(self, course: FakeCourse) -> dict:
+        exam = course.exam
+        return {
+            "id": course.id,
+            "title": course.title,
+            "progress": course.progress,
+            "ratingPending": course.rating_pending,
+            "chapters": [
+                {
+                    "type": chapter.type,
+                    "title": chapter.title,
+                    "seconds": chapter.seconds,
+                    "learned": course.is_chapter_learned(chapter),
+                }
+                for chapter in course.chapters
+            ],
+            "exam": None
+            if exam is None
+            else {
+                "url": exam.url,
+                "attempts": exam.attempts,
+                "bestScore": exam.best_score,
+                "lastScore": exam.last_score,
+                "passed": exam.passed,
+                "submittedAt": exam.submitted_at,
+            },
+        }
+
+    def _subject_json(self, subject: FakeSubject) -> dict:
+        items = [
+            {
+                "kind": "课程",
+                "resourceId": course.id,
+                "url": course.url,
+                "done": course.progress >= 100,
+            }
+            for course in subject.courses
+        ]
+        if subject.exam is not None:
+            items.append(
+                {
+                    "kind": "考试",
+                    "resourceId": subject.exam.id,
+                    "url": subject.exam.url,
+                    "done": subject.exam.passed,
+                }
+            )
+        return {"id": subject.id, "title": subject.title, "items": items}
+
+    def _exam_json(self, exam: FakeExam) -> dict:
+        return {
+            "id": exam.id,
+            "mode": exam.mode,
+            "questions": [
+                {"type": question.type, "stem": question.stem, "options": question.options}
+                for question in exam.questions
+            ],
+        }
+
+    def _report_progress(self, payload: dict) -> dict:
+        course = self.courses[payload["course"]]
+        chapter_index = int(payload["chapter"])
+        chapter = course.chapters[chapter_index]
+        key = (course.id, chapter_index)
+        now = time.perf_counter()
+        started_at = self._playing.setdefault(key, now)
+        if not chapter.learned and now - started_at >= self.play_seconds:
+            chapter.learned = True
+            self._playing.pop(key, None)
+            self.playback.intervals.append((started_at, now))
+        return {"learned": chapter.learned, "progress": course.progress}
+
+    def _submit_exam(self, exam: FakeExam, payload: dict) -> dict:
+        score = exam.score(payload.get("answers") or [])
+        exam.attempts += 1
+        exam.last_score = score
+        exam.best_score = max(exam.best_score, score)
+        exam.submitted_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        return {"score": score, "passed": exam.passed}
+
+    def handle_api(self, method: str, path: str, payload: dict | None):
+        """处理 /api/ 请求，返回 (状态码, JSON 数据)。"""
+        parts = [part for part in path.split("/") if part][1:]
+        self.api_requests += 1
+        if parts[:1] == ["study-record"] and method == "POST":
+            return 200, self._report_progress(payload or {})
+        if len(parts) >= 2 and parts[0] == "course" and parts[1] in self.courses:
+            course = self.courses[parts[1]]
+            if parts[2:] == ["rate"] and method == "POST":
+                course.rating_pending = False
+                return 200, {"ok": True}
+            return 200, self._course_json(course)
+        if len(parts) == 2 and parts[0] == "subject" and parts[1] in self.subjects:
+            return 200, self._subject_json(self.subjects[parts[1]])
+        if len(parts) >= 2 and parts[0] == "exam" and parts[1] in self.exams:
+            exam = self.exams[parts[1]]
+            if parts[2:] == ["submit"] and method == "POST":
+                return 200, self._submit_exam(exam, payload or {})
+            return 200, self._exam_json(exam)
+        return 404, {"error": "not found"}
+
+    async def _handle_route(self, route) -> None:
+        request = route.request
+        url = urlsplit(request.url)
+        if url.hostname == CONTROLLER_HOST:
+            await route.fulfill(status=200, content_type="text/html", body=CONTROLLER_HTML)
+            return
+        if url.hostname != PLATFORM_HOST:
+            await route.abort()
+            return
+        if url.path.startswith("/api/"):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            payload = None
+            if request.method == "POST" and request.post_data:
+                payload = json.loads(request.post_data)
+            status, data = self.handle_api(request.method, url.path, payload)
+            await route.fulfill(status=status, json=data)
+            return
+        await route.fulfill(status=200, content_type="text/html", body=SPA_HTML)
+
+    async def install(self, context) -> None:
+        await context.route("**/*", self._handle_route)
@@ -0,0 +1,311 @@
+"""
+本地 OpenAI 兼容接口桩，用于在不调用付费模型的情况下测量 AI 考试吞吐。
+
+支持 AI 考试使用的两种流式接口：
+    POST <base_url>/responses          (AI_REQUEST_TYPE=responses)
+    POST <base_url>/chat/completions   (AI_REQUEST_TYPE=chat)
+两者都以 SSE 流式返回，与 _request_ai_answer_text 读取的事件格式一致。
+
+可调参数:
+    首字延迟: 收到请求到发出第一个 token 的等待时间
+    token 速率: 之后每秒发出的 token 数，每个字符算一个 token
+    思考 token 数: 正文前先输出的思考内容长度（chat 的 reasoning_content，responses 的推理摘要事件）
+    错误率: 按比例直接返回 HTTP 500，客户端的自动重试也会计入请求数
+    作答策略: key 按答案表作答（没有答案时退回 first），first 总选第一个选项/正确，
+              random 随机选择，empty 返回空正文
+
+单独运行时常驻监听，可以把 .env 中的 OPENAI_COMPLETION_BASE_URL 指向它运行真实流程:
+    python -m benchmarks.openai_stub --port 8765 --latency-ms 800 --tokens-per-second 40
+    OPENAI_COMPLETION_BASE_URL=http://127.0.0.1:8765/v1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+ANSWER_POLICIES = ("key", "first", "random", "empty")
+
+AnswerKey = Callable[[str], "list[str] | None"]
+
+_QUESTION_PATTERN = re.compile(r"问题：(.*?)\n\s*选项：", re.S)
+_OPTION_PATTERN = re.compile(r"^\s*([A-Z])\.\s", re.M)
+
+
+@dataclass
+class StubSettings:
+    latency_ms: int = 500
+    tokens_per_second: float = 50.0
+    reasoning_tokens: int = 0
+    error_rate: float = 0.0
+    answer_policy: str = "key"
+    seed: int | None = None
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    durations: list[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, *, error: bool, duration: float | None = None) -> None:
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            if duration is not None:
+                self.durations.append(duration)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.durations.clear()
+
+
+def _prompt_text(payload: dict) -> str:
+    if "messages" in payload:
+        return "\n".join(
+            str(message.get("content") or "")
+            for message in payload["messages"]
+            if message.get("role") == "user"
+        )
+    return str(payload.get("input") or "")
+
+
+def choose_answer(prompt: str, settings: StubSettings, answer_key: AnswerKey | None, rng: random.Random) -> str:
+    """按作答策略生成模型正文。"""
+    if settings.answer_policy == "empty":
+        return ""
+    is_judge = "判断题" in prompt
+    labels = _OPTION_PATTERN.findall(prompt) or ["A"]
+
+    answers = None
+    if settings.answer_policy == "key" and answer_key is not None:
+        match = _QUESTION_PATTERN.search(prompt)
+        if match:
+            answers = answer_key(match.group(1).strip())
+    if not answers and settings.answer_policy == "random":
+        if is_judge:
+            answers = [rng.choice(["正确", "错误"])]
+        else:
+            answers = sorted(rng.sample(labels, rng.randint(1, len(labels))))
+    if not answers:
+        answers = ["正确"] if is_judge else labels[:1]
+
+    if is_judge:
+        return answers[0]
+    return f"答案：{''.join(answers)}"
+
+
+def _sse(event: str | None, data: dict | str) -> bytes:
+    body = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {body}\n\n".encode("utf-8")
+
+
+def _chat_events(model: str, reasoning: str, answer: str):
+    created = int(time.time())
+
+    def chunk(delta: dict, finish_reason=None) -> bytes:
+        return _sse(
+            None,
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            },
+        )
+
+    yield None, chunk({"role": "assistant", "content": ""})
+    for token in reasoning:
+        yield token, chunk({"reasoning_content": token})
+    for token in answer:
+        yield token, chunk({"content": token})
+    yield None, chunk({}, "stop")
+    yield None, _sse(None, "[DONE]")
+
+
+def _responses_events(model: str, reasoning: str, answer: str):
+    response = {"id": "resp_stub", "object": "response", "model": model, "status": "in_progress", "output": []}
+    sequence = 0
+
+    def event(event_type: str, **fields) -> bytes:
+        nonlocal sequence
+        sequence += 1
+        return _sse(event_type, {"type": event_type, "sequence_number": sequence, **fields})
+
+    yield None, event("response.created", response=response)
+    for token in reasoning:
+        yield token, event(
+            "response.reasoning_summary_text.delta",
+            item_id="rs_stub",
+            output_index=0,
+            summary_index=0,
+            delta=token,
+        )
+    for token in answer:
+        yield token, event(
+            "response.output_text.delta",
+            item_id="msg_stub",
+            output_index=1,
+            content_index=0,
+            delta=token,
+            logprobs=[],
+        )
+    yield None, event(
+        "response.output_text.done",
+        item_id="msg_stub",
+        output_index=1,
+        content_index=0,
+        text=answer,
+        logprobs=[],
+    )
+    yield None, event("response.completed", response={**response, "status": "completed"})
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        started_at = time.perf_counter()
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/chat/completions"):
+            events = _chat_events
+        elif self.path.endswith("/responses"):
+            events = _responses_events
+        else:
+            self.server.stats.record(error=True)
+            self._send_json(404, {"error": {"message": f"未知接口: {self.path}"}})
+            return
+
+        settings = self.server.settings
+        with self.server.rng_lock:
+            failed = self.server.rng.random() < settings.error_rate
+            answer = choose_answer(_prompt_text(payload), settings, self.server.answer_key, self.server.rng)
+        time.sleep(max(0, settings.latency_ms) / 1000)
+        if failed:
+            self.server.stats.record(error=True)
+            self._send_json(500, {"error": {"message": "stub injected error", "type": "server_error"}})
+            return
+
+        token_interval = 1 / settings.tokens_per_second if settings.tokens_per_second > 0 else 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        model = str(payload.get("model") or "stub")
+        for token, data in events(model, "思" * max(0, settings.reasoning_tokens), answer):
+            if token is not None and token_interval:
+                time.sleep(token_interval)
+            self._write_chunk(data)
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.server.stats.record(error=False, duration=time.perf_counter() - started_at)
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, settings: StubSettings, answer_key: AnswerKey | None):
+        super().__init__(address, _StubHandler)
+        self.settings = settings
+        self.answer_key = answer_key
+        self.stats = StubStats()
+        self.rng = random.Random(settings.seed)
+        self.rng_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+@contextmanager
+def run_stub_server(
+    settings: StubSettings | None = None,
+    *,
+    answer_key: AnswerKey | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+):
+    """在后台线程中启动接口桩，返回的服务器对象提供 base_url、settings 和 stats。"""
+    server = _StubServer((host, port), settings or StubSettings(), answer_key)
+    thread = threading.Thread(target=server.serve_forever, name="openai-stub", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=int, default=500, help="首字延迟（毫秒）")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="token 输出速率，0 表示一次性输出")
+    parser.add_argument("--reasoning-tokens", type=int, default=0, help="正文前输出的思考 token 数")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 HTTP 500 的请求比例")
+    parser.add_argument("--answer-policy", choices=ANSWER_POLICIES, default="key")
+    parser.add_argument("--seed", type=int, default=None, help="错误注入和随机作答的随机种子")
+
+
+def settings_from_args(args) -> StubSettings:
+    return StubSettings(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        reasoning_tokens=args.reasoning_tokens,
+        error_rate=args.error_rate,
+        answer_policy=args.answer_policy,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    with run_stub_server(settings_from_args(args), host=args.host, port=args.port) as server:
+        print(f"OpenAI 接口桩已启动: {server.base_url}（Ctrl+C 退出）")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
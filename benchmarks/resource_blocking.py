@@ -0,0 +1,115 @@
+"""
+对比开启/关闭资源拦截（RESOURCE_BLOCKING）时各类页面的下载字节数和加载耗时。
+
+用法:
+    python -m benchmarks.resource_blocking --url <课程链接> --url <主题链接> --url <考试链接>
+
+每个链接按页面类型（课程、主题、考试、学习专区）分别在不拦截和按拦截配置拦截两种情况下
+各打开 --repeat 次，携带 cookies.json 中的登录状态。下载字节数为 Chromium DevTools 协议
+Network.loadingFinished 事件中 encodedDataLength 之和（即实际经网络传输的字节数），
+加载耗时为 goto 到 load 事件的时间，load 之后再等待 --settle 秒以计入延迟加载的资源。
+仅支持 BROWSER_TYPE=chromium。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+
+from playwright.async_api import async_playwright
+
+from core.browser import launch_async_browser
+from core.config import COOKIES_FILE
+from core.resource_blocking import (
+    PAGE_TYPE_LABELS,
+    ResourceBlockingStats,
+    build_route_handler,
+    classify_page_url,
+)
+
+
+async def _load_once(browser, cookies, url: str, *, blocking: bool, settle: float):
+    context = await browser.new_context()
+    try:
+        await context.add_cookies(cookies)
+        stats = ResourceBlockingStats()
+        if blocking:
+            await context.route("**/*", build_route_handler(stats))
+
+        page = await context.new_page()
+        client = await context.new_cdp_session(page)
+        transferred = 0
+
+        def on_loading_finished(event):
+            nonlocal transferred
+            transferred += int(event.get("encodedDataLength", 0))
+
+        client.on("Network.loadingFinished", on_loading_finished)
+        await client.send("Network.enable")
+
+        started_at = time.perf_counter()
+        await page.goto(url, wait_until="load")
+        load_seconds = time.perf_counter() - started_at
+        await asyncio.sleep(settle)
+        blocked = sum(sum(counter.values()) for counter in stats.blocked.values())
+        return transferred, load_seconds, blocked
+    finally:
+        await context.close()
+
+
+async def run_benchmark(urls: list[str], repeat: int, settle: float) -> None:
+    with open(COOKIES_FILE, "r", encoding="utf-8") as file:
+        cookies = json.load(file)
+
+    results = defaultdict(lambda: {False: [], True: []})
+    async with async_playwright() as playwright:
+        browser = await launch_async_browser(playwright, headless=True)
+        try:
+            for url in urls:
+                page_type = classify_page_url(url)
+                for _ in range(repeat):
+                    for blocking in (False, True):
+                        results[page_type][blocking].append(
+                            await _load_once(browser, cookies, url, blocking=blocking, settle=settle)
+                        )
+        finally:
+            await browser.close()
+
+    for page_type, runs in results.items():
+        label = PAGE_TYPE_LABELS.get(page_type, page_type)
+        averages = {}
+        for blocking, samples in runs.items():
+            count = len(samples) or 1
+            averages[blocking] = (
+                sum(sample[0] for sample in samples) / count,
+                sum(sample[1] for sample in samples) / count,
+                sum(sample[2] for sample in samples) / count,
+            )
+        plain_bytes, plain_seconds, _ = averages[False]
+        blocked_bytes, blocked_seconds, blocked_requests = averages[True]
+        print(f"{label}: 每次加载平均")
+        print(f"  不拦截: 下载 {plain_bytes / 1024:.0f} KB, 加载 {plain_seconds:.2f} 秒")
+        print(
+            f"  拦截:   下载 {blocked_bytes / 1024:.0f} KB, 加载 {blocked_seconds:.2f} 秒, "
+            f"拦截 {blocked_requests:.0f} 个请求"
+        )
+        print(
+            f"  节省:   {(plain_bytes - blocked_bytes) / 1024:.0f} KB, "
+            f"{plain_seconds - blocked_seconds:.2f} 秒"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", action="append", required=True, help="可重复指定多个链接")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--settle", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.url, max(1, args.repeat), max(0.0, args.settle)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+对比有界面挂课与无头挂课（AFK_HEADLESS）每个标签页的内存和 CPU 占用。
+
+用法:
+    python -m benchmarks.tab_metrics --tabs 3 --seconds 30
+    python -m benchmarks.tab_metrics --tabs 3 --seconds 60 --url https://kc.zhixueyun.com/#/study/course/detail/<ID>
+
+不指定 --url 时打开本地合成页面（一个持续重绘的 canvas，模拟播放中的视频）；
+指定 --url 时携带 cookies.json 中的登录状态打开真实课程页。
+指标来自 Chromium DevTools 协议的 Performance.getMetrics，仅支持 BROWSER_TYPE=chromium：
+    JS 堆: JSHeapUsedSize，采样结束时的已用 JS 堆
+    CPU 占比: 采样期间 TaskDuration 增量 / 采样时长，即渲染主线程繁忙比例
+    布局/重绘: 采样期间 LayoutCount、RecalcStyleCount 增量
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from playwright.async_api import async_playwright
+
+from core.browser import (
+    HEADLESS_AFK_PROFILE,
+    build_browser_context_options,
+    launch_async_browser,
+)
+from core.config import COOKIES_FILE
+
+SYNTHETIC_PLAYER_HTML = """
+<html><body style="margin:0">
+<canvas id="player" width="1280" height="720"></canvas>
+<script>
+const canvas = document.getElementById("player");
+const ctx = canvas.getContext("2d");
+let frame = 0;
+function draw() {
+  frame += 1;
+  ctx.fillStyle = `hsl(${frame % 360}, 60%, 50%)`;
+  ctx.fillRect(0, 0, canvas.width, canvas.height);
+  ctx.fillStyle = "#fff";
+  ctx.font = "48px sans-serif";
+  ctx.fillText(`frame ${frame}`, 40, 80);
+  requestAnimationFrame(draw);
+}
+requestAnimationFrame(draw);
+</script>
+</body></html>
+"""
+
+MODES = (
+    ("有界面挂课", False, None),
+    ("无头挂课", True, HEADLESS_AFK_PROFILE),
+)
+
+
+async def _read_metrics(client) -> dict[str, float]:
+    response = await client.send("Performance.getMetrics")
+    return {item["name"]: item["value"] for item in response["metrics"]}
+
+
+async def _measure_mode(playwright, *, headless, profile, tabs, seconds, url, cookies):
+    browser = await launch_async_browser(playwright, headless=headless, profile=profile)
+    try:
+        context = await browser.new_context(
+            **build_browser_context_options(headless=headless, profile=profile)
+        )
+        if cookies:
+            await context.add_cookies(cookies)
+
+        clients = []
+        for _ in range(tabs):
+            page = await context.new_page()
+            if url:
+                await page.goto(url, wait_until="load")
+            else:
+                await page.set_content(SYNTHETIC_PLAYER_HTML)
+            client = await context.new_cdp_session(page)
+            await client.send("Performance.enable")
+            clients.append(client)
+
+        before = [await _read_metrics(client) for client in clients]
+        started_at = time.perf_counter()
+        await asyncio.sleep(seconds)
+        elapsed = time.perf_counter() - started_at
+        after = [await _read_metrics(client) for client in clients]
+    finally:
+        await browser.close()
+
+    rows = []
+    for start, end in zip(before, after):
+        rows.append(
+            {
+                "heap_mb": end.get("JSHeapUsedSize", 0) / 1024 / 1024,
+                "cpu_share": (end.get("TaskDuration", 0) - start.get("TaskDuration", 0)) / elapsed,
+                "layouts": end.get("LayoutCount", 0) - start.get("LayoutCount", 0),
+                "style_recalcs": end.get("RecalcStyleCount", 0) - start.get("RecalcStyleCount", 0),
+            }
+        )
+    return rows
+
+
+async def run_benchmark(tabs: int, seconds: float, url: str | None) -> None:
+    cookies = None
+    if url:
+        with open(COOKIES_FILE, "r", encoding="utf-8") as file:
+            cookies = json.load(file)
+
+    async with async_playwright() as playwright:
+        for label, headless, profile in MODES:
+            rows = await _measure_mode(
+                playwright,
+                headless=headless,
+                profile=profile,
+                tabs=tabs,
+                seconds=seconds,
+                url=url,
+                cookies=cookies,
+            )
+            count = len(rows) or 1
+            print(f"{label}: {tabs} 个标签页, 采样 {seconds:.0f} 秒")
+            for index, row in enumerate(rows, start=1):
+                print(
+                    f"  标签页 {index}: JS 堆 {row['heap_mb']:.1f} MB, "
+                    f"CPU 占比 {row['cpu_share']:.1%}, "
+                    f"布局 {row['layouts']:.0f} 次, 样式重算 {row['style_recalcs']:.0f} 次"
+                )
+            print(
+                f"  平均每标签页: JS 堆 {sum(row['heap_mb'] for row in rows) / count:.1f} MB, "
+                f"CPU 占比 {sum(row['cpu_share'] for row in rows) / count:.1%}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tabs", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--url", default=None, help="真实课程链接；不指定时使用本地合成页面")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(max(1, args.tabs), max(1.0, args.seconds), args.url))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,29 @@ from pathlib import Path
 from typing import Callable
 
 from core.abort import UserAbortRequested
+from core.afk_scheduler import schedule_longest_first
 from core.browser import (
+    HEADLESS_AFK_PROFILE,
     create_browser_context,
     ensure_controller_page,
     is_browser_connected,
     is_target_closed_exception,
 )
 from core.config import (
-    AFK_SLOW_MO,
+    AFK_CONCURRENCY,
+    AFK_HEADLESS,
+    AFK_LONGEST_FIRST,
+    AFK_PREFILTER,
     LEARNING_FAILURES_FILE,
     LEARNING_URLS_FILE,
 )
+from core.diagnostics import diagnose_workflow, trace_slow_page
 from core.file_ops import (
     is_compliant_url_regex,
     normalize_url,
 )
-from core.learning import course_learning, is_subject_url_completed, subject_learning
+from core.learning import course_learning, is_subject_url_completed, subject_learning, watch_popups
+from core.learning_prefilter import prefilter_learning_urls
 from core.learning_queue import (
     read_learning_failures,
     read_learning_urls,
@@ -31,6 +38,12 @@ from core.learning_queue import (
     remove_learning_failure,
     write_learning_urls,
 )
+from core.pacing import pace
+from core.progress import progress_task
+from core.queue_db import is_sqlite_backend
+from core.readiness import track_readiness
+from core.resource_blocking import block_resources
+from core.spans import span
 
 
 StatusCallback = Callable[[str], None]
@@ -45,10 +58,51 @@ class AfkBatch:
 def _write_learning_queue(urls: list[str], *, learning_file: Path | None = None) -> None:
     if learning_file is None:
         learning_file = LEARNING_URLS_FILE
-    if urls or learning_file.exists():
+    # SQLite 后端没有队列文件可判断，最后一条链接也要写回才能从数据库中删除
+    if urls or is_sqlite_backend() or learning_file.exists():
         write_learning_urls(urls, file_path=learning_file)
 
 
+async def _prefilter_afk_urls(
+    context,
+    urls: list[str],
+    pending_learning_urls: list[str],
+    status_callback: StatusCallback | None,
+) -> list[str]:
+    """AFK_PREFILTER 开启时去掉接口确认已学完的链接，并同步更新待学队列。"""
+    if not AFK_PREFILTER:
+        return urls
+    if status_callback:
+        status_callback(f"接口预检 {len(urls)} 条学习链接")
+    prefilter = await prefilter_learning_urls(context, urls)
+    if not prefilter.completed:
+        return urls
+    pending_learning_urls[:] = prefilter.remaining
+    _write_learning_queue(pending_learning_urls)
+    return prefilter.remaining
+
+
+async def _schedule_afk_urls(
+    context,
+    urls: list[str],
+    pending_learning_urls: list[str],
+    status_callback: StatusCallback | None,
+    *,
+    workers: int,
+) -> list[str]:
+    """AFK_LONGEST_FIRST 开启时按剩余学习时长从长到短排列链接，并同步更新待学队列。"""
+    if not AFK_LONGEST_FIRST or len(urls) <= 1:
+        return urls
+    if status_callback:
+        status_callback(f"估算 {len(urls)} 条学习链接的剩余学习时长")
+    schedule = await schedule_longest_first(context, urls, workers=workers)
+    pending_learning_urls[:] = schedule.urls
+    _write_learning_queue(pending_learning_urls)
+    if status_callback and schedule.finish_at is not None:
+        status_callback(f"预计 {schedule.finish_at:%m-%d %H:%M} 完成挂课")
+    return schedule.urls
+
+
 def _is_user_abort_exception(exc: BaseException) -> bool:
     return isinstance(exc, (UserAbortRequested, KeyboardInterrupt, asyncio.CancelledError))
 
@@ -66,10 +120,14 @@ def prepare_afk_batch(
 
 async def _process_url(context, url: str, handler) -> bool:
     await ensure_controller_page(context)
+    await watch_popups(context)
     page = await context.new_page()
     try:
-        await page.goto(url)
-        await handler(page)
+        async with trace_slow_page(context, url):
+            await pace("navigate")
+            with span("goto", url=url):
+                await page.goto(url)
+            await handler(page)
         return False
     except Exception as exc:
         if is_target_closed_exception(exc):
@@ -118,7 +176,9 @@ async def _recheck_url_type_links(context) -> None:
         await ensure_controller_page(context)
         page = await context.new_page()
         try:
-            await page.goto(url)
+            await pace("navigate")
+            with span("goto", url=url):
+                await page.goto(url)
             if await is_subject_url_completed(page):
                 logging.info(f"URL类型链接学习完成: {url}")
                 remove_learning_failure(
@@ -152,7 +212,85 @@ async def _recheck_url_type_links(context) -> None:
                 pass
 
 
-async def run_afk_once(status_callback: StatusCallback | None = None) -> bool:
+def _remove_pending_url(pending_learning_urls: list[str], url: str) -> None:
+    if url in pending_learning_urls:
+        pending_learning_urls.remove(url)
+        _write_learning_queue(pending_learning_urls)
+
+
+async def _learn_url(context, url: str) -> None:
+    if not is_compliant_url_regex(url):
+        logging.info("不合规链接，已记录到挂课失败链接")
+        record_learning_failure(
+            url,
+            reason="non_compliant_url",
+            reason_text="学习链接不符合课程或主题链接格式",
+            file_path=LEARNING_FAILURES_FILE,
+        )
+        return
+
+    if "subject" in url:
+        with track_readiness("本主题"):
+            await _process_url(context, url, subject_learning)
+    elif "course" in url:
+        with track_readiness("本课程"):
+            await _process_url(context, url, course_learning)
+    else:
+        logging.info(f"无法识别的学习链接类型: {url}")
+        record_learning_failure(
+            url,
+            reason="unknown_learning_type",
+            reason_text="无法识别该学习链接类型",
+            file_path=LEARNING_FAILURES_FILE,
+        )
+
+
+async def _afk_worker(
+    context,
+    url_queue: asyncio.Queue,
+    pending_learning_urls: list[str],
+    total: int,
+    status_callback: StatusCallback | None,
+) -> None:
+    while True:
+        try:
+            index, url = url_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+
+        if status_callback:
+            status_callback(f"挂课 {index}/{total}: {url}")
+        logging.info(f"({index}/{total})当前学习链接为: {url}")
+        with progress_task(f"挂课 {index}/{total}", detail=url):
+            await _learn_url(context, url)
+        _remove_pending_url(pending_learning_urls, url)
+
+
+async def _run_afk_workers(workers: list) -> None:
+    """并发执行挂课 worker；任一 worker 异常时取消其余 worker 并抛出该异常。"""
+    if len(workers) == 1:
+        await workers[0]
+        return
+
+    tasks = [asyncio.ensure_future(worker) for worker in workers]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for task in tasks:
+        if task in done and not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+
+async def run_afk_once(
+    status_callback: StatusCallback | None = None,
+    *,
+    concurrency: int | None = None,
+) -> bool:
     batch = prepare_afk_batch()
     if not batch.urls:
         if status_callback:
@@ -163,48 +301,52 @@ async def run_afk_once(status_callback: StatusCallback | None = None) -> bool:
     pending_learning_urls = list(normalized_urls)
     _write_learning_queue(pending_learning_urls)
 
+    if concurrency is None:
+        concurrency = AFK_CONCURRENCY
+
     try:
-        async with create_browser_context(slow_mo=AFK_SLOW_MO) as (_, context):
+        async with (
+            diagnose_workflow("afk"),
+            create_browser_context(
+                profile=HEADLESS_AFK_PROFILE if AFK_HEADLESS else None,
+            ) as (_, context),
+        ):
+            normalized_urls = await _prefilter_afk_urls(
+                context,
+                normalized_urls,
+                pending_learning_urls,
+                status_callback,
+            )
+            worker_count = max(1, min(concurrency, len(normalized_urls)))
+            normalized_urls = await _schedule_afk_urls(
+                context,
+                normalized_urls,
+                pending_learning_urls,
+                status_callback,
+                workers=worker_count,
+            )
+
+            url_queue: asyncio.Queue = asyncio.Queue()
             for index, url in enumerate(normalized_urls, start=1):
-                if status_callback:
-                    status_callback(f"挂课 {index}/{len(normalized_urls)}: {url}")
-                logging.info(f"({index}/{len(normalized_urls)})当前学习链接为: {url}")
-
-                if not is_compliant_url_regex(url):
-                    logging.info("不合规链接，已记录到挂课失败链接")
-                    record_learning_failure(
-                        url,
-                        reason="non_compliant_url",
-                        reason_text="学习链接不符合课程或主题链接格式",
-                        file_path=LEARNING_FAILURES_FILE,
-                    )
-                    if url in pending_learning_urls:
-                        pending_learning_urls.remove(url)
-                        _write_learning_queue(pending_learning_urls)
-                    continue
-
-                if "subject" in url:
-                    error = await _process_url(context, url, subject_learning)
-                elif "course" in url:
-                    error = await _process_url(context, url, course_learning)
-                else:
-                    logging.info(f"无法识别的学习链接类型: {url}")
-                    record_learning_failure(
-                        url,
-                        reason="unknown_learning_type",
-                        reason_text="无法识别该学习链接类型",
-                        file_path=LEARNING_FAILURES_FILE,
-                    )
-                    if url in pending_learning_urls:
-                        pending_learning_urls.remove(url)
-                        _write_learning_queue(pending_learning_urls)
-                    continue
-
-                if url in pending_learning_urls:
-                    pending_learning_urls.remove(url)
-                    _write_learning_queue(pending_learning_urls)
-
-            await _recheck_url_type_links(context)
+                url_queue.put_nowait((index, url))
+
+            if worker_count > 1:
+                logging.info(f"挂课并发标签页数量: {worker_count}")
+            async with block_resources(context, "本轮挂课"):
+                await _run_afk_workers(
+                    [
+                        _afk_worker(
+                            context,
+                            url_queue,
+                            pending_learning_urls,
+                            len(normalized_urls),
+                            status_callback,
+                        )
+                        for _ in range(worker_count)
+                    ]
+                )
+
+                await _recheck_url_type_links(context)
             _write_learning_queue(pending_learning_urls)
     except BaseException as exc:
         if _is_user_abort_exception(exc):
@@ -0,0 +1,146 @@
+"""
+按剩余学习时长调度挂课链接。
+
+开启 AFK_LONGEST_FIRST 后，挂课前先并发打开队列中的每门课程，通过一次页面脚本读取
+全部必修章节的类型和进度文本，按 build_video_timing_plan 估算剩余学习时长；
+随后按时长从长到短排列队列（最长处理时间优先），各标签页依次领取，避免长课程排在
+队尾拖长整体完成时间。预计完成时间按同样的领取规则模拟得出。
+主题链接包含多门课程，无法低成本估算，排在最前面且不计入预计完成时间。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from core.browser import ensure_controller_page
+from core.config import DOCUMENT_INITIAL_WAIT, PAGE_READY_TIMEOUT, ZHIXUEYUN_COURSE_PREFIX
+from core.learning_common import build_video_timing_plan, is_learned
+from core.pacing import pace
+from core.spans import span
+
+_CHAPTER_SELECTOR = "dl.chapter-list-box.required"
+_READ_CHAPTERS_SCRIPT = """
+(boxes) => boxes.map((box) => {
+    const wrapper = box.querySelector(".section-item-wrapper");
+    return [box.getAttribute("data-sectiontype"), wrapper ? wrapper.innerText : ""];
+})
+"""
+
+
+@dataclass
+class AfkSchedule:
+    urls: list[str]
+    estimates: dict[str, int | None] = field(default_factory=dict)
+    makespan_seconds: int = 0
+    finish_at: datetime | None = None
+
+    @property
+    def unknown_count(self) -> int:
+        return sum(1 for url in self.urls if self.estimates.get(url) is None)
+
+
+def estimate_chapters_seconds(chapters: list[tuple[str | None, str]]) -> int:
+    """按章节类型和进度文本估算课程剩余学习秒数。"""
+    total = 0
+    for section_type, progress_text in chapters:
+        if section_type in ("5", "6"):
+            if is_learned(progress_text):
+                continue
+            try:
+                total += build_video_timing_plan(progress_text).learning_wait_time
+            except Exception:
+                continue
+        elif section_type in ("1", "2", "3") and not is_learned(progress_text):
+            total += DOCUMENT_INITIAL_WAIT
+    return total
+
+
+async def estimate_course_seconds(page) -> int | None:
+    """读取已打开课程页的章节进度并估算剩余学习秒数，读取失败时返回 None。"""
+    try:
+        await page.locator(_CHAPTER_SELECTOR).last.wait_for(timeout=PAGE_READY_TIMEOUT * 1000)
+        chapters = await page.locator(_CHAPTER_SELECTOR).evaluate_all(_READ_CHAPTERS_SCRIPT)
+    except Exception as exc:
+        logging.debug(f"读取课程章节进度失败: {exc}")
+        return None
+    return estimate_chapters_seconds([tuple(chapter) for chapter in chapters])
+
+
+async def probe_remaining_seconds(context, urls: list[str], *, concurrency: int) -> dict[str, int | None]:
+    """并发打开课程链接估算剩余学习时长；主题链接和读取失败的链接为 None。"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def probe(url: str) -> int | None:
+        if not url.startswith(ZHIXUEYUN_COURSE_PREFIX):
+            return None
+        async with semaphore:
+            await ensure_controller_page(context)
+            page = await context.new_page()
+            try:
+                await pace("navigate")
+                with span("goto", url=url):
+                    await page.goto(url)
+                return await estimate_course_seconds(page)
+            except Exception as exc:
+                logging.debug(f"估算课程剩余学习时长失败: {url}, {exc}")
+                return None
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    results = await asyncio.gather(*(probe(url) for url in urls))
+    return dict(zip(urls, results))
+
+
+def order_longest_first(urls: list[str], estimates: dict[str, int | None]) -> list[str]:
+    """无法估算的链接保持原顺序排在最前，其余按剩余时长从长到短排列（时长相同保持原顺序）。"""
+    unknown = [url for url in urls if estimates.get(url) is None]
+    known = [url for url in urls if estimates.get(url) is not None]
+    known.sort(key=lambda url: estimates[url], reverse=True)
+    return unknown + known
+
+
+def simulate_makespan(durations: list[int], workers: int) -> int:
+    """按队列顺序模拟各标签页依次领取任务，返回全部完成所需的秒数。"""
+    loads = [0] * max(1, workers)
+    for duration in durations:
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+
+def _format_seconds(seconds: int) -> str:
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+async def schedule_longest_first(context, urls: list[str], *, workers: int) -> AfkSchedule:
+    """估算各链接剩余学习时长，返回按最长优先排列的队列和预计完成时间。"""
+    estimates = await probe_remaining_seconds(context, urls, concurrency=workers)
+    ordered = order_longest_first(urls, estimates)
+    makespan = simulate_makespan(
+        [estimates[url] for url in ordered if estimates.get(url) is not None],
+        workers,
+    )
+    schedule = AfkSchedule(
+        urls=ordered,
+        estimates=estimates,
+        makespan_seconds=makespan,
+        finish_at=datetime.now() + timedelta(seconds=makespan),
+    )
+
+    total = sum(seconds for seconds in estimates.values() if seconds is not None)
+    message = (
+        f"预计剩余学习时长共 {_format_seconds(total)}, 按 {workers} 个标签页最长优先分配, "
+        f"预计 {_format_seconds(makespan)} 后完成 ({schedule.finish_at:%m-%d %H:%M})"
+    )
+    if schedule.unknown_count:
+        message += f", 其中 {schedule.unknown_count} 条无法预估的链接未计入"
+    logging.info(message)
+    return schedule
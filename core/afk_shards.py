@@ -0,0 +1,298 @@
+"""
+多进程挂课。
+
+AFK_PROCESSES 大于 1 时，协调进程启动 AFK_PROCESSES 个挂课工作进程，每个工作进程启动
+自己的浏览器，按队列顺序逐条领取学习链接：在租约目录中以 O_EXCL 方式创建该链接对应的
+租约文件，创建成功的进程负责学习，其余进程跳过，学得快的进程自然多领取。
+工作进程不直接写队列文件，挂课失败、考试链接等写操作以及"已学完"通知都通过进程间队列
+发回协调进程，由协调进程作为唯一所有者更新课程链接、挂课失败和考试链接队列。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import traceback
+from pathlib import Path
+
+from core.abort import UserAbortRequested
+from core.afk_runner import (
+    StatusCallback,
+    _is_user_abort_exception,
+    _learn_url,
+    _prefilter_afk_urls,
+    _recheck_url_type_links,
+    _remove_pending_url,
+    _run_afk_workers,
+    _schedule_afk_urls,
+    _write_learning_queue,
+    prepare_afk_batch,
+)
+from core.browser import HEADLESS_AFK_PROFILE, create_browser_context
+from core.config import (
+    AFK_CONCURRENCY,
+    AFK_HEADLESS,
+    AFK_LEASE_DIR,
+    AFK_LONGEST_FIRST,
+    AFK_PREFILTER,
+    LEARNING_FAILURES_FILE,
+    setup_logging,
+)
+from core.diagnostics import diagnose_workflow
+from core.exam_queue import append_exam_url
+from core.file_ops import normalize_url
+from core.learning_queue import (
+    read_learning_failures,
+    record_learning_failure,
+    remove_learning_failure,
+)
+from core.queue_owner import QueueCall, forward_queue_calls
+from core.resource_blocking import block_resources
+
+_POLL_SECONDS = 0.5
+_STOP_TIMEOUT = 5
+_QUEUE_CALLS = {
+    "record_learning_failure": record_learning_failure,
+    "remove_learning_failure": remove_learning_failure,
+    "append_exam_url": append_exam_url,
+}
+
+
+def _afk_profile() -> str | None:
+    return HEADLESS_AFK_PROFILE if AFK_HEADLESS else None
+
+
+def lease_path(lease_dir: Path, url: str) -> Path:
+    return Path(lease_dir) / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.lease"
+
+
+def claim_url(lease_dir: Path, url: str) -> bool:
+    """以 O_EXCL 创建租约文件领取链接，已被其他进程领取时返回 False。"""
+    try:
+        fd = os.open(lease_path(lease_dir, url), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        file.write(f"{os.getpid()}\n{url}\n")
+    return True
+
+
+def reset_lease_dir(lease_dir: Path) -> None:
+    shutil.rmtree(lease_dir, ignore_errors=True)
+    Path(lease_dir).mkdir(parents=True, exist_ok=True)
+
+
+def apply_queue_call(call: QueueCall) -> None:
+    """在协调进程中执行工作进程转交的队列写操作。"""
+    name, kwargs = call
+    handler = _QUEUE_CALLS.get(name)
+    if handler is None:
+        raise ValueError(f"未知的队列写操作: {name}")
+    handler(**kwargs)
+
+
+async def _shard_tab_worker(context, pending, lease_dir: Path, worker_index: int, total: int, send) -> None:
+    for index, url in pending:
+        if not claim_url(lease_dir, url):
+            continue
+        send(("status", f"进程 {worker_index} 挂课 {index}/{total}: {url}"))
+        logging.info(f"(进程 {worker_index}, {index}/{total})当前学习链接为: {url}")
+        await _learn_url(context, url)
+        send(("done", url))
+
+
+async def _run_shard_worker(
+    worker_index: int,
+    urls: list[str],
+    lease_dir: Path,
+    send,
+    concurrency: int,
+) -> None:
+    with forward_queue_calls(lambda call: send(("call", *call))):
+        async with (
+            diagnose_workflow(f"afk-shard{worker_index}"),
+            create_browser_context(profile=_afk_profile()) as (_, context),
+        ):
+            pending = iter(enumerate(urls, start=1))
+            tab_count = max(1, min(concurrency, len(urls)))
+            async with block_resources(context, f"进程 {worker_index} 挂课"):
+                await _run_afk_workers(
+                    [
+                        _shard_tab_worker(context, pending, lease_dir, worker_index, len(urls), send)
+                        for _ in range(tab_count)
+                    ]
+                )
+
+
+def shard_worker_main(
+    worker_index: int,
+    urls: list[str],
+    lease_dir: str,
+    message_queue,
+    concurrency: int,
+) -> None:
+    """挂课工作进程入口，结果和异常都通过 message_queue 发回协调进程。"""
+    setup_logging(show_startup_banner=False)
+    send = message_queue.put
+    try:
+        asyncio.run(_run_shard_worker(worker_index, urls, Path(lease_dir), send, concurrency))
+    except KeyboardInterrupt:
+        send(("abort", "已收到 Ctrl+C，程序退出", False))
+    except UserAbortRequested as exc:
+        send(("abort", str(exc), exc.save_pending_urls))
+    except BaseException as exc:
+        logging.error(f"挂课进程 {worker_index} 异常退出: {exc}")
+        logging.error(traceback.format_exc())
+        send(("error", f"挂课进程 {worker_index} 异常退出: {exc}"))
+
+
+def _handle_message(message, pending_learning_urls: list[str], status_callback) -> None:
+    kind = message[0]
+    if kind == "status":
+        if status_callback:
+            status_callback(message[1])
+    elif kind == "call":
+        apply_queue_call((message[1], message[2]))
+    elif kind == "done":
+        _remove_pending_url(pending_learning_urls, message[1])
+    elif kind == "abort":
+        raise UserAbortRequested(message[1], save_pending_urls=message[2])
+    elif kind == "error":
+        raise RuntimeError(message[1])
+
+
+async def _coordinate(workers, message_queue, pending_learning_urls: list[str], status_callback) -> None:
+    """处理工作进程发回的消息，直到全部工作进程退出且队列取空。"""
+    while True:
+        try:
+            message = await asyncio.to_thread(message_queue.get, True, _POLL_SECONDS)
+        except queue.Empty:
+            if any(worker.is_alive() for worker in workers):
+                continue
+            break
+        _handle_message(message, pending_learning_urls, status_callback)
+
+    for worker in workers:
+        if worker.exitcode:
+            logging.warning(
+                f"挂课进程 {worker.name} 退出码为 {worker.exitcode}, 未学完的链接保留在课程链接队列中"
+            )
+
+
+def _stop_workers(workers) -> None:
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+    for worker in workers:
+        if worker.pid is not None:
+            worker.join(_STOP_TIMEOUT)
+
+
+async def _recheck_url_type_links_if_needed() -> None:
+    if not any(
+        entry.reason == "url_type_pending"
+        for entry in read_learning_failures(file_path=LEARNING_FAILURES_FILE)
+    ):
+        return
+    async with create_browser_context(profile=_afk_profile()) as (_, context):
+        await _recheck_url_type_links(context)
+
+
+async def _plan_sharded_urls(
+    urls: list[str],
+    pending_learning_urls: list[str],
+    status_callback: StatusCallback | None,
+    *,
+    processes: int,
+    concurrency: int,
+) -> list[str]:
+    """在协调进程里完成接口预检和最长优先排序；工作进程按列表顺序领取链接。"""
+    if not AFK_PREFILTER and not AFK_LONGEST_FIRST:
+        return urls
+    async with create_browser_context(profile=_afk_profile()) as (_, context):
+        urls = await _prefilter_afk_urls(context, urls, pending_learning_urls, status_callback)
+        return await _schedule_afk_urls(
+            context,
+            urls,
+            pending_learning_urls,
+            status_callback,
+            workers=max(1, min(processes, len(urls))) * concurrency,
+        )
+
+
+async def run_afk_sharded(
+    status_callback: StatusCallback | None = None,
+    *,
+    processes: int,
+    concurrency: int | None = None,
+    lease_dir: Path = AFK_LEASE_DIR,
+) -> bool:
+    batch = prepare_afk_batch()
+    if not batch.urls:
+        if status_callback:
+            status_callback("未检测到可处理的学习链接")
+        return False
+
+    normalized_urls = list(dict.fromkeys(normalize_url(raw_url.strip()) for raw_url in batch.urls))
+    pending_learning_urls = list(normalized_urls)
+    _write_learning_queue(pending_learning_urls)
+
+    if concurrency is None:
+        concurrency = AFK_CONCURRENCY
+
+    mp_context = multiprocessing.get_context("spawn")
+    message_queue = mp_context.Queue()
+    workers: list = []
+    try:
+        normalized_urls = await _plan_sharded_urls(
+            normalized_urls,
+            pending_learning_urls,
+            status_callback,
+            processes=processes,
+            concurrency=concurrency,
+        )
+        if normalized_urls:
+            process_count = max(1, min(processes, len(normalized_urls)))
+            reset_lease_dir(lease_dir)
+            workers = [
+                mp_context.Process(
+                    target=shard_worker_main,
+                    args=(index, normalized_urls, str(lease_dir), message_queue, concurrency),
+                    name=f"afk-{index}",
+                )
+                for index in range(1, process_count + 1)
+            ]
+            logging.info(f"挂课进程数量: {process_count}, 每个进程并发标签页数量: {concurrency}")
+            for worker in workers:
+                worker.start()
+            await _coordinate(workers, message_queue, pending_learning_urls, status_callback)
+        await _recheck_url_type_links_if_needed()
+        _write_learning_queue(pending_learning_urls)
+    except BaseException as exc:
+        if _is_user_abort_exception(exc):
+            if isinstance(exc, KeyboardInterrupt):
+                save_pending_urls = False
+                message = "已收到 Ctrl+C，程序退出"
+            else:
+                save_pending_urls = getattr(exc, "save_pending_urls", True)
+                message = str(exc) or "已保存当前和剩余学习链接，程序退出"
+            if save_pending_urls:
+                _write_learning_queue(pending_learning_urls)
+            logging.debug(f"用户主动终止挂课流程: {message}")
+            raise UserAbortRequested(
+                message,
+                save_pending_urls=save_pending_urls,
+            ) from None
+        raise
+    finally:
+        _stop_workers(workers)
+        message_queue.close()
+        shutil.rmtree(lease_dir, ignore_errors=True)
+
+    logging.info("本轮自动挂课完成")
+    return False
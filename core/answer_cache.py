@@ -0,0 +1,311 @@
+"""
+AI 答案本地缓存。
+
+按「模型配置 + 题型 + 归一化题干 + 排序后的选项文本」作为键持久化到 SQLite，
+缓存值保存选项文本而不是选项字母，命中时再映射回当前试卷的选项字母，
+因此选项乱序的试卷同样可以命中。同一轮运行中相同题目的并发请求共享一次 AI 调用。
+
+AI 新给出的答案先记在本次作答（AnswerAttempt）里，只有确认考试通过后才写入缓存；
+未通过时丢弃这些答案，并删除本次作答命中的缓存条目，避免错误答案在重考或
+共用题库的其他试卷中被反复使用。无法确认考试结果的作答不会写入缓存。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from core.config import (
+    AI_ANSWER_CACHE_ENABLED,
+    AI_ANSWER_CACHE_FILE,
+    AI_ANSWER_CACHE_MAX_ENTRIES,
+)
+from core.exam_queue import normalize_model_config
+
+
+_CHOICE_TYPES = {"single", "multiple", "reading", "ordering"}
+_CACHEABLE_TYPES = _CHOICE_TYPES | {"judge"}
+_ACTIVE_ANSWER_CACHE: "AnswerCache | None" = None
+
+
+def normalize_question_text(text: str) -> str:
+    normalized = unicodedata.normalize("NFKC", str(text or ""))
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def _option_texts(question_data) -> list[str]:
+    return [
+        normalize_question_text(option.get("text", ""))
+        for option in question_data.get("options") or []
+    ]
+
+
+def build_answer_cache_key(model_config, question_data) -> str | None:
+    """生成缓存键；题目信息不完整或不适合缓存时返回 None。"""
+    question_type = question_data.get("type")
+    if question_type not in _CACHEABLE_TYPES:
+        return None
+
+    question_text = normalize_question_text(question_data.get("text", ""))
+    if not question_text:
+        return None
+
+    option_texts = _option_texts(question_data)
+    if question_type in _CHOICE_TYPES:
+        if not option_texts or not all(option_texts):
+            return None
+        if len(set(option_texts)) != len(option_texts):
+            return None
+
+    normalized_config = normalize_model_config(model_config)
+    payload = {
+        "model_config": normalized_config,
+        "type": question_type,
+        "text": question_text,
+        "options": sorted(option_texts),
+    }
+    raw_key = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+def to_canonical_answers(question_data, answers: list[str]) -> list[str] | None:
+    """把选项字母答案转换为与选项顺序无关的选项文本。"""
+    if not answers:
+        return None
+    if question_data.get("type") == "judge":
+        return list(answers)
+
+    text_by_label = {
+        str(option.get("label", "")).upper(): normalize_question_text(option.get("text", ""))
+        for option in question_data.get("options") or []
+    }
+    canonical: list[str] = []
+    for answer in answers:
+        text = text_by_label.get(str(answer).upper())
+        if not text:
+            return None
+        canonical.append(text)
+    return canonical
+
+
+def map_canonical_answers(question_data, canonical_answers: list[str] | None) -> list[str] | None:
+    """把缓存中的选项文本映射回当前试卷的选项字母。"""
+    if not canonical_answers:
+        return None
+    if question_data.get("type") == "judge":
+        return list(canonical_answers)
+
+    label_by_text = {
+        normalize_question_text(option.get("text", "")): str(option.get("label", "")).upper()
+        for option in question_data.get("options") or []
+    }
+    answers: list[str] = []
+    for text in canonical_answers:
+        label = label_by_text.get(text)
+        if not label:
+            return None
+        answers.append(label)
+    return answers
+
+
+class AnswerAttempt:
+    """一次作答中新请求到的答案和命中的缓存键；通过后 commit，未通过时 discard。"""
+
+    def __init__(self, cache: "AnswerCache | None", *, use_cached: bool = True):
+        self.cache = cache
+        self.use_cached = use_cached
+        self.pending: dict[str, list[str]] = {}
+        self.hit_keys: set[str] = set()
+
+    def commit(self) -> None:
+        """考试已通过：把本次新请求到的答案写入缓存。"""
+        if self.cache is not None:
+            for key, canonical_answers in self.pending.items():
+                self.cache.store(key, canonical_answers)
+        self.pending.clear()
+
+    def discard(self) -> None:
+        """考试未通过：丢弃本次新答案，并删除本次命中的缓存条目。"""
+        if self.cache is not None and self.hit_keys:
+            self.cache.forget(self.hit_keys)
+            logging.info(f"考试未通过, 已删除本次命中的 {len(self.hit_keys)} 条本地答案缓存")
+        self.pending.clear()
+        self.hit_keys.clear()
+
+
+class AnswerCache:
+    """SQLite 持久化的 LRU 答案缓存，首次读写时才创建数据库文件。"""
+
+    def __init__(self, db_path: Path = AI_ANSWER_CACHE_FILE, *, max_entries: int = AI_ANSWER_CACHE_MAX_ENTRIES):
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, max_entries)
+        self._connection: sqlite3.Connection | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._attempt: AnswerAttempt | None = None
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, answers TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_answers_last_used ON answers(last_used)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def lookup(self, key: str) -> list[str] | None:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT answers FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            "UPDATE answers SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        connection.commit()
+        try:
+            answers = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return answers if isinstance(answers, list) else None
+
+    def store(self, key: str, canonical_answers: list[str]) -> None:
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO answers(key, answers, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(canonical_answers, ensure_ascii=False), time.time()),
+        )
+        connection.execute(
+            "DELETE FROM answers WHERE key IN ("
+            "SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        connection.commit()
+
+    def forget(self, keys) -> None:
+        connection = self._connect()
+        connection.executemany("DELETE FROM answers WHERE key = ?", [(key,) for key in keys])
+        connection.commit()
+
+    @contextmanager
+    def attempt(self, *, use_cached: bool = True):
+        """with 块内的 get_answers 都记入同一次作答；use_cached=False 时不读取已有缓存。"""
+        attempt = AnswerAttempt(self, use_cached=use_cached)
+        previous = self._attempt
+        self._attempt = attempt
+        try:
+            yield attempt
+        finally:
+            self._attempt = previous
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def get_answers(
+        self,
+        model_config,
+        question_data,
+        fetch: Callable[[], Awaitable[list[str]]],
+    ) -> list[str]:
+        key = build_answer_cache_key(model_config, question_data)
+        if key is None:
+            return await fetch()
+
+        attempt = self._attempt
+        if attempt is not None and key in attempt.pending:
+            self.shared += 1
+            return map_canonical_answers(question_data, attempt.pending[key]) or []
+
+        if attempt is None or attempt.use_cached:
+            cached = map_canonical_answers(question_data, self.lookup(key))
+            if cached:
+                self.hits += 1
+                if attempt is not None:
+                    attempt.hit_keys.add(key)
+                logging.info(f"命中本地答案缓存: {cached}")
+                return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            canonical = await asyncio.shield(inflight)
+            return map_canonical_answers(question_data, canonical) or []
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = future
+        try:
+            answers = await fetch()
+            canonical = to_canonical_answers(question_data, answers)
+            if canonical and attempt is not None:
+                attempt.pending[key] = canonical
+            future.set_result(canonical)
+            return answers
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+def open_answer_cache() -> AnswerCache | None:
+    if not AI_ANSWER_CACHE_ENABLED:
+        return None
+    return AnswerCache(AI_ANSWER_CACHE_FILE, max_entries=AI_ANSWER_CACHE_MAX_ENTRIES)
+
+
+def get_active_answer_cache() -> AnswerCache | None:
+    return _ACTIVE_ANSWER_CACHE
+
+
+@contextmanager
+def record_answer_attempt(*, use_cached: bool = True):
+    """在当前启用的答案缓存上记录一次作答；未启用缓存时返回空的作答记录。"""
+    cache = _ACTIVE_ANSWER_CACHE
+    if cache is None:
+        yield AnswerAttempt(None, use_cached=use_cached)
+        return
+    with cache.attempt(use_cached=use_cached) as attempt:
+        yield attempt
+
+
+@contextmanager
+def use_answer_cache(cache: AnswerCache | None):
+    """在当前流程内启用答案缓存，退出时关闭数据库连接。"""
+    global _ACTIVE_ANSWER_CACHE
+
+    previous = _ACTIVE_ANSWER_CACHE
+    _ACTIVE_ANSWER_CACHE = cache
+    try:
+        yield cache
+    finally:
+        _ACTIVE_ANSWER_CACHE = previous
+        if cache is not None:
+            if cache.hits or cache.shared:
+                logging.info(
+                    f"本地答案缓存命中 {cache.hits} 题, 合并重复请求 {cache.shared} 题, 新请求 {cache.misses} 题"
+                )
+            cache.close()
@@ -3,7 +3,9 @@ from __future__ import annotations
 import asyncio
 import json
 import re
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
 
 from playwright.async_api import async_playwright
 
@@ -12,15 +14,22 @@ from core.config import (
     BROWSER_CHANNEL,
     BROWSER_TYPE,
     COOKIES_FILE,
+    HEADLESS_AFK_BROWSER_ARGS,
+    HEADLESS_AFK_VIEWPORT,
     MYLEARNING_HOME,
     ZHIXUEYUN_HOME,
     ZHIXUEYUN_HOME_PATTERN,
+    persistent_event_loop,
+    run_async,
 )
 
 
 _CONTROLLER_PAGES: dict[int, object] = {}
 _CONTEXT_HEADLESS: dict[int, bool] = {}
 _START_MAXIMIZED_ARG = "--start-maximized"
+# 启动配置：None 为默认有界面浏览器，"afk_headless" 为无头挂课
+HEADLESS_AFK_PROFILE = "afk_headless"
+HEADLESS_LOGIN_TIMEOUT = 60  # 秒
 
 
 def _get_browser_launcher(playwright):
@@ -35,7 +44,14 @@ def build_browser_launch_options(
     headless: bool,
     slow_mo=None,
     extra_args: list[str] | None = None,
+    profile: str | None = None,
 ):
+    if profile == HEADLESS_AFK_PROFILE:
+        headless = True
+        extra_args = [*HEADLESS_AFK_BROWSER_ARGS, *(extra_args or [])]
+    elif profile is not None:
+        raise ValueError(f"未知的浏览器启动配置: {profile}")
+
     options = {"headless": headless}
 
     if BROWSER_TYPE == "chromium":
@@ -74,19 +90,29 @@ async def maximize_browser_window_for_page(page, *, headless: bool) -> None:
         pass
 
 
-def build_browser_context_options(*, headless: bool) -> dict[str, object]:
+def build_browser_context_options(*, headless: bool, profile: str | None = None) -> dict[str, object]:
+    if profile == HEADLESS_AFK_PROFILE:
+        return {"viewport": dict(HEADLESS_AFK_VIEWPORT)}
     if headless:
         return {}
     return {"no_viewport": True}
 
 
-async def launch_async_browser(playwright, *, headless: bool, slow_mo=None, extra_args=None):
+async def launch_async_browser(
+    playwright,
+    *,
+    headless: bool,
+    slow_mo=None,
+    extra_args=None,
+    profile: str | None = None,
+):
     browser_launcher = _get_browser_launcher(playwright)
     return await browser_launcher.launch(
         **build_browser_launch_options(
             headless=headless,
             slow_mo=slow_mo,
             extra_args=extra_args,
+            profile=profile,
         )
     )
 
@@ -169,7 +195,19 @@ async def _open_controller_page(context, *, authenticate: bool = False, headless
     await maximize_browser_window_for_page(page, headless=headless)
     if authenticate:
         await page.goto(ZHIXUEYUN_HOME)
-        await page.wait_for_url(re.compile(ZHIXUEYUN_HOME_PATTERN), timeout=0)
+        if headless:
+            # 无头模式下无法手动登录，凭证失效时不能无限等待
+            try:
+                await page.wait_for_url(
+                    re.compile(ZHIXUEYUN_HOME_PATTERN),
+                    timeout=HEADLESS_LOGIN_TIMEOUT * 1000,
+                )
+            except Exception as exc:
+                if is_target_closed_exception(exc):
+                    raise
+                raise Exception("无头模式登录超时, 请先更新登录凭证") from exc
+        else:
+            await page.wait_for_url(re.compile(ZHIXUEYUN_HOME_PATTERN), timeout=0)
     await page.goto(MYLEARNING_HOME, wait_until="load")
     return page
 
@@ -224,40 +262,211 @@ def release_controller_page(context) -> None:
     _CONTEXT_HEADLESS.pop(id(context), None)
 
 
+def _read_cookies(cookies_path):
+    with open(cookies_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _cookies_signature(cookies_path) -> tuple[str, int | None]:
+    path = Path(cookies_path)
+    try:
+        return str(path.resolve()), path.stat().st_mtime_ns
+    except OSError:
+        return str(path), None
+
+
+async def _open_authenticated_context(
+    playwright,
+    cookies,
+    *,
+    headless: bool,
+    slow_mo=None,
+    profile: str | None = None,
+):
+    if profile == HEADLESS_AFK_PROFILE:
+        headless = True
+    browser = await launch_async_browser(
+        playwright,
+        headless=headless,
+        slow_mo=slow_mo,
+        profile=profile,
+    )
+    context = await browser.new_context(
+        **build_browser_context_options(headless=headless, profile=profile)
+    )
+    _CONTEXT_HEADLESS[id(context)] = headless
+    await context.add_cookies(cookies)
+
+    # 保留一个常驻主控页，避免课程页关闭后浏览器直接退出。
+    controller_page = await _open_controller_page(
+        context,
+        authenticate=True,
+        headless=headless,
+    )
+    _remember_controller_page(context, controller_page)
+    return browser, context
+
+
+async def _close_browser_quietly(browser, context) -> None:
+    release_controller_page(context)
+    try:
+        await context.close()
+    except Exception:
+        pass
+    try:
+        await browser.close()
+    except Exception:
+        pass
+
+
+@dataclass
+class _SessionEntry:
+    browser: object
+    context: object
+    cookies_signature: tuple[str, int | None]
+
+
+class BrowserSession:
+    """
+    启动器进程内常驻的已登录浏览器。
+
+    按启动参数（headless、slow_mo、启动配置）各保留一个浏览器和上下文，各流程通过
+    create_browser_context 复用，流程结束时只关闭流程打开的标签页；
+    浏览器被关闭或凭证文件更新后，下次使用时重新启动并登录。
+    """
+
+    def __init__(self):
+        self._playwright_manager = None
+        self._playwright = None
+        self._entries: dict[tuple[bool, object, str | None], _SessionEntry] = {}
+        self.launch_count = 0
+
+    async def _get_playwright(self):
+        if self._playwright is None:
+            self._playwright_manager = async_playwright()
+            self._playwright = await self._playwright_manager.start()
+        return self._playwright
+
+    async def acquire(
+        self,
+        cookies_path=COOKIES_FILE,
+        *,
+        headless=False,
+        slow_mo=None,
+        profile: str | None = None,
+    ):
+        key = (bool(headless), slow_mo, profile)
+        signature = _cookies_signature(cookies_path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.cookies_signature == signature and is_browser_connected(entry.context):
+                return entry.browser, entry.context
+            self._entries.pop(key, None)
+            await _close_browser_quietly(entry.browser, entry.context)
+
+        cookies = _read_cookies(cookies_path)
+        browser, context = await _open_authenticated_context(
+            await self._get_playwright(),
+            cookies,
+            headless=headless,
+            slow_mo=slow_mo,
+            profile=profile,
+        )
+        self.launch_count += 1
+        self._entries[key] = _SessionEntry(browser, context, signature)
+        return browser, context
+
+    async def invalidate(self) -> None:
+        """关闭全部常驻浏览器，下次使用时重新登录。"""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            await _close_browser_quietly(entry.browser, entry.context)
+
+    async def close(self) -> None:
+        await self.invalidate()
+        if self._playwright_manager is not None:
+            try:
+                await self._playwright_manager.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self._playwright_manager = None
+        self._playwright = None
+
+
+_ACTIVE_BROWSER_SESSION: BrowserSession | None = None
+
+
+def get_active_browser_session() -> BrowserSession | None:
+    return _ACTIVE_BROWSER_SESSION
+
+
+@contextmanager
+def launcher_browser_session():
+    """在启动器进程内启用常驻浏览器会话，并让 run_async 复用同一个事件循环。"""
+    global _ACTIVE_BROWSER_SESSION
+
+    with persistent_event_loop():
+        session = BrowserSession()
+        _ACTIVE_BROWSER_SESSION = session
+        try:
+            yield session
+        finally:
+            _ACTIVE_BROWSER_SESSION = None
+            run_async(session.close())
+
+
+def invalidate_browser_session() -> None:
+    """登录凭证更新后丢弃常驻浏览器，避免继续使用旧账号的登录状态。"""
+    session = get_active_browser_session()
+    if session is not None:
+        run_async(session.invalidate())
+
+
+async def close_pages_except_controller(context) -> None:
+    controller_page = _CONTROLLER_PAGES.get(id(context))
+    for page in list(getattr(context, "pages", []) or []):
+        if page is controller_page or _is_page_closed(page):
+            continue
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+
 @asynccontextmanager
 async def create_browser_context(
-    cookies_path=COOKIES_FILE, headless=False, slow_mo=None
+    cookies_path=COOKIES_FILE, headless=False, slow_mo=None, profile=None
 ):
     """浏览器初始化上下文管理器, 封装重复的启动/认证/关闭流程"""
 
-    with open(cookies_path, "r", encoding="utf-8") as f:
-        cookies = json.load(f)
-
-    async with async_playwright() as p:
-        browser = await launch_async_browser(p, headless=headless, slow_mo=slow_mo)
-        context = await browser.new_context(
-            **build_browser_context_options(headless=headless)
+    session = get_active_browser_session()
+    if session is not None:
+        browser, context = await session.acquire(
+            cookies_path,
+            headless=headless,
+            slow_mo=slow_mo,
+            profile=profile,
         )
-        _CONTEXT_HEADLESS[id(context)] = headless
-        await context.add_cookies(cookies)
+        await ensure_controller_page(context)
+        try:
+            yield browser, context
+        finally:
+            if is_browser_connected(context):
+                await close_pages_except_controller(context)
+        return
 
-        # 保留一个常驻主控页，避免课程页关闭后浏览器直接退出。
-        controller_page = await _open_controller_page(
-            context,
-            authenticate=True,
+    cookies = _read_cookies(cookies_path)
+
+    async with async_playwright() as p:
+        browser, context = await _open_authenticated_context(
+            p,
+            cookies,
             headless=headless,
+            slow_mo=slow_mo,
+            profile=profile,
         )
-        _remember_controller_page(context, controller_page)
-
         try:
             yield browser, context
         finally:
-            release_controller_page(context)
-            try:
-                await context.close()
-            except Exception:
-                pass
-            try:
-                await browser.close()
-            except Exception:
-                pass
+            await _close_browser_quietly(browser, context)
@@ -9,6 +9,7 @@ import ctypes
 import logging
 import os
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -140,14 +141,42 @@ def _make_asyncio_exception_handler(previous_handler=None):
     return _handle_asyncio_exception
 
 
+_PERSISTENT_RUNNER: asyncio.Runner | None = None
+
+
+def _install_asyncio_exception_handler(runner: asyncio.Runner) -> None:
+    loop = runner.get_loop()
+    previous_handler = loop.get_exception_handler()
+    loop.set_exception_handler(_make_asyncio_exception_handler(previous_handler))
+
+
 def run_async(awaitable):
+    if _PERSISTENT_RUNNER is not None:
+        return _PERSISTENT_RUNNER.run(awaitable)
+
     with asyncio.Runner() as runner:
-        loop = runner.get_loop()
-        previous_handler = loop.get_exception_handler()
-        loop.set_exception_handler(_make_asyncio_exception_handler(previous_handler))
+        _install_asyncio_exception_handler(runner)
         return runner.run(awaitable)
 
 
+@contextmanager
+def persistent_event_loop():
+    """让期间所有 run_async 调用复用同一个事件循环，常驻浏览器会话依赖于此"""
+    global _PERSISTENT_RUNNER
+
+    if _PERSISTENT_RUNNER is not None:
+        yield _PERSISTENT_RUNNER
+        return
+
+    with asyncio.Runner() as runner:
+        _install_asyncio_exception_handler(runner)
+        _PERSISTENT_RUNNER = runner
+        try:
+            yield runner
+        finally:
+            _PERSISTENT_RUNNER = None
+
+
 def _env_flag(name: str, default: bool = False) -> bool:
     value = os.getenv(name)
     if value is None:
@@ -163,6 +192,24 @@ def _env_text(name: str, default: str | None = None) -> str | None:
     return stripped or default
 
 
+def _env_int(name: str, default: int, *, minimum: int | None = None) -> int:
+    value = _env_text(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        return default
+    if minimum is not None and parsed < minimum:
+        return minimum
+    return parsed
+
+
+def _env_csv_set(name: str, default: str) -> frozenset[str]:
+    value = _env_text(name, default) or ""
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
+
+
 def _default_browser_channel(browser_type: str) -> str | None:
     if browser_type == "chromium" and sys.platform.startswith("win"):
         return "msedge"
@@ -320,6 +367,13 @@ AI_RESPONSE_TOOLS = [{"type": "web_search"}] if AI_ENABLE_WEB_SEARCH else None
 
 # AI 考试参数
 AI_TEMPERATURE = 0
+# 同步 OpenAI 客户端请求所用的专用线程数，避免阻塞事件循环
+AI_REQUEST_MAX_WORKERS = _env_int("AI_REQUEST_MAX_WORKERS", 8, minimum=1)
+# 多题目模式下同时向 AI 发出的最大请求数
+AI_EXAM_CONCURRENCY = _env_int("AI_EXAM_CONCURRENCY", 5, minimum=1)
+# 本地答案缓存：相同模型配置下重复出现的题目直接复用答案
+AI_ANSWER_CACHE_ENABLED = _env_flag("AI_ANSWER_CACHE", True)
+AI_ANSWER_CACHE_MAX_ENTRIES = _env_int("AI_ANSWER_CACHE_MAX_ENTRIES", 20000, minimum=1)
 AI_SYSTEM_PROMPT = (
     "你是一个专业的考试助手, 请根据题目选择最合适的答案。"
     "如果关键信息不足且已提供联网搜索工具, 可以先搜索再作答。"
@@ -333,6 +387,34 @@ BROWSER_TYPE = (_env_text("BROWSER_TYPE", "chromium") or "chromium").lower()
 BROWSER_CHANNEL = _env_text("BROWSER_CHANNEL", _default_browser_channel(BROWSER_TYPE))
 BROWSER_ARGS = ["--mute-audio"]
 
+# 无头挂课启动配置：不显示窗口，固定小视口，允许静音自动播放，
+# 并关闭后台标签页的计时器节流，避免多个并发课程标签页的视频计时被降频
+AFK_HEADLESS = _env_flag("AFK_HEADLESS", False)
+HEADLESS_AFK_VIEWPORT = {"width": 1280, "height": 720}
+HEADLESS_AFK_BROWSER_ARGS = [
+    "--autoplay-policy=no-user-gesture-required",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-dev-shm-usage",
+]
+
+# 按页面类型拦截自动化流程用不到的资源（挂课、AI 考试和学习专区解析，人工考试不拦截）。
+# 各页面类型拦截的资源类型为 Playwright resource_type，逗号分隔；课程页放行视频等媒体资源，
+# 默认也放行图片，避免文档类章节的页面图片加载不完整
+RESOURCE_BLOCKING = _env_flag("RESOURCE_BLOCKING", False)
+RESOURCE_BLOCKING_PROFILES = {
+    "course": _env_csv_set("RESOURCE_BLOCK_COURSE", "font"),
+    "subject": _env_csv_set("RESOURCE_BLOCK_SUBJECT", "image,font,media"),
+    "exam": _env_csv_set("RESOURCE_BLOCK_EXAM", "image,font,media"),
+    "learning_zone": _env_csv_set("RESOURCE_BLOCK_LEARNING_ZONE", "image,font,media"),
+}
+# 所有页面类型都拦截的统计/埋点脚本地址
+RESOURCE_BLOCK_URL_PATTERN = _env_text(
+    "RESOURCE_BLOCK_URL_PATTERN",
+    r"(hm\.baidu\.com|google-analytics\.com|googletagmanager\.com|cnzz\.com|umeng\.com|growingio\.com|sensorsdata)",
+)
+
 # ============================================================
 # 平台 URL
 # ============================================================
@@ -353,6 +435,11 @@ LEARNING_URLS_FILE = PROJECT_ROOT / "课程链接.json"
 LEARNING_FAILURES_FILE = PROJECT_ROOT / "挂课失败链接.json"
 EXAM_URLS_FILE = PROJECT_ROOT / "考试链接.json"
 MANUAL_EXAM_FILE = PROJECT_ROOT / "人工考试链接.json"
+AI_ANSWER_CACHE_FILE = PROJECT_ROOT / "answer_cache.sqlite3"
+RUN_TRACE_FILE = PROJECT_ROOT / "run_trace.jsonl"
+DIAGNOSTICS_DIR = PROJECT_ROOT / "diagnostics"
+# QUEUE_BACKEND=sqlite 时，队列保存在队列文件所在目录下的这个数据库中
+QUEUE_DB_FILENAME = "queue_state.sqlite3"
 
 # ============================================================
 # 超时 / 等待时间（秒）
@@ -367,6 +454,20 @@ VIDEO_PROGRESS_SHORT_INTERVAL = 1  # 秒
 VIDEO_PROGRESS_MEDIUM_INTERVAL = 5  # 秒
 VIDEO_PROGRESS_LONG_INTERVAL = 10  # 秒
 
+# 视频学习进度上报/查询接口的 URL 正则；命中的 XHR/fetch 响应会立即触发一次章节进度确认，
+# 服务器确认学完即结束该章节。学习期间一直没有命中的响应时退回按时长等待 + 定时检查章节进度
+VIDEO_PROGRESS_RESPONSE_PATTERN = _env_text(
+    "VIDEO_PROGRESS_RESPONSE_PATTERN",
+    r"(progress|study-?record|learn-?record)",
+)
+
+# 学习专区课程列表接口的 URL 正则；解析专区时只从命中的 XHR/fetch 响应里提取课程/主题，
+# 避免推荐位、导航等其他接口返回的课程混进来。设为空值时读取所有 JSON 响应
+LEARNING_ZONE_LIST_API_PATTERN = _env_text(
+    "LEARNING_ZONE_LIST_API_PATTERN",
+    r"(list|page|search)",
+)
+
 # 文档课程初始等待时间
 DOCUMENT_INITIAL_WAIT = 5  # 秒
 # 文档课程进度同步额外等待时间
@@ -375,8 +476,71 @@ DOCUMENT_SYNC_EXTRA_WAIT = 30  # 秒
 # URL 学习类型等待时间
 URL_TYPE_WAIT = 10  # 秒
 
-# 挂课流程的 slow_mo 参数
-AFK_SLOW_MO = 3000  # 毫秒
+# 页面就绪判断的最长等待时间，超时后按原流程继续
+PAGE_READY_TIMEOUT = _env_int("PAGE_READY_TIMEOUT", 10, minimum=1)  # 秒
+
+# 挂课操作节奏：只在下列用户可见操作之前等待指定毫秒数，读取页面内容不等待。
+# 取代原先启动浏览器时统一设置的 slow_mo=3000（所有 Playwright 调用都会被延迟）
+AFK_PACING = {
+    # 打开课程/主题链接、复查 URL 类型链接
+    "navigate": _env_int("AFK_PACE_NAVIGATE_MS", 3000, minimum=0),
+    # 在主题中点击打开课程/URL 学习的新标签页
+    "open_popup": _env_int("AFK_PACE_OPEN_POPUP_MS", 3000, minimum=0),
+    # 点击章节开始学习、点击继续播放
+    "play": _env_int("AFK_PACE_PLAY_MS", 3000, minimum=0),
+    # 评分、课程质量评价等弹窗内的点击
+    "popup": _env_int("AFK_PACE_POPUP_MS", 1000, minimum=0),
+}  # 毫秒
+
+# 挂课并发标签页数量，同一浏览器上下文内同时学习的课程/主题数
+AFK_CONCURRENCY = _env_int("AFK_CONCURRENCY", 1, minimum=1)
+
+# 挂课进程数量：大于 1 时启动多个挂课进程，每个进程使用自己的浏览器并按 AFK_CONCURRENCY
+# 打开标签页，进程之间通过租约目录中的租约文件领取学习链接，队列文件只由主进程写入
+AFK_PROCESSES = _env_int("AFK_PROCESSES", 1, minimum=1)
+AFK_LEASE_DIR = PROJECT_ROOT / ".afk_leases"
+
+# 挂课前的接口预检：打开标签页前先用浏览器上下文的 request（携带登录 Cookie）并发查询
+# 课程/主题进度，已完成的链接直接移出课程链接队列，查询失败或无法判断的链接照常学习。
+# 接口地址模板中的 {id} 会替换为链接中的课程/主题 ID，可在浏览器开发者工具 Network 面板中找到
+AFK_PREFILTER = _env_flag("AFK_PREFILTER", False)
+AFK_PREFILTER_COURSE_API = _env_text("AFK_PREFILTER_COURSE_API")
+AFK_PREFILTER_SUBJECT_API = _env_text("AFK_PREFILTER_SUBJECT_API")
+AFK_PREFILTER_CONCURRENCY = _env_int("AFK_PREFILTER_CONCURRENCY", 8, minimum=1)
+# 接口响应 JSON 中表示学习进度百分比的字段名，按顺序取第一个找到的字段，>= 100 视为已完成
+AFK_PREFILTER_PROGRESS_KEYS = tuple(
+    key.strip()
+    for key in (
+        _env_text("AFK_PREFILTER_PROGRESS_KEYS", "progress,studyProgress,finishRate,completedRate")
+        or ""
+    ).split(",")
+    if key.strip()
+)
+
+# 主题内课程并发数：同一主题中的多门课程同时在各自的标签页中学习，默认 1（逐门学习）
+SUBJECT_COURSE_CONCURRENCY = _env_int("SUBJECT_COURSE_CONCURRENCY", 1, minimum=1)
+
+# 按剩余学习时长调度：挂课前先打开每门课程读取一次章节进度，估算剩余学习时长，
+# 按时长从长到短分配给各标签页，并在日志中给出预计完成时间
+AFK_LONGEST_FIRST = _env_flag("AFK_LONGEST_FIRST", False)
+
+# 队列文件写回磁盘的防抖间隔：运行期间队列变更先保存在内存，
+# 停止变更 QUEUE_FLUSH_DELAY 秒后写回，持续变更时最迟 QUEUE_FLUSH_MAX_DELAY 秒写回一次
+QUEUE_FLUSH_DELAY = 1.0  # 秒
+QUEUE_FLUSH_MAX_DELAY = 5.0  # 秒
+
+# 队列存储方式：json（默认，四个 JSON 文件）或 sqlite（同目录下的 queue_state.sqlite3）
+QUEUE_BACKEND = (_env_text("QUEUE_BACKEND", "json") or "json").lower()
+
+# 运行追踪：打开页面、就绪等待、章节学习、视频等待、AI 作答、选择答案、交卷等阶段的耗时
+# 逐条追加到 RUN_TRACE_FILE（JSONL），启动器中可以查看各阶段 p50/p95 和等待时间占比
+RUN_TRACE_ENABLED = _env_flag("RUN_TRACE", True)
+RUN_TRACE_MAX_BYTES = 5 * 1024 * 1024  # 超过后把旧文件改名为 run_trace.jsonl.1 重新开始
+
+# 诊断模式：挂课、AI 考试和手动选课流程运行期间采集 CPU 剖析、内存快照，
+# 并为耗时超过 DIAGNOSTICS_SLOW_PAGE_SECONDS 的页面保存 Playwright 追踪，写入 DIAGNOSTICS_DIR 下带时间戳的目录
+DIAGNOSTICS_ENABLED = _env_flag("DIAGNOSTICS", False)
+DIAGNOSTICS_SLOW_PAGE_SECONDS = _env_int("DIAGNOSTICS_SLOW_PAGE_SECONDS", 120, minimum=0)
 
 # ============================================================
 # 考试配置
@@ -385,6 +549,8 @@ AFK_SLOW_MO = 3000  # 毫秒
 COURSE_EXAM_ATTEMPT_THRESHOLD = 1
 # 试卷链接考试: 剩余次数 <= 此值时转为人工考试
 PAPER_EXAM_ATTEMPT_THRESHOLD = 1
+# 多题目试卷通过一次页面脚本批量提取全部题目，失败时回退为逐元素提取
+EXAM_BULK_EXTRACTION = _env_flag("EXAM_BULK_EXTRACTION", True)
 
 # ============================================================
 # 自动登录配置
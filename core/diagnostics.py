@@ -0,0 +1,229 @@
+"""
+诊断模式（DIAGNOSTICS=1）：排查课程或考试变慢时，区分是驱动、页面还是本程序的 Python 代码耗时。
+
+挂课、AI 考试和手动选课流程运行期间，每个流程在 DIAGNOSTICS_DIR 下新建一个带时间戳的目录：
+    profile.prof / profile.txt      整个流程的 Python CPU 剖析（cProfile），文本版按累计耗时排序
+    tracemalloc_start.snapshot      流程开始时的内存快照
+    tracemalloc_end.snapshot        流程结束时的内存快照
+    tracemalloc_top.txt             两次快照之间内存增长最多的代码行
+    traces/*.zip                    耗时超过 DIAGNOSTICS_SLOW_PAGE_SECONDS 的页面的 Playwright 追踪，
+                                    用 playwright show-trace 打开；traces/slow_pages.txt 列出对应链接和耗时
+
+Playwright 追踪按分段（chunk）录制：同一浏览器上下文里没有页面在处理时结束当前分段，
+分段内有慢页面就保存，否则丢弃。并发标签页的处理时间互相重叠时，它们共用同一个分段。
+诊断模式关闭时，这里的上下文管理器都直接放行，不做任何采集。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+from core.config import DIAGNOSTICS_DIR, DIAGNOSTICS_ENABLED, DIAGNOSTICS_SLOW_PAGE_SECONDS
+
+PROFILE_TOP_FUNCTIONS = 60
+TRACEMALLOC_FRAMES = 10
+TRACEMALLOC_TOP_LINES = 30
+
+_ACTIVE_DIAGNOSTICS: "DiagnosticsSession | None" = None
+
+
+class _ContextTracer:
+    """管理单个浏览器上下文的 Playwright 追踪分段。"""
+
+    def __init__(self, session: "DiagnosticsSession", context):
+        self.session = session
+        self.context = context
+        self.started = False
+        self.chunk_open = False
+        self.active_pages = 0
+        self.slow_pages: list[tuple[str, float]] = []
+        self.lock = asyncio.Lock()
+
+    async def enter(self, label: str) -> None:
+        async with self.lock:
+            self.active_pages += 1
+            if self.chunk_open:
+                return
+            try:
+                if not self.started:
+                    await self.context.tracing.start(screenshots=True, snapshots=True)
+                    self.started = True
+                await self.context.tracing.start_chunk(title=label)
+                self.chunk_open = True
+            except Exception as exc:
+                logging.debug(f"开始 Playwright 追踪失败: {exc}")
+
+    async def exit(self, label: str, seconds: float) -> None:
+        async with self.lock:
+            self.active_pages = max(0, self.active_pages - 1)
+            if seconds >= self.session.slow_page_seconds:
+                self.slow_pages.append((label, seconds))
+            if self.active_pages == 0:
+                await self._close_chunk()
+
+    async def _close_chunk(self) -> None:
+        if not self.chunk_open:
+            return
+        self.chunk_open = False
+        slow_pages, self.slow_pages = self.slow_pages, []
+        try:
+            if not slow_pages:
+                await self.context.tracing.stop_chunk()
+                return
+            trace_path = self.session.next_trace_path()
+            await self.context.tracing.stop_chunk(path=trace_path)
+            self.session.record_slow_pages(trace_path, slow_pages)
+            logging.info(f"已保存慢页面 Playwright 追踪: {trace_path}")
+        except Exception as exc:
+            logging.debug(f"保存 Playwright 追踪失败: {exc}")
+
+    async def finish(self) -> None:
+        async with self.lock:
+            await self._close_chunk()
+            if not self.started:
+                return
+            self.started = False
+            try:
+                await self.context.tracing.stop()
+            except Exception as exc:
+                logging.debug(f"停止 Playwright 追踪失败: {exc}")
+
+
+class DiagnosticsSession:
+    def __init__(self, directory: Path, slow_page_seconds: float):
+        self.directory = directory
+        self.slow_page_seconds = slow_page_seconds
+        self.trace_count = 0
+        self._tracers: dict[object, _ContextTracer] = {}
+
+    @property
+    def traces_dir(self) -> Path:
+        return self.directory / "traces"
+
+    def tracer_for(self, context) -> _ContextTracer:
+        tracer = self._tracers.get(context)
+        if tracer is None:
+            tracer = _ContextTracer(self, context)
+            self._tracers[context] = tracer
+        return tracer
+
+    def next_trace_path(self) -> Path:
+        self.trace_count += 1
+        self.traces_dir.mkdir(parents=True, exist_ok=True)
+        return self.traces_dir / f"slow-page-{self.trace_count:03d}.zip"
+
+    def record_slow_pages(self, trace_path: Path, slow_pages: list[tuple[str, float]]) -> None:
+        with open(self.traces_dir / "slow_pages.txt", "a", encoding="utf-8") as file:
+            for label, seconds in slow_pages:
+                file.write(f"{trace_path.name}\t{seconds:.1f} 秒\t{label}\n")
+
+    async def finish_tracing(self) -> None:
+        for tracer in list(self._tracers.values()):
+            await tracer.finish()
+        self._tracers.clear()
+
+
+def get_active_diagnostics() -> DiagnosticsSession | None:
+    return _ACTIVE_DIAGNOSTICS
+
+
+def _write_profile(profiler: cProfile.Profile, directory: Path) -> None:
+    profiler.dump_stats(directory / "profile.prof")
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+    (directory / "profile.txt").write_text(output.getvalue(), encoding="utf-8")
+
+
+def _write_memory_snapshots(
+    start_snapshot: tracemalloc.Snapshot,
+    end_snapshot: tracemalloc.Snapshot,
+    directory: Path,
+) -> None:
+    start_snapshot.dump(str(directory / "tracemalloc_start.snapshot"))
+    end_snapshot.dump(str(directory / "tracemalloc_end.snapshot"))
+    traced_kib = sum(stat.size for stat in end_snapshot.statistics("filename")) / 1024
+    lines = [f"流程结束时已跟踪内存: {traced_kib:.1f} KiB", ""]
+    lines.extend(
+        str(stat) for stat in end_snapshot.compare_to(start_snapshot, "lineno")[:TRACEMALLOC_TOP_LINES]
+    )
+    (directory / "tracemalloc_top.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@asynccontextmanager
+async def diagnose_workflow(name: str):
+    """
+    诊断模式下为整个流程采集 CPU 剖析、内存快照和慢页面追踪。
+
+    嵌套调用（如推荐流程里的挂课）只由最外层采集；诊断模式关闭时直接放行。
+    """
+    global _ACTIVE_DIAGNOSTICS
+    if not DIAGNOSTICS_ENABLED or _ACTIVE_DIAGNOSTICS is not None:
+        yield _ACTIVE_DIAGNOSTICS
+        return
+
+    directory = DIAGNOSTICS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{name}-{os.getpid()}"
+    directory.mkdir(parents=True, exist_ok=True)
+    session = DiagnosticsSession(directory, DIAGNOSTICS_SLOW_PAGE_SECONDS)
+    owns_tracemalloc = not tracemalloc.is_tracing()
+    if owns_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    start_snapshot = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as exc:
+        # 已有其他剖析器（如调试器）在运行时无法同时启用 cProfile
+        logging.warning(f"无法启用 CPU 剖析: {exc}")
+        profiler = None
+
+    logging.info(f"诊断模式已开启，诊断数据写入: {directory}")
+    _ACTIVE_DIAGNOSTICS = session
+    try:
+        yield session
+    finally:
+        _ACTIVE_DIAGNOSTICS = None
+        if profiler is not None:
+            profiler.disable()
+        await session.finish_tracing()
+        end_snapshot = tracemalloc.take_snapshot()
+        if owns_tracemalloc:
+            tracemalloc.stop()
+        try:
+            if profiler is not None:
+                _write_profile(profiler, directory)
+            _write_memory_snapshots(start_snapshot, end_snapshot, directory)
+        except OSError as exc:
+            logging.warning(f"写入诊断数据失败: {exc}")
+        logging.info(f"诊断数据已保存到: {directory}")
+
+
+@asynccontextmanager
+async def trace_slow_page(context, label: str):
+    """
+    诊断模式下录制 with 块内的 Playwright 追踪，耗时超过阈值时保存。
+
+    label 一般是当前页面链接，写入 slow_pages.txt 便于对应追踪文件。
+    """
+    session = _ACTIVE_DIAGNOSTICS
+    if session is None:
+        yield
+        return
+
+    tracer = session.tracer_for(context)
+    await tracer.enter(label)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        await tracer.exit(label, time.perf_counter() - started)
@@ -6,6 +6,7 @@ import traceback
 from core.abort import UserAbortRequested
 from core.config import MANUAL_EXAM_FILE
 from core.manual_exam_queue import append_manual_exam_entry
+from core.readiness import EXAM_NOTICE_SELECTOR
 
 
 def _get_option_click_selector(question_data) -> str:
@@ -123,15 +124,17 @@ async def select_answers(
 
 
 async def close_exam_notice_if_present(page):
+    # 调用方已用 wait_for_exam_page_ready 等到题目或弹窗出现，这里只看弹窗是否可见
+    popup = page.locator(EXAM_NOTICE_SELECTOR)
     try:
-        popup = page.locator(".dialog.animated")
-        if await popup.count() > 0:
-            logging.info("检测到考试提示弹窗, 准备关闭")
-            await popup.locator(".dialog-footer .btn").first.click()
-            await page.wait_for_timeout(1000)
-            logging.info("弹窗已关闭")
-        else:
+        if not await popup.first.is_visible():
             logging.info("未检测到考试提示弹窗")
+            return
+
+        logging.info("检测到考试提示弹窗, 准备关闭")
+        await popup.locator(".dialog-footer .btn").first.click()
+        await page.wait_for_timeout(1000)
+        logging.info("弹窗已关闭")
     except Exception as exc:
         logging.error(f"处理考试提示弹窗时出错: {exc}")
         await page.wait_for_timeout(2000)
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 import re
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import AsyncOpenAI
 
 from core.config import (
     AI_ENABLE_THINKING,
     AI_ENABLE_WEB_SEARCH,
     AI_REASONING_EFFORT,
+    AI_REQUEST_MAX_WORKERS,
     AI_REQUEST_TYPE,
     AI_RESPONSE_TOOLS,
     AI_SYSTEM_PROMPT,
     AI_TEMPERATURE,
 )
+from core.spans import span
 
 
 TYPE_LABELS = {
@@ -30,6 +37,9 @@ TYPE_HINTS = {
 }
 
 
+_AI_REQUEST_EXECUTOR: ThreadPoolExecutor | None = None
+
+
 class ExamAiConfigurationError(RuntimeError):
     """AI 考试配置错误，例如模型名不受当前接口支持。"""
 
@@ -102,53 +112,115 @@ def _close_stream_if_possible(stream_or_response) -> None:
             pass
 
 
+class _ResponsesTextCollector:
+    """汇总 Responses 流式事件中的输出文本，同步流和异步流共用。"""
+
+    def __init__(self):
+        self.deltas: list[str] = []
+        self.final_text: str | None = None
+
+    def add(self, event) -> None:
+        event_type = getattr(event, "type", "")
+        if event_type == "response.output_text.delta":
+            delta = getattr(event, "delta", "")
+            if delta:
+                self.deltas.append(str(delta))
+        elif event_type == "response.output_text.done":
+            text = getattr(event, "text", None)
+            if text is not None:
+                self.final_text = str(text)
+
+    def text(self) -> str:
+        return self.final_text if self.final_text is not None else "".join(self.deltas)
+
+
+class _ChatTextCollector:
+    """汇总 Chat Completions 流式分片中的正文和推理内容，同步流和异步流共用。"""
+
+    def __init__(self):
+        self.content_parts: list[str] = []
+        self.reasoning_parts: list[str] = []
+
+    def add(self, chunk) -> None:
+        for choice in getattr(chunk, "choices", None) or []:
+            delta = getattr(choice, "delta", None)
+            if delta is None:
+                continue
+            content, reasoning = _extract_chat_delta_text(delta)
+            if content:
+                self.content_parts.append(content)
+            if reasoning:
+                self.reasoning_parts.append(reasoning)
+
+    def text(self) -> str:
+        content_text = "".join(self.content_parts)
+        if content_text:
+            return content_text
+        return "".join(self.reasoning_parts)
+
+
 def _extract_responses_output_text(response_or_stream) -> str:
     if hasattr(response_or_stream, "output_text"):
         return getattr(response_or_stream, "output_text", "") or ""
 
-    deltas: list[str] = []
-    final_text = None
+    collector = _ResponsesTextCollector()
     try:
         for event in response_or_stream:
-            event_type = getattr(event, "type", "")
-            if event_type == "response.output_text.delta":
-                delta = getattr(event, "delta", "")
-                if delta:
-                    deltas.append(str(delta))
-            elif event_type == "response.output_text.done":
-                text = getattr(event, "text", None)
-                if text is not None:
-                    final_text = str(text)
+            collector.add(event)
     finally:
         _close_stream_if_possible(response_or_stream)
-
-    return final_text if final_text is not None else "".join(deltas)
+    return collector.text()
 
 
 def _extract_chat_stream_text(stream_or_completion) -> str:
     if hasattr(stream_or_completion, "choices"):
         return _extract_chat_message_text(stream_or_completion)
 
-    content_parts: list[str] = []
-    reasoning_parts: list[str] = []
+    collector = _ChatTextCollector()
     try:
         for chunk in stream_or_completion:
-            for choice in getattr(chunk, "choices", None) or []:
-                delta = getattr(choice, "delta", None)
-                if delta is None:
-                    continue
-                content, reasoning = _extract_chat_delta_text(delta)
-                if content:
-                    content_parts.append(content)
-                if reasoning:
-                    reasoning_parts.append(reasoning)
+            collector.add(chunk)
     finally:
         _close_stream_if_possible(stream_or_completion)
+    return collector.text()
+
+
+async def _aclose_stream_if_possible(stream_or_response) -> None:
+    close = getattr(stream_or_response, "close", None)
+    if not callable(close):
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception:
+        pass
+
+
+async def _extract_responses_output_text_async(response_or_stream) -> str:
+    if hasattr(response_or_stream, "output_text"):
+        return getattr(response_or_stream, "output_text", "") or ""
 
-    content_text = "".join(content_parts)
-    if content_text:
-        return content_text
-    return "".join(reasoning_parts)
+    collector = _ResponsesTextCollector()
+    try:
+        async for event in response_or_stream:
+            collector.add(event)
+    finally:
+        await _aclose_stream_if_possible(response_or_stream)
+    return collector.text()
+
+
+async def _extract_chat_stream_text_async(stream_or_completion) -> str:
+    if hasattr(stream_or_completion, "choices"):
+        return _extract_chat_message_text(stream_or_completion)
+
+    collector = _ChatTextCollector()
+    try:
+        async for chunk in stream_or_completion:
+            collector.add(chunk)
+    finally:
+        await _aclose_stream_if_possible(stream_or_completion)
+    return collector.text()
 
 
 def _build_responses_request(model: str, prompt: str) -> dict:
@@ -203,6 +275,56 @@ def _request_ai_answer_text(client, model: str, prompt: str) -> str:
     )
 
 
+def _is_async_client(client) -> bool:
+    if isinstance(client, AsyncOpenAI):
+        return True
+    if AI_REQUEST_TYPE == "responses":
+        create = getattr(getattr(client, "responses", None), "create", None)
+    else:
+        completions = getattr(getattr(client, "chat", None), "completions", None)
+        create = getattr(completions, "create", None)
+    return inspect.iscoroutinefunction(create)
+
+
+def _get_ai_request_executor() -> ThreadPoolExecutor:
+    global _AI_REQUEST_EXECUTOR
+    if _AI_REQUEST_EXECUTOR is None:
+        _AI_REQUEST_EXECUTOR = ThreadPoolExecutor(
+            max_workers=AI_REQUEST_MAX_WORKERS,
+            thread_name_prefix="ai-request",
+        )
+    return _AI_REQUEST_EXECUTOR
+
+
+async def _request_ai_answer_text_async(client, model: str, prompt: str) -> str:
+    """异步请求 AI 答案；同步客户端在专用线程中执行，不阻塞事件循环。"""
+    if not _is_async_client(client):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_ai_request_executor(),
+            _request_ai_answer_text,
+            client,
+            model,
+            prompt,
+        )
+
+    if AI_REQUEST_TYPE == "responses":
+        response_or_stream = await client.responses.create(
+            **_build_responses_request(model, prompt),
+        )
+        return await _extract_responses_output_text_async(response_or_stream)
+
+    if AI_REQUEST_TYPE == "chat":
+        completion_or_stream = await client.chat.completions.create(
+            **_build_chat_request(model, prompt),
+        )
+        return await _extract_chat_stream_text_async(completion_or_stream)
+
+    raise ExamAiConfigurationError(
+        f"AI_REQUEST_TYPE 配置无效: {AI_REQUEST_TYPE!r}，仅支持 'chat' 或 'responses'。"
+    )
+
+
 def build_question_prompt(question_data) -> str:
     question_type_str = TYPE_LABELS.get(question_data["type"], "")
     options_str = "".join(
@@ -271,11 +393,12 @@ async def get_ai_answers(client, model, question_data):
             logging.info("检测到填空题, 将跳过自动作答")
             return []
 
-        answer_content = _request_ai_answer_text(
-            client,
-            model,
-            build_question_prompt(question_data),
-        )
+        with span("ai_answer", type=question_data["type"], request_type=AI_REQUEST_TYPE):
+            answer_content = await _request_ai_answer_text_async(
+                client,
+                model,
+                build_question_prompt(question_data),
+            )
         logging.info(f"AI最终答案: {answer_content}")
         return normalize_ai_answer_text(question_data["type"], answer_content)
     except ExamAiConfigurationError:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
+from core.answer_cache import get_active_answer_cache
+from core.config import AI_EXAM_CONCURRENCY
 from core.exam_actions import close_exam_notice_if_present, select_answers, submit_exam
 from core.exam_answers import get_ai_answers
 from core.exam_parsing import (
@@ -9,6 +12,12 @@ from core.exam_parsing import (
     extract_multi_questions_data,
     extract_single_question_data,
 )
+from core.readiness import (
+    wait_for_exam_page_ready,
+    wait_for_exam_questions_ready,
+    wait_for_question_changed,
+)
+from core.spans import span
 
 MANUAL_SUBMIT_RESULT_CLOSE_SELECTOR = (
     "[data-region='modal:modal'] .btn.white.border:has-text('确定')"
@@ -76,23 +85,80 @@ async def _wait_for_manual_submit_completion(page) -> None:
         await page.wait_for_timeout(500)
 
 
+async def _get_question_answers(client, model, question_data, ai_model_config=None):
+    answer_cache = get_active_answer_cache()
+    if answer_cache is None:
+        return await get_ai_answers(client, model, question_data)
+    return await answer_cache.get_answers(
+        ai_model_config or {"model": model},
+        question_data,
+        lambda: get_ai_answers(client, model, question_data),
+    )
+
+
+async def _answer_multi_questions(
+    client,
+    model,
+    page,
+    course_url,
+    all_questions,
+    *,
+    auto_submit: bool,
+    ai_model_config=None,
+    concurrency: int | None = None,
+) -> bool:
+    """并发请求所有题目的 AI 答案，每道题的答案一到就立即作答。"""
+    semaphore = asyncio.Semaphore(max(1, concurrency or AI_EXAM_CONCURRENCY))
+
+    async def _fetch_answers(question_data):
+        async with semaphore:
+            return question_data, await _get_question_answers(
+                client,
+                model,
+                question_data,
+                ai_model_config,
+            )
+
+    tasks = [asyncio.create_task(_fetch_answers(question_data)) for question_data in all_questions]
+    try:
+        for next_answer in asyncio.as_completed(tasks):
+            question_data, answers = await next_answer
+            question_number = question_data["index"] + 1
+            logging.info(f"处理题目 {question_number}: {question_data['text']}")
+            logging.info(f"题目 {question_number} 类型: {question_data['type']}")
+            _log_question_snapshot(question_data, index=question_number)
+            auto_submit = _ensure_manual_submit(auto_submit, question_data, answers)
+            item_id = question_data["item_id"]
+            with span("select_answers", type=question_data["type"]):
+                await select_answers(
+                    page,
+                    question_data,
+                    answers,
+                    course_url,
+                    selector_prefix=f"[data-dynamic-key='{item_id}'] ",
+                    ai_model_config=ai_model_config,
+                )
+            await page.wait_for_timeout(500)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return auto_submit
+
+
 async def ai_exam(client, model, page, course_url, auto_submit=True, ai_model_config=None):
     """AI自动答题主函数"""
     logging.info("AI考试开始")
 
-    await page.wait_for_load_state("networkidle")
-    await page.wait_for_timeout(1000)
+    await wait_for_exam_page_ready(page)
     await close_exam_notice_if_present(page)
-    await page.wait_for_load_state("networkidle")
-    await page.wait_for_timeout(1000)
+    await wait_for_exam_page_ready(page)
 
     exam_mode = await detect_exam_mode(page)
 
     if exam_mode == "single":
         while True:
-            await page.wait_for_load_state("networkidle")
-            await page.wait_for_timeout(1000)
-
             question_data = await extract_single_question_data(page)
             if not question_data:
                 logging.error("无法提取题目信息")
@@ -102,15 +168,21 @@ async def ai_exam(client, model, page, course_url, auto_submit=True, ai_model_co
             logging.info(f"题目类型: {question_data['type']}")
             _log_question_snapshot(question_data)
 
-            answers = await get_ai_answers(client, model, question_data)
-            auto_submit = _ensure_manual_submit(auto_submit, question_data, answers)
-            await select_answers(
-                page,
+            answers = await _get_question_answers(
+                client,
+                model,
                 question_data,
-                answers,
-                course_url,
-                ai_model_config=ai_model_config,
+                ai_model_config,
             )
+            auto_submit = _ensure_manual_submit(auto_submit, question_data, answers)
+            with span("select_answers", type=question_data["type"]):
+                await select_answers(
+                    page,
+                    question_data,
+                    answers,
+                    course_url,
+                    ai_model_config=ai_model_config,
+                )
 
             next_button = page.locator(".single-btn-next")
             next_button_classes = await next_button.get_attribute("class") or ""
@@ -118,7 +190,8 @@ async def ai_exam(client, model, page, course_url, auto_submit=True, ai_model_co
             if "next-disabled" in next_button_classes:
                 if auto_submit:
                     logging.info("已经是最后一题, 准备交卷")
-                    await submit_exam(page)
+                    with span("submit_exam"):
+                        await submit_exam(page)
                 else:
                     logging.info("自动交卷已取消, 请手动交卷")
                     logging.info("页面将保持打开状态, 等待手动交卷完成...")
@@ -127,10 +200,9 @@ async def ai_exam(client, model, page, course_url, auto_submit=True, ai_model_co
 
             logging.info("点击下一题")
             await next_button.click()
-            await page.wait_for_timeout(1000)
+            await wait_for_question_changed(page, question_data["text"])
     else:
-        await page.wait_for_load_state("networkidle")
-        await page.wait_for_timeout(1000)
+        await wait_for_exam_questions_ready(page)
 
         all_questions = await extract_multi_questions_data(page)
         if not all_questions:
@@ -138,27 +210,20 @@ async def ai_exam(client, model, page, course_url, auto_submit=True, ai_model_co
             return
 
         logging.info(f"本页共有 {len(all_questions)} 道题目")
-        for question_data in all_questions:
-            question_number = question_data["index"] + 1
-            logging.info(f"处理题目 {question_number}: {question_data['text']}")
-            logging.info(f"题目 {question_number} 类型: {question_data['type']}")
-            _log_question_snapshot(question_data, index=question_number)
-            answers = await get_ai_answers(client, model, question_data)
-            auto_submit = _ensure_manual_submit(auto_submit, question_data, answers)
-            item_id = question_data["item_id"]
-            await select_answers(
-                page,
-                question_data,
-                answers,
-                course_url,
-                selector_prefix=f"[data-dynamic-key='{item_id}'] ",
-                ai_model_config=ai_model_config,
-            )
-            await page.wait_for_timeout(500)
+        auto_submit = await _answer_multi_questions(
+            client,
+            model,
+            page,
+            course_url,
+            all_questions,
+            auto_submit=auto_submit,
+            ai_model_config=ai_model_config,
+        )
 
         if auto_submit:
             try:
-                await submit_exam(page)
+                with span("submit_exam"):
+                    await submit_exam(page)
             except Exception as exc:
                 logging.error(f"点击交卷按钮失败: {exc}")
         else:
@@ -1,14 +1,57 @@
 from __future__ import annotations
 
 import logging
+import time
 import traceback
 
+from core.config import EXAM_BULK_EXTRACTION
 from core.question_parser import (
+    CHOICE_OPTION_SPECS,
+    JUDGE_OPTION_SPECS,
+    build_choice_options_from_raw,
+    build_judge_options_from_raw,
     detect_question_type_by_dom,
     extract_options_with_selector,
     parse_question_type,
 )
 
+# 在页面内一次性读取所有题目的题型、题干、选项原始文本和 data-dynamic-key，
+# 选择器优先级与逐元素提取保持一致，标签归一化等逻辑仍在 Python 侧完成。
+_BULK_EXTRACTION_SCRIPT = """
+({choiceSpecs, judgeSpecs}) => {
+  const text = (element) => element ? (element.innerText || "").trim() : "";
+  const firstText = (root, selectors) => {
+    for (const selector of selectors) {
+      const value = text(root.querySelector(selector));
+      if (value) return value;
+    }
+    return "";
+  };
+  return Array.from(document.querySelectorAll(".question-type-item")).map((item) => {
+    const scores = item.querySelectorAll(".o-score");
+    const stem = item.querySelector(".stem-content-main")
+      || item.querySelector(".single-title .rich-text-style");
+    return {
+      typeText: scores.length ? text(scores[scores.length - 1]) : "",
+      stem: stem ? text(stem) : null,
+      itemId: item.getAttribute("data-dynamic-key"),
+      hasSentenceInput: !!item.querySelector("form.vertical .sentence-input"),
+      hasAnswerInputShot: !!item.querySelector(".answer-input-shot"),
+      choice: choiceSpecs.map((spec) =>
+        Array.from(item.querySelectorAll(spec.item_selector)).map((option) => ({
+          label: firstText(option, spec.label_selectors),
+          text: firstText(option, spec.text_selectors),
+          full: text(option),
+        }))
+      ),
+      judge: judgeSpecs.map((spec) =>
+        Array.from(item.querySelectorAll(spec.item_selector)).map((option) => text(option))
+      ),
+    };
+  });
+}
+"""
+
 
 async def detect_exam_mode(page):
     """检测考试模式：根据是否存在下一题按钮来判断"""
@@ -52,8 +95,83 @@ async def extract_single_question_data(page):
         return None
 
 
+def _resolve_bulk_question_type(raw_question) -> str:
+    question_type = parse_question_type(raw_question.get("typeText") or "")
+    if question_type != "unknown":
+        return question_type
+    if raw_question.get("hasSentenceInput"):
+        return "fill_blank"
+    if raw_question.get("hasAnswerInputShot"):
+        return "ordering"
+    return "unknown"
+
+
+def parse_bulk_questions_data(raw_questions) -> list[dict]:
+    """把页面脚本返回的原始数据解析为与逐元素提取相同结构的 question_data 列表。"""
+    all_questions = []
+    for i, raw_question in enumerate(raw_questions or []):
+        question_type = _resolve_bulk_question_type(raw_question)
+        question_text = raw_question.get("stem")
+        if question_text is None:
+            logging.error(f"无法获取题目 {i+1} 的内容")
+            continue
+
+        if question_type == "fill_blank":
+            options, option_click_selector = [], None
+        elif question_type == "judge":
+            options, option_click_selector = build_judge_options_from_raw(
+                raw_question.get("judge") or []
+            )
+        else:
+            options, option_click_selector = build_choice_options_from_raw(
+                raw_question.get("choice") or []
+            )
+
+        question_data = {
+            "index": i,
+            "type": question_type,
+            "text": question_text,
+            "options": options,
+            "item_id": raw_question.get("itemId") or f"item-{i}",
+        }
+        if option_click_selector:
+            question_data["option_click_selector"] = option_click_selector
+        all_questions.append(question_data)
+    return all_questions
+
+
+async def extract_multi_questions_data_bulk(page) -> list[dict]:
+    """通过一次页面脚本调用提取所有题目的信息(多题目模式)"""
+    started_at = time.perf_counter()
+    raw_questions = await page.evaluate(
+        _BULK_EXTRACTION_SCRIPT,
+        {"choiceSpecs": CHOICE_OPTION_SPECS, "judgeSpecs": JUDGE_OPTION_SPECS},
+    )
+    all_questions = parse_bulk_questions_data(raw_questions)
+    logging.info(
+        f"批量提取 {len(all_questions)} 道题目, 耗时 {time.perf_counter() - started_at:.2f} 秒"
+    )
+    for question_data in all_questions:
+        logging.debug(f"题目 {question_data['index']+1} 内容: {question_data['text']}")
+        logging.debug(f"题目 {question_data['index']+1} 选项: {question_data['options']}")
+    return all_questions
+
+
 async def extract_multi_questions_data(page):
     """提取页面中所有题目的信息(多题目模式)"""
+    if EXAM_BULK_EXTRACTION:
+        try:
+            all_questions = await extract_multi_questions_data_bulk(page)
+            if all_questions:
+                return all_questions
+            logging.info("批量提取未获取到题目, 改用逐元素提取")
+        except Exception as exc:
+            logging.warning(f"批量提取题目失败, 改用逐元素提取: {exc}")
+    return await extract_multi_questions_data_by_locator(page)
+
+
+async def extract_multi_questions_data_by_locator(page):
+    """逐元素提取页面中所有题目的信息(多题目模式)"""
     try:
         question_items = page.locator(".question-type-item")
         count = await question_items.count()
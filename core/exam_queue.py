@@ -2,10 +2,20 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from core.config import EXAM_URLS_FILE
-from core.file_ops import del_file
+from core.file_ops import atomic_write_text, del_file, locked_file
+from core.queue_db import (
+    EXAM_URLS_TABLE,
+    count_queue_rows,
+    is_sqlite_backend,
+    read_queue_rows,
+    replace_queue_rows,
+)
+from core.queue_owner import forward_queue_call
+from core.queue_store import get_active_queue_store, render_queue_json
 
 
 @dataclass(frozen=True)
@@ -120,7 +130,7 @@ def _serialize_entries(entries: list[ExamQueueEntry]) -> list[dict[str, object]]
     ]
 
 
-def read_exam_queue(file_path: Path = EXAM_URLS_FILE) -> list[ExamQueueEntry]:
+def _read_exam_queue_json(file_path: Path) -> list[ExamQueueEntry]:
     try:
         content = file_path.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
@@ -136,6 +146,48 @@ def read_exam_queue(file_path: Path = EXAM_URLS_FILE) -> list[ExamQueueEntry]:
     return _normalize_entries(raw_entries)
 
 
+def _read_exam_queue_file(file_path: Path) -> list[ExamQueueEntry]:
+    if is_sqlite_backend():
+        return _normalize_entries(read_queue_rows(EXAM_URLS_TABLE, file_path))
+    return _read_exam_queue_json(file_path)
+
+
+def read_exam_queue(
+    file_path: Path = EXAM_URLS_FILE,
+    *,
+    refresh: bool = False,
+) -> list[ExamQueueEntry]:
+    store = get_active_queue_store()
+    if store is not None:
+        return store.read(file_path, _read_exam_queue_file, refresh=refresh)
+    return _read_exam_queue_file(file_path)
+
+
+def _write_exam_queue_json(
+    entries: list[ExamQueueEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    with locked_file(file_path):
+        if not entries and not keep_file:
+            del_file(file_path)
+            return
+        atomic_write_text(file_path, render_queue_json(_serialize_entries(entries)))
+
+
+def _write_exam_queue_file(
+    entries: list[ExamQueueEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    if is_sqlite_backend():
+        replace_queue_rows(EXAM_URLS_TABLE, file_path, _serialize_entries(entries))
+        return
+    _write_exam_queue_json(entries, file_path=file_path, keep_file=keep_file)
+
+
 def write_exam_queue(
     entries: list[ExamQueueEntry],
     *,
@@ -143,27 +195,33 @@ def write_exam_queue(
     keep_file: bool = True,
 ) -> None:
     normalized = _normalize_entries(_serialize_entries(entries))
-    if not normalized and not keep_file:
-        del_file(file_path)
+    store = get_active_queue_store()
+    if store is not None:
+        store.write(
+            file_path,
+            normalized,
+            partial(_write_exam_queue_file, file_path=file_path, keep_file=keep_file),
+            loader=_read_exam_queue_file,
+        )
         return
-
-    file_path.write_text(
-        json.dumps(_serialize_entries(normalized), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_exam_queue_file(normalized, file_path=file_path, keep_file=keep_file)
 
 
 def append_exam_url(url: str, *, file_path: Path = EXAM_URLS_FILE) -> None:
+    if forward_queue_call("append_exam_url", url=url, file_path=file_path):
+        return
+
     normalized_url = url.strip()
     if not normalized_url:
         return
 
-    entries = read_exam_queue(file_path=file_path)
-    if normalized_url not in {entry.url for entry in entries}:
-        entries.append(
-            ExamQueueEntry(url=normalized_url, ai_failed_model_configs=[])
-        )
-        write_exam_queue(entries, file_path=file_path)
+    with locked_file(file_path):
+        entries = read_exam_queue(file_path=file_path, refresh=True)
+        if normalized_url not in {entry.url for entry in entries}:
+            entries.append(
+                ExamQueueEntry(url=normalized_url, ai_failed_model_configs=[])
+            )
+            write_exam_queue(entries, file_path=file_path)
 
 
 def read_exam_urls(file_path: Path = EXAM_URLS_FILE) -> list[str]:
@@ -171,6 +229,8 @@ def read_exam_urls(file_path: Path = EXAM_URLS_FILE) -> list[str]:
 
 
 def count_exam_urls(file_path: Path = EXAM_URLS_FILE) -> int:
+    if is_sqlite_backend() and get_active_queue_store() is None:
+        return count_queue_rows(EXAM_URLS_TABLE, file_path)
     return len(read_exam_urls(file_path=file_path))
 
 
@@ -225,33 +285,33 @@ def record_ai_failed_model_config(
     if not normalized_url or normalized_config is None:
         return
 
-    entries = read_exam_queue(file_path=file_path)
-    entries_by_url = {entry.url: entry for entry in entries}
-    existing = entries_by_url.get(normalized_url)
-    if existing is None:
-        entries.append(
-            ExamQueueEntry(
-                url=normalized_url,
-                ai_failed_model_configs=[normalized_config],
+    with locked_file(file_path):
+        entries = read_exam_queue(file_path=file_path, refresh=True)
+        entries_by_url = {entry.url: entry for entry in entries}
+        existing = entries_by_url.get(normalized_url)
+        if existing is None:
+            entries.append(
+                ExamQueueEntry(
+                    url=normalized_url,
+                    ai_failed_model_configs=[normalized_config],
+                )
             )
-        )
-    elif not has_ai_failed_model_config(
-        normalized_url,
-        normalized_config,
-        file_path=file_path,
-    ):
-        entries = [
-            ExamQueueEntry(
-                url=entry.url,
-                ai_failed_model_configs=(
-                    entry.ai_failed_model_configs + [normalized_config]
-                    if entry.url == normalized_url
-                    else entry.ai_failed_model_configs
-                ),
-            )
-            for entry in entries
-        ]
-    else:
-        return
+        elif not any(
+            _model_config_key(config) == _model_config_key(normalized_config)
+            for config in existing.ai_failed_model_configs
+        ):
+            entries = [
+                ExamQueueEntry(
+                    url=entry.url,
+                    ai_failed_model_configs=(
+                        entry.ai_failed_model_configs + [normalized_config]
+                        if entry.url == normalized_url
+                        else entry.ai_failed_model_configs
+                    ),
+                )
+                for entry in entries
+            ]
+        else:
+            return
 
-    write_exam_queue(entries, file_path=file_path)
+        write_exam_queue(entries, file_path=file_path)
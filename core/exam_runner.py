@@ -3,11 +3,13 @@ from __future__ import annotations
 import logging
 import re
 import traceback
+from contextlib import asynccontextmanager
 from typing import Callable
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from core.abort import UserAbortRequested
+from core.answer_cache import open_answer_cache, record_answer_attempt, use_answer_cache
 from core.browser import create_browser_context, is_browser_connected, is_target_closed_exception
 from core.config import (
     AI_ENABLE_THINKING,
@@ -22,6 +24,7 @@ from core.config import (
     OPENAI_COMPLETION_BASE_URL,
     PAPER_EXAM_ATTEMPT_THRESHOLD,
 )
+from core.diagnostics import diagnose_workflow, trace_slow_page
 from core.exam_engine import ai_exam, wait_for_finish_test
 from core.exam_answers import ExamAiConfigurationError
 from core.exam_queue import (
@@ -30,13 +33,21 @@ from core.exam_queue import (
     record_ai_failed_model_config,
     write_exam_urls,
 )
-from core.learning import check_exam_passed, handle_rating_popup
+from core.learning import check_exam_passed, watch_popups
 from core.manual_exam_queue import (
     ManualExamEntry,
     append_manual_exam_entry,
     read_manual_exam_queue,
     write_manual_exam_queue,
 )
+from core.progress import progress_task
+from core.readiness import (
+    track_readiness,
+    wait_for_course_exam_tab_ready,
+    wait_for_course_page_ready,
+)
+from core.resource_blocking import block_resources
+from core.spans import span
 
 
 StatusCallback = Callable[[str], None]
@@ -71,8 +82,8 @@ def should_route_exam_to_manual(button_text: str, threshold: int) -> bool:
     return remaining <= threshold
 
 
-def _build_exam_client() -> tuple[OpenAI, str]:
-    client = OpenAI(
+def _build_exam_client() -> tuple[AsyncOpenAI, str]:
+    client = AsyncOpenAI(
         api_key=OPENAI_COMPLETION_API_KEY,
         base_url=OPENAI_COMPLETION_BASE_URL,
     )
@@ -202,14 +213,18 @@ async def _open_course_exam_tab(page) -> None:
     await page.locator(".top").first.click()
     await page.locator('dl.chapter-list-box[data-sectiontype="9"]').click()
     await page.locator(".tab-container").wait_for()
-    await page.wait_for_timeout(1000)
+    await wait_for_course_exam_tab_ready(page)
 
 
 async def _handle_exam_result(page) -> None:
     await page.reload(wait_until="load")
-    await page.wait_for_timeout(1500)
-    if await handle_rating_popup(page):
-        logging.info("五星评价完成")
+    await wait_for_course_page_ready(page)
+
+
+@asynccontextmanager
+async def _exam_answer_cache():
+    with use_answer_cache(open_answer_cache()) as answer_cache:
+        yield answer_cache
 
 
 async def _close_page_safely(page) -> None:
@@ -232,12 +247,14 @@ async def _is_course_exam_in_progress(page) -> bool:
 async def _run_course_ai_exam(
     page,
     url: str,
-    client: OpenAI,
+    client: AsyncOpenAI,
     model: str,
     *,
     auto_submit: bool = True,
 ) -> None:
     ai_attempted = False
+    retake = False
+    answer_attempt = None
     model_config = _build_ai_exam_model_config(model)
     while True:
         await _open_course_exam_tab(page)
@@ -256,8 +273,11 @@ async def _run_course_ai_exam(
             if await _is_course_exam_in_progress(page):
                 logging.info("课程考试正在进行中, 继续 AI 自动考试")
             elif await check_exam_passed(page):
+                if answer_attempt is not None:
+                    answer_attempt.commit()
                 return
             elif ai_attempted:
+                answer_attempt.discard()
                 logging.info("AI 自动考试仍未通过, 转为人工考试")
                 record_ai_failed_model_config(url, model_config, file_path=EXAM_URLS_FILE)
                 logging.info(f"记录 AI 考试未通过模型配置: {model_config}, 考试链接: {url.strip()}")
@@ -273,16 +293,19 @@ async def _run_course_ai_exam(
                 logging.info(
                     "考试结果未通过但剩余次数满足 AI 考试条件, 继续 AI 自动考试一次"
                 )
+                # 上次未通过的作答可能来自缓存中的错误答案，重考时全部重新请求模型
+                retake = True
 
         logging.info("开始 AI 自动考试")
         try:
-            await wait_for_finish_test(
-                client,
-                model,
-                page,
-                auto_submit=auto_submit,
-                ai_model_config=model_config,
-            )
+            with record_answer_attempt(use_cached=not retake) as answer_attempt:
+                await wait_for_finish_test(
+                    client,
+                    model,
+                    page,
+                    auto_submit=auto_submit,
+                    ai_model_config=model_config,
+                )
         except Exception:
             if await _handle_attempt_limit_if_present(page, url):
                 return
@@ -294,7 +317,7 @@ async def _run_course_ai_exam(
 async def _run_paper_ai_exam(
     page,
     url: str,
-    client: OpenAI,
+    client: AsyncOpenAI,
     model: str,
     *,
     auto_submit: bool = True,
@@ -343,6 +366,41 @@ async def _run_paper_ai_exam(
     )
 
 
+async def _run_ai_exam_url(
+    page,
+    url: str,
+    client: AsyncOpenAI,
+    model: str,
+    *,
+    auto_submit: bool = True,
+) -> None:
+    with track_readiness("本次考试"):
+        if "course" in url:
+            await _run_course_ai_exam(
+                page,
+                url,
+                client,
+                model,
+                auto_submit=auto_submit,
+            )
+        elif "exam" in url:
+            await _run_paper_ai_exam(
+                page,
+                url,
+                client,
+                model,
+                auto_submit=auto_submit,
+            )
+        else:
+            logging.info("未知考试链接类型, 转为人工考试")
+            append_manual_exam_entry(
+                url,
+                reason="unknown_url_type",
+                reason_text="未知考试链接类型",
+                file_path=MANUAL_EXAM_FILE,
+            )
+
+
 async def run_ai_exam_batch(
     status_callback: StatusCallback | None = None,
     *,
@@ -357,7 +415,13 @@ async def run_ai_exam_batch(
     model_config = _build_ai_exam_model_config(model)
     retained_urls: list[str] = []
     try:
-        async with create_browser_context() as (_, context):
+        async with (
+            _exam_answer_cache(),
+            diagnose_workflow("ai-exam"),
+            create_browser_context() as (_, context),
+            block_resources(context, "本轮 AI 考试"),
+        ):
+            await watch_popups(context)
             for index, url in enumerate(urls, start=1):
                 page = None
                 if has_ai_failed_model_config(url, model_config, file_path=EXAM_URLS_FILE):
@@ -375,33 +439,19 @@ async def run_ai_exam_batch(
                     if status_callback:
                         status_callback(f"AI 考试 {index}/{len(urls)}: {url}")
                     logging.info(f"当前考试链接为: {url}")
-                    await page.goto(url)
-                    await page.wait_for_load_state("load")
-
-                    if "course" in url:
-                        await _run_course_ai_exam(
-                            page,
-                            url,
-                            client,
-                            model,
-                            auto_submit=auto_submit,
-                        )
-                    elif "exam" in url:
-                        await _run_paper_ai_exam(
-                            page,
-                            url,
-                            client,
-                            model,
-                            auto_submit=auto_submit,
-                        )
-                    else:
-                        logging.info("未知考试链接类型, 转为人工考试")
-                        append_manual_exam_entry(
-                            url,
-                            reason="unknown_url_type",
-                            reason_text="未知考试链接类型",
-                            file_path=MANUAL_EXAM_FILE,
-                        )
+                    with progress_task(f"AI 考试 {index}/{len(urls)}", detail=url):
+                        async with trace_slow_page(context, url):
+                            with span("goto", url=url):
+                                await page.goto(url)
+                                await page.wait_for_load_state("load")
+
+                            await _run_ai_exam_url(
+                                page,
+                                url,
+                                client,
+                                model,
+                                auto_submit=auto_submit,
+                            )
                 except UserAbortRequested as exc:
                     if getattr(exc, "save_pending_urls", True):
                         write_exam_urls(retained_urls + pending_urls, file_path=EXAM_URLS_FILE)
@@ -477,10 +527,7 @@ async def _run_manual_course_exam(page, url: str) -> None:
             logging.info(f"开始手动课程考试: {url}")
             await _wait_for_manual_course_test(page)
 
-        await page.reload(wait_until="load")
-        await page.wait_for_timeout(1500)
-        if await handle_rating_popup(page):
-            logging.info("五星评价完成")
+        await _handle_exam_result(page)
 
 
 async def _run_manual_paper_exam(page, url: str) -> None:
@@ -1,6 +1,10 @@
 import logging
 import os
 import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
 
 from core.config import ZHIXUEYUN_COURSE_PREFIX, ZHIXUEYUN_SUBJECT_PREFIX
 
@@ -11,6 +15,92 @@ def del_file(filename):
         os.remove(filename)
 
 
+def atomic_write_text(file_path, content: str) -> None:
+    """先写入同目录临时文件再原子替换，避免中途退出留下半截文件"""
+    target = Path(file_path)
+    fd, temp_name = tempfile.mkstemp(
+        dir=target.parent,
+        prefix=f".{target.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_handle(handle) -> None:
+        handle.seek(0)
+        while True:
+            try:
+                # LK_LOCK 重试约 10 秒仍未拿到锁时抛出 OSError，继续等待
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock_handle(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_handle(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_handle(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+_FILE_LOCKS: dict[Path, threading.RLock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+_HELD_FILE_LOCKS: set[Path] = set()
+
+
+def lock_file_path(file_path) -> Path:
+    target = Path(file_path)
+    return target.with_name(f"{target.name}.lock")
+
+
+@contextmanager
+def locked_file(file_path):
+    """对 file_path 加跨进程建议锁（同目录 .lock 旁路文件），保护读-改-写过程。
+
+    同一线程内可重入，不同线程和进程之间互斥；锁文件保留在磁盘上，不随释放删除。
+    """
+    key = Path(file_path).resolve()
+    with _FILE_LOCKS_GUARD:
+        thread_lock = _FILE_LOCKS.setdefault(key, threading.RLock())
+
+    with thread_lock:
+        if key in _HELD_FILE_LOCKS:
+            yield
+            return
+
+        lock_path = lock_file_path(key)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a+b") as handle:
+            _lock_handle(handle)
+            _HELD_FILE_LOCKS.add(key)
+            try:
+                yield
+            finally:
+                _HELD_FILE_LOCKS.discard(key)
+                _unlock_handle(handle)
+
+
 def save_to_file(filename, url):
     """将链接保存到指定文件"""
 
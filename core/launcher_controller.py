@@ -11,8 +11,10 @@ def _maybe_delete_empty_learning_queue_file(ui) -> None:
     from core.config import LEARNING_URLS_FILE
     from core.file_ops import del_file
     from core.learning_queue import read_learning_urls
+    from core.queue_db import is_sqlite_backend
 
-    if not LEARNING_URLS_FILE.exists():
+    # SQLite 后端的队列不在 JSON 文件里，残留的 JSON 文件可能还未导入，不提示删除
+    if is_sqlite_backend() or not LEARNING_URLS_FILE.exists():
         return
     if read_learning_urls(LEARNING_URLS_FILE):
         return
@@ -26,8 +28,10 @@ def _maybe_delete_empty_exam_queue_file(ui) -> None:
     from core.config import EXAM_URLS_FILE
     from core.exam_queue import read_exam_urls
     from core.file_ops import del_file
+    from core.queue_db import is_sqlite_backend
 
-    if not EXAM_URLS_FILE.exists():
+    # SQLite 后端的队列不在 JSON 文件里，残留的 JSON 文件可能还未导入，不提示删除
+    if is_sqlite_backend() or not EXAM_URLS_FILE.exists():
         return
     if read_exam_urls(EXAM_URLS_FILE):
         return
@@ -88,10 +92,12 @@ def handle_recommended_flow(ui) -> None:
 
 
 def handle_refresh_credential(state, ui) -> None:
+    from core.browser import invalidate_browser_session
     from core.workflows import refresh_credential
 
     if state.has_credential and not state.credential_expired:
         ui.show_warning("当前登录凭证仍有效，继续将覆盖现有登录状态")
+    invalidate_browser_session()
     profile = refresh_credential(status_callback=ui.show_info)
     ui.show_success(f"登录凭证已更新，当前账号：{profile.label}")
     ui.pause()
@@ -217,3 +223,33 @@ def handle_show_output_state(exam_urls_file, learning_urls_file, manual_exam_fil
         ],
     )
     ui.pause()
+
+
+def handle_show_run_trace(run_trace_file, ui) -> None:
+    from core.spans import read_spans, summarize_spans
+
+    spans = read_spans(run_trace_file)
+    if not spans:
+        ui.show_warning("run_trace.jsonl 当前为空，运行挂课或考试后再查看")
+        ui.pause()
+        return
+
+    summary = summarize_spans(spans)
+    rows = [
+        (
+            stage.label,
+            f"{stage.count} 次, p50 {stage.p50:.2f} 秒, p95 {stage.p95:.2f} 秒"
+            + (f", 失败 {stage.failures} 次" if stage.failures else ""),
+        )
+        for stage in summary.stages
+    ]
+    rows.extend(
+        [
+            ("固定等待占比", f"{summary.share('fixed_wait'):.0%}"),
+            ("条件等待占比", f"{summary.share('ready_wait'):.0%}"),
+            ("实际操作占比", f"{summary.share('work'):.0%}"),
+            ("统计运行次数", str(summary.runs)),
+        ]
+    )
+    ui.show_summary("耗时统计", rows)
+    ui.pause()
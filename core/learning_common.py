@@ -17,6 +17,7 @@ from core.config import (
     ZHIXUEYUN_COURSE_PREFIX,
     ZHIXUEYUN_EXAM_PREFIX,
 )
+from core.progress import has_progress_listener
 
 
 @dataclass(frozen=True)
@@ -126,17 +127,17 @@ async def timer(
     fallback_interval: int = 30,
     description: str = "学习进度",
 ):
-    """等待指定时长；Rich 进度不可用时按 fallback 间隔输出日志。"""
+    """等待指定时长；有进度面板时显示在面板中，否则按 fallback 间隔输出日志。"""
     duration = math.ceil(duration)
     if duration <= 0:
         return
     fallback_interval = max(1, math.ceil(fallback_interval))
     logging.info(f"开始时间: {time.ctime()}")
-    try:
+    if has_progress_listener():
         from core.ui import wait_with_progress
 
         await wait_with_progress(duration, description=description)
-    except Exception:
+    else:
         for elapsed in range(0, duration, fallback_interval):
             wait_seconds = min(fallback_interval, duration - elapsed)
             await asyncio.sleep(wait_seconds)
@@ -5,11 +5,13 @@ import re
 
 from core.exam_queue import append_exam_url
 from core.learning_common import get_course_url
+from core.readiness import wait_for_course_exam_tab_ready
 
 
 async def check_exam_passed(page):
     """检测考试是否通过"""
-    await page.wait_for_timeout(1000)
+    # 未参加过考试的页签可能不渲染任何状态元素，只给 1 秒避免空页签白等
+    await wait_for_course_exam_tab_ready(page, timeout_ms=1000)
     try:
         status_element = await page.locator(".neer-status").count()
         if status_element > 0:
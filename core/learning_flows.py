@@ -6,6 +6,7 @@ import traceback
 
 from core.browser import is_page_browser_connected, is_target_closed_exception
 from core.config import (
+    SUBJECT_COURSE_CONCURRENCY,
     URL_TYPE_WAIT,
 )
 from core.exam_queue import append_exam_url
@@ -13,7 +14,9 @@ from core.learning_common import check_permission, get_course_url, is_learned, t
 from core.learning_exam import check_exam_passed, handle_examination
 from core.learning_handlers import handle_document, handle_h5, handle_video
 from core.learning_queue import record_learning_failure
-from core.learning_popups import handle_rating_popup
+from core.pacing import pace
+from core.readiness import wait_for_subject_page_ready
+from core.spans import span
 
 
 async def handle_subject_exam_item(learn_item) -> str | None:
@@ -33,9 +36,78 @@ async def handle_subject_exam_item(learn_item) -> str | None:
     return exam_url
 
 
+async def _open_subject_course_popup(page, learn_item):
+    await pace("open_popup")
+    async with page.expect_popup() as page_pop:
+        await learn_item.locator(".inline-block.operation").click()
+    return await page_pop.value
+
+
+async def _learn_subject_course(page_detail, learn_item) -> None:
+    """在已打开的课程标签页中学习主题内的一门课程，失败时按课程记录。"""
+    try:
+        await course_learning(page_detail, learn_item)
+    except Exception as exc:
+        if is_target_closed_exception(exc):
+            if is_page_browser_connected(page_detail):
+                logging.info("当前课程标签页已关闭，跳过该课程")
+                return
+            raise
+        logging.error(f"发生错误: {str(exc)}")
+        logging.error(traceback.format_exc())
+        course_url = await get_course_url(learn_item)
+        if str(exc) == "无权限查看该资源":
+            record_learning_failure(
+                course_url,
+                reason="no_permission",
+                reason_text="无权限访问该学习资源",
+                detail={"source": "subject_course"},
+            )
+        else:
+            record_learning_failure(
+                course_url,
+                reason="retryable_error",
+                reason_text=f"主题内课程处理失败，后续可重新加入课程链接: {exc}",
+                detail={"source": "subject_course"},
+            )
+            raise
+    finally:
+        await page_detail.close()
+
+
+async def _learn_subject_course_in_slot(slots: asyncio.Semaphore, page_detail, learn_item) -> None:
+    try:
+        await _learn_subject_course(page_detail, learn_item)
+    finally:
+        slots.release()
+
+
+def _first_task_error(tasks: list[asyncio.Future]) -> BaseException | None:
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception() is not None:
+            return task.exception()
+    return None
+
+
+async def _wait_subject_course_tasks(tasks: list[asyncio.Future]) -> None:
+    """等待主题内并发学习的课程全部结束；任一课程失败时在全部结束后抛出第一个异常。"""
+    if not tasks:
+        return
+    try:
+        await asyncio.wait(tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    error = _first_task_error(tasks)
+    if error is not None:
+        raise error
+
+
 async def subject_learning(page):
     """主题内容学习"""
-    await page.wait_for_load_state("networkidle")
+    await wait_for_subject_page_ready(page)
 
     if not await check_permission(page.main_frame):
         raise Exception("无权限查看该资源")
@@ -46,94 +118,95 @@ async def subject_learning(page):
     learn_locator = page.locator(".item.current-hover")
     learn_count = await learn_locator.count()
 
-    for i in range(learn_count):
-        learn_item = learn_locator.nth(i)
-        if await learn_item.locator(".iconfont.m-right.icon-reload").count() > 0:
-            continue
+    course_concurrency = SUBJECT_COURSE_CONCURRENCY
+    if course_concurrency > 1:
+        logging.info(f"主题内课程并发数: {course_concurrency}")
+    course_slots = asyncio.Semaphore(course_concurrency)
+    course_tasks: list[asyncio.Future] = []
 
-        section_type = await learn_item.locator(".section-type").inner_text()
+    try:
+        for i in range(learn_count):
+            learn_item = learn_locator.nth(i)
+            if await learn_item.locator(".iconfont.m-right.icon-reload").count() > 0:
+                continue
 
-        if section_type == "课程":
-            async with page.expect_popup() as page_pop:
-                await learn_item.locator(".inline-block.operation").click()
-            page_detail = await page_pop.value
-            try:
-                await course_learning(page_detail, learn_item)
-            except Exception as exc:
-                if is_target_closed_exception(exc):
-                    if is_page_browser_connected(page_detail):
-                        logging.info("当前课程标签页已关闭，跳过该课程")
-                        continue
+            section_type = await learn_item.locator(".section-type").inner_text()
+
+            if section_type == "课程":
+                if course_concurrency <= 1:
+                    page_detail = await _open_subject_course_popup(page, learn_item)
+                    await _learn_subject_course(page_detail, learn_item)
+                    continue
+
+                # 同一时间只在主题页上打开一个弹出标签页，避免 expect_popup 拿到其他课程的标签页
+                await course_slots.acquire()
+                if _first_task_error(course_tasks) is not None:
+                    course_slots.release()
+                    break
+                try:
+                    page_detail = await _open_subject_course_popup(page, learn_item)
+                except BaseException:
+                    course_slots.release()
                     raise
-                logging.error(f"发生错误: {str(exc)}")
-                logging.error(traceback.format_exc())
-                course_url = await get_course_url(learn_item)
-                if str(exc) == "无权限查看该资源":
-                    record_learning_failure(
-                        course_url,
-                        reason="no_permission",
-                        reason_text="无权限访问该学习资源",
-                        detail={"source": "subject_course"},
+                course_tasks.append(
+                    asyncio.ensure_future(
+                        _learn_subject_course_in_slot(course_slots, page_detail, learn_item)
                     )
-                else:
-                    record_learning_failure(
-                        course_url,
-                        reason="retryable_error",
-                        reason_text=f"主题内课程处理失败，后续可重新加入课程链接: {exc}",
-                        detail={"source": "subject_course"},
-                    )
-                    raise
-            finally:
+                )
+
+            elif section_type == "URL":
+                logging.info("URL学习类型, 记录为待复查")
+                record_learning_failure(
+                    page.url,
+                    reason="url_type_pending",
+                    reason_text="URL 类型学习等待后续复查",
+                    detail={"source": "subject", "section_type": section_type},
+                )
+                await pace("open_popup")
+                async with page.expect_popup() as page_pop:
+                    await learn_item.locator(".inline-block.operation").click()
+                page_detail = await page_pop.value
+                timer_task = asyncio.create_task(
+                    timer(URL_TYPE_WAIT, fallback_interval=1, description="URL 类型学习等待")
+                )
+                await page_detail.wait_for_timeout(URL_TYPE_WAIT * 1000)
+                await timer_task
                 await page_detail.close()
 
-        elif section_type == "URL":
-            logging.info("URL学习类型, 记录为待复查")
-            record_learning_failure(
-                page.url,
-                reason="url_type_pending",
-                reason_text="URL 类型学习等待后续复查",
-                detail={"source": "subject", "section_type": section_type},
-            )
-            async with page.expect_popup() as page_pop:
-                await learn_item.locator(".inline-block.operation").click()
-            page_detail = await page_pop.value
-            timer_task = asyncio.create_task(
-                timer(URL_TYPE_WAIT, fallback_interval=1, description="URL 类型学习等待")
-            )
-            await page_detail.wait_for_timeout(URL_TYPE_WAIT * 1000)
-            await timer_task
-            await page_detail.close()
+            elif section_type == "考试":
+                await handle_subject_exam_item(learn_item)
 
-        elif section_type == "考试":
-            await handle_subject_exam_item(learn_item)
+            elif section_type == "调研":
+                logging.info("调研学习类型, 记录为需要人工处理")
+                record_learning_failure(
+                    await get_course_url(learn_item),
+                    reason="survey_manual_required",
+                    reason_text="调研类型学习需要人工处理",
+                    detail={"source": "subject", "section_type": section_type},
+                )
 
-        elif section_type == "调研":
-            logging.info("调研学习类型, 记录为需要人工处理")
-            record_learning_failure(
-                await get_course_url(learn_item),
-                reason="survey_manual_required",
-                reason_text="调研类型学习需要人工处理",
-                detail={"source": "subject", "section_type": section_type},
-            )
+            else:
+                logging.info("非课程及考试类学习类型, 记录为需要人工处理")
+                record_learning_failure(
+                    page.url,
+                    reason="other_learning_type",
+                    reason_text=f"非课程及考试类学习类型: {section_type}",
+                    detail={"source": "subject", "section_type": section_type},
+                )
+    except BaseException:
+        for task in course_tasks:
+            task.cancel()
+        await asyncio.gather(*course_tasks, return_exceptions=True)
+        raise
 
-        else:
-            logging.info("非课程及考试类学习类型, 记录为需要人工处理")
-            record_learning_failure(
-                page.url,
-                reason="other_learning_type",
-                reason_text=f"非课程及考试类学习类型: {section_type}",
-                detail={"source": "subject", "section_type": section_type},
-            )
+    await _wait_subject_course_tasks(course_tasks)
 
 
 async def course_learning(page_detail, learn_item=None):
     """课程内容学习"""
     await page_detail.wait_for_load_state("load")
 
-    if await check_permission(page_detail.main_frame):
-        if await handle_rating_popup(page_detail):
-            logging.info("五星评价完成")
-    else:
+    if not await check_permission(page_detail.main_frame):
         raise Exception("无权限查看该资源")
 
     if await _is_course_completed(page_detail):
@@ -175,51 +248,57 @@ async def course_learning(page_detail, learn_item=None):
                 logging.info(f"课程{count+1}已学习, 跳过该节\n")
                 continue
 
-        if await handle_rating_popup(page_detail):
-            logging.info("五星评价完成")
-        await box.locator(".section-item-wrapper").wait_for()
-        await box.locator(".section-item-wrapper").click()
-
-        try:
-            if section_type in ["5", "6"]:
-                logging.info("该课程为视频类型")
-                await handle_video(box, page_detail)
-            elif section_type in ["1", "2", "3"]:
-                logging.info("该课程为文档、网页类型")
-                await handle_document(page_detail, box)
-            elif section_type == "4":
-                logging.info("该课程为h5类型")
-                await handle_h5(page_detail, learn_item)
-            elif section_type == "9":
-                logging.info("该课程为考试类型")
-                exam_passed = await check_exam_passed(page_detail)
-                if exam_passed:
-                    logging.info("考试已通过, 跳过该节")
-                    continue
-                if learn_item:
-                    await handle_examination(
-                        page_detail,
-                        learn_item,
-                        exam_passed=exam_passed,
-                    )
+        with span(
+            "chapter",
+            kind="stage",
+            section_type=section_type,
+            title=box_text.strip(),
+        ) as chapter_span:
+            await box.locator(".section-item-wrapper").wait_for()
+            await pace("play")
+            await box.locator(".section-item-wrapper").click()
+
+            try:
+                if section_type in ["5", "6"]:
+                    logging.info("该课程为视频类型")
+                    await handle_video(box, page_detail)
+                elif section_type in ["1", "2", "3"]:
+                    logging.info("该课程为文档、网页类型")
+                    await handle_document(page_detail, box)
+                elif section_type == "4":
+                    logging.info("该课程为h5类型")
+                    await handle_h5(page_detail, learn_item)
+                elif section_type == "9":
+                    logging.info("该课程为考试类型")
+                    exam_passed = await check_exam_passed(page_detail)
+                    if exam_passed:
+                        logging.info("考试已通过, 跳过该节")
+                        continue
+                    if learn_item:
+                        await handle_examination(
+                            page_detail,
+                            learn_item,
+                            exam_passed=exam_passed,
+                        )
+                    else:
+                        await handle_examination(page_detail, exam_passed=exam_passed)
                 else:
-                    await handle_examination(page_detail, exam_passed=exam_passed)
-            else:
-                logging.info("未知课程学习类型, 记录为需要人工处理")
-                failure_url = await get_course_url(learn_item) if learn_item else page_detail.url
-                record_learning_failure(
-                    failure_url,
-                    reason="unknown_learning_type",
-                    reason_text=f"未知课程学习类型: {section_type}",
-                    detail={"source": "course_chapter", "section_type": section_type},
-                )
+                    logging.info("未知课程学习类型, 记录为需要人工处理")
+                    failure_url = await get_course_url(learn_item) if learn_item else page_detail.url
+                    record_learning_failure(
+                        failure_url,
+                        reason="unknown_learning_type",
+                        reason_text=f"未知课程学习类型: {section_type}",
+                        detail={"source": "course_chapter", "section_type": section_type},
+                    )
+                    continue
+            except Exception as exc:
+                logging.error(f"课程{count+1}学习失败: {str(exc)}")
+                logging.error(traceback.format_exc())
+                chapter_span.ok = False
+                has_failed_box = True
                 continue
-        except Exception as exc:
-            logging.error(f"课程{count+1}学习失败: {str(exc)}")
-            logging.error(traceback.format_exc())
-            has_failed_box = True
-            continue
-        logging.info(f"课程{count+1}学习完毕")
+            logging.info(f"课程{count+1}学习完毕")
 
     if has_failed_box:
         raise Exception("部分章节学习失败")
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 
 from core.config import (
     DOCUMENT_INITIAL_WAIT,
     DOCUMENT_SYNC_EXTRA_WAIT,
+    VIDEO_PROGRESS_RESPONSE_PATTERN,
 )
 from core.learning_common import (
     build_video_timing_plan,
@@ -14,7 +16,8 @@ from core.learning_common import (
     timer,
 )
 from core.learning_queue import record_learning_failure
-from core.learning_popups import check_and_handle_rating_popup, check_rating_popup_periodically
+from core.pacing import pace
+from core.spans import span
 
 
 async def _cleanup_background_tasks(*tasks) -> None:
@@ -28,16 +31,136 @@ async def _cleanup_background_tasks(*tasks) -> None:
     await asyncio.gather(*active_tasks, return_exceptions=True)
 
 
+# 进度接口响应返回后页面重新渲染章节状态需要一点时间，依次在这些延迟后读取章节状态
+_PROGRESS_CONFIRM_DELAYS = (0.5, 2)
+
+
+class _VideoProgressWatcher:
+    """监听视频进度上报/查询接口的响应，在服务器确认章节学完时唤醒等待方。"""
+
+    def __init__(self, page, box, pattern: str | None = VIDEO_PROGRESS_RESPONSE_PATTERN):
+        self._page = page
+        self._box = box
+        self._pattern = re.compile(pattern) if pattern else None
+        self._learned = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._confirm_task: asyncio.Task | None = None
+        self._confirm_again = False
+        self.response_count = 0
+
+    def start(self) -> bool:
+        """注册页面事件监听；页面不支持事件订阅或未配置接口正则时返回 False。"""
+        on = getattr(self._page, "on", None)
+        if self._pattern is None or not callable(on):
+            return False
+        on("response", self._on_response)
+        on("close", self._on_close)
+        return True
+
+    async def stop(self) -> None:
+        remove_listener = getattr(self._page, "remove_listener", None)
+        if callable(remove_listener):
+            for event, handler in (("response", self._on_response), ("close", self._on_close)):
+                try:
+                    remove_listener(event, handler)
+                except Exception:
+                    pass
+        await _cleanup_background_tasks(self._confirm_task)
+
+    @property
+    def learned(self) -> bool:
+        return self._learned.is_set()
+
+    def _on_response(self, response) -> None:
+        try:
+            request = response.request
+            if request.resource_type not in ("xhr", "fetch"):
+                return
+            if not self._pattern.search(response.url):
+                return
+        except Exception:
+            return
+
+        self.response_count += 1
+        if self._learned.is_set():
+            return
+        if self._confirm_task is not None and not self._confirm_task.done():
+            self._confirm_again = True
+            return
+        self._confirm_task = asyncio.get_running_loop().create_task(
+            self._confirm_learned()
+        )
+
+    def _on_close(self, *_args) -> None:
+        self._closed.set()
+
+    async def _confirm_learned(self) -> None:
+        while True:
+            self._confirm_again = False
+            for delay in _PROGRESS_CONFIRM_DELAYS:
+                await asyncio.sleep(delay)
+                try:
+                    current_text = await self._box.locator(".section-item-wrapper").inner_text()
+                except Exception:
+                    return
+                if is_learned(current_text):
+                    self._learned.set()
+                    return
+            if not self._confirm_again:
+                return
+
+    async def wait_until_learned(self, timeout: float) -> bool:
+        """等待服务器确认学完，超时返回 False；页面关闭时抛出异常。"""
+        if self._learned.is_set():
+            return True
+        waiters = [
+            asyncio.ensure_future(self._learned.wait()),
+            asyncio.ensure_future(self._closed.wait()),
+        ]
+        try:
+            await asyncio.wait(
+                waiters,
+                timeout=max(0, timeout),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            await _cleanup_background_tasks(*waiters)
+        if self._learned.is_set():
+            return True
+        if self._closed.is_set():
+            raise Exception("Target page, context or browser has been closed")
+        return False
+
+
+async def _wait_video_sync_by_polling(box, page, timing_plan) -> bool:
+    elapsed_sync_wait = 0
+    while elapsed_sync_wait < timing_plan.sync_wait_time:
+        current_text = await box.locator(".section-item-wrapper").inner_text()
+        if is_learned(current_text):
+            logging.info(f"课程进度已同步到服务器, 额外等待 {elapsed_sync_wait} 秒")
+            return True
+
+        wait_seconds = min(
+            timing_plan.sync_poll_interval,
+            timing_plan.sync_wait_time - elapsed_sync_wait,
+        )
+        logging.info(
+            f"课程进度仍未同步完成, 已额外等待 {elapsed_sync_wait + wait_seconds} 秒, 继续等待..."
+        )
+        await page.wait_for_timeout(wait_seconds * 1000)
+        elapsed_sync_wait += wait_seconds
+    return False
+
+
 async def handle_video(box, page):
     """处理视频类型课程"""
     resume_button = await page.locator(".register-mask-layer").all()
     if resume_button:
+        await pace("play")
         await resume_button[0].click()
     await page.locator(".vjs-progress-control").first.wait_for()
     await page.locator(".vjs-duration-display").wait_for()
 
-    await check_and_handle_rating_popup(page)
-
     section_text = await box.locator(".section-item-wrapper").inner_text()
     timing_plan = build_video_timing_plan(section_text)
     logging.info(f"课程总时长: {timing_plan.total_time} 秒")
@@ -49,46 +172,65 @@ async def handle_video(box, page):
             f"同步确认轮询间隔: {timing_plan.sync_poll_interval} 秒"
         )
 
-    timer_task = asyncio.create_task(
-        timer(
-            timing_plan.learning_wait_time,
-            fallback_interval=timing_plan.learning_fallback_interval,
-            description="视频学习进度",
-        )
-    )
-    popup_check_task = asyncio.create_task(
-        check_rating_popup_periodically(page, timing_plan.learning_wait_time)
-    )
+    watcher = _VideoProgressWatcher(page, box)
+    watching = watcher.start()
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
     try:
-        await page.wait_for_timeout(timing_plan.learning_wait_time * 1000)
-        await timer_task
-        await popup_check_task
-    finally:
-        await _cleanup_background_tasks(timer_task, popup_check_task)
+        timer_task = asyncio.create_task(
+            timer(
+                timing_plan.learning_wait_time,
+                fallback_interval=timing_plan.learning_fallback_interval,
+                description="视频学习进度",
+            )
+        )
+        try:
+            with span(
+                "video_wait",
+                kind="fixed_wait",
+                planned_seconds=timing_plan.learning_wait_time,
+                watching=watching,
+            ):
+                if watching:
+                    await watcher.wait_until_learned(timing_plan.learning_wait_time)
+                else:
+                    await page.wait_for_timeout(timing_plan.learning_wait_time * 1000)
+                    await timer_task
+        finally:
+            await _cleanup_background_tasks(timer_task)
 
-    logging.info("课程学习完毕, 确认课程进度同步状态...")
-    current_text = await box.locator(".section-item-wrapper").inner_text()
-    if is_learned(current_text):
-        logging.info("课程进度已同步到服务器")
-        return
+        if watcher.learned:
+            saved_seconds = timing_plan.learning_wait_time - (loop.time() - started_at)
+            logging.info(
+                f"服务器已确认课程进度, 提前 {max(0, saved_seconds):.0f} 秒结束本章节"
+            )
+            return
 
-    elapsed_sync_wait = 0
-    while elapsed_sync_wait < timing_plan.sync_wait_time:
-        await check_and_handle_rating_popup(page)
+        logging.info("课程学习完毕, 确认课程进度同步状态...")
         current_text = await box.locator(".section-item-wrapper").inner_text()
         if is_learned(current_text):
-            logging.info(f"课程进度已同步到服务器, 额外等待 {elapsed_sync_wait} 秒")
+            logging.info("课程进度已同步到服务器")
             return
 
-        wait_seconds = min(
-            timing_plan.sync_poll_interval,
-            timing_plan.sync_wait_time - elapsed_sync_wait,
-        )
-        logging.info(
-            f"课程进度仍未同步完成, 已额外等待 {elapsed_sync_wait + wait_seconds} 秒, 继续等待..."
-        )
-        await page.wait_for_timeout(wait_seconds * 1000)
-        elapsed_sync_wait += wait_seconds
+        if watching and watcher.response_count:
+            logging.info(
+                f"等待服务器确认课程进度, 最多额外等待 {timing_plan.sync_wait_time} 秒..."
+            )
+            sync_started_at = loop.time()
+            with span("video_sync_wait", kind="fixed_wait", watching=True):
+                synced = await watcher.wait_until_learned(timing_plan.sync_wait_time)
+            if synced:
+                logging.info(
+                    f"课程进度已同步到服务器, 额外等待 {loop.time() - sync_started_at:.0f} 秒"
+                )
+                return
+        else:
+            with span("video_sync_wait", kind="fixed_wait", watching=False):
+                synced = await _wait_video_sync_by_polling(box, page, timing_plan)
+            if synced:
+                return
+    finally:
+        await watcher.stop()
 
     current_text = await box.locator(".section-item-wrapper").inner_text()
     if not is_learned(current_text):
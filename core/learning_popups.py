@@ -1,22 +1,81 @@
+"""
+课程页弹窗处理：评分弹窗（五星评价后确定）和视频内互动练习弹窗（点击跳过）。
+
+watch_popups 为浏览器上下文注册一个页面绑定和初始化脚本，页面内的 MutationObserver
+在弹窗出现的瞬间通知 Python 侧处理；弹窗不出现时没有任何等待或轮询开销。
+"""
+
 from __future__ import annotations
 
 import asyncio
 import logging
+import weakref
 
+from core.pacing import pace
 
-async def handle_rating_popup(page):
-    """监测评分弹窗, 选择五星并提交"""
-    try:
-        dialog = page.locator(".ant-modal-content")
-        try:
-            await dialog.wait_for(state="visible", timeout=1500)
-            logging.info("检测到评分弹窗")
-        except Exception as exc:
-            logging.debug(f"未检测到评分弹窗: {exc}")
-            return False
+POPUP_BINDING_NAME = "__courseAfkPopupAppeared"
 
-        stars_container = dialog.locator("ul.ant-rate")
-        await stars_container.wait_for(state="visible", timeout=1000)
+RATING_POPUP = "rating"
+INTERACT_POPUP = "interact"
+
+# 只在顶层页面中观察；同一个弹窗节点只通知一次，隐藏的弹窗等到显示时再通知
+POPUP_OBSERVER_SCRIPT = """
+(() => {
+    if (window.top !== window || window.__courseAfkPopupObserver) {
+        return;
+    }
+    const reported = new WeakSet();
+    const isVisible = (node) => node.getClientRects().length > 0;
+    const report = (kind, node) => {
+        if (reported.has(node) || !isVisible(node)) {
+            return;
+        }
+        reported.add(node);
+        const notify = window.__courseAfkPopupAppeared;
+        if (typeof notify === "function") {
+            notify(kind).catch(() => {});
+        }
+    };
+    const scan = () => {
+        for (const node of document.querySelectorAll(".ant-modal-content")) {
+            if (node.querySelector("ul.ant-rate")) {
+                report("rating", node);
+            }
+        }
+        for (const node of document.querySelectorAll("div.split-section-detail-header--interact")) {
+            if ((node.textContent || "").includes("互动练习")) {
+                report("interact", node);
+            }
+        }
+    };
+    const observer = new MutationObserver(scan);
+    window.__courseAfkPopupObserver = observer;
+    const start = () => {
+        observer.observe(document.documentElement, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            attributeFilter: ["class", "style"],
+        });
+        scan();
+    };
+    if (document.documentElement) {
+        start();
+    } else {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    }
+})();
+"""
+
+_WATCHED_CONTEXTS: weakref.WeakSet = weakref.WeakSet()
+_POPUP_TASKS: set[asyncio.Task] = set()
+
+
+async def rate_five_stars(page) -> bool:
+    """在已出现的评分弹窗中选择五星并提交"""
+    try:
+        dialog = page.locator(".ant-modal-content").filter(has=page.locator("ul.ant-rate"))
+        logging.info("检测到评分弹窗")
 
         try:
             fifth_star = dialog.locator("ul.ant-rate li:nth-child(5) div[role='radio']")
@@ -24,6 +83,7 @@ async def handle_rating_popup(page):
             await page.evaluate(
                 "document.querySelector('ul.ant-rate').scrollIntoView({block: 'center'})"
             )
+            await pace("popup")
             await fifth_star.click(force=True)
             logging.info("已五星评价")
         except Exception as exc:
@@ -33,8 +93,10 @@ async def handle_rating_popup(page):
 
         try:
             confirm_button = page.get_by_role("button", name="确 定")
+            await pace("popup")
             await confirm_button.click()
             logging.info("已点击确定按钮")
+            logging.info("五星评价完成")
             return True
         except Exception as exc:
             logging.error(f"点击确定按钮时出错: {exc}")
@@ -44,35 +106,54 @@ async def handle_rating_popup(page):
         return False
 
 
-async def check_and_handle_rating_popup(page):
-    """检查并处理视频内课程质量评价弹窗"""
+async def skip_interact_popup(page) -> bool:
+    """跳过视频内的互动练习（课程质量评价）弹窗"""
     try:
-        popup_exists = (
-            await page.locator(
-                "div.split-section-detail-header--interact:has-text('互动练习')"
-            ).count()
-            > 0
-        )
-
-        if popup_exists:
-            logging.info("检测到课程质量评价弹窗")
-            skip_button = page.locator("button:has-text('跳 过')")
-            if await skip_button.count() > 0:
-                await skip_button.click()
-                logging.info("已点击'跳过'按钮")
-                await page.wait_for_timeout(1000)
-                return True
+        logging.info("检测到课程质量评价弹窗")
+        skip_button = page.locator("button:has-text('跳 过')")
+        if await skip_button.count() > 0:
+            await pace("popup")
+            await skip_button.first.click()
+            logging.info("已点击'跳过'按钮")
+            return True
     except Exception as exc:
         logging.warning(f"处理评价弹窗时出错: {str(exc)}")
 
     return False
 
 
-async def check_rating_popup_periodically(page, duration, interval=30):
-    """定期检查视频内评价弹窗, 持续指定时间"""
-    elapsed = 0
-    while elapsed < duration:
-        wait_time = min(interval, duration - elapsed)
-        await asyncio.sleep(wait_time)
-        await check_and_handle_rating_popup(page)
-        elapsed += wait_time
+_POPUP_HANDLERS = {
+    RATING_POPUP: rate_five_stars,
+    INTERACT_POPUP: skip_interact_popup,
+}
+
+
+def _on_popup_appeared(source, kind) -> None:
+    handler = _POPUP_HANDLERS.get(kind)
+    page = source.get("page") if isinstance(source, dict) else None
+    if handler is None or page is None:
+        return
+    # 绑定回调需要尽快返回，弹窗在后台任务中处理，不阻塞页面脚本和挂课流程
+    task = asyncio.create_task(handler(page))
+    _POPUP_TASKS.add(task)
+    task.add_done_callback(_POPUP_TASKS.discard)
+
+
+async def watch_popups(context) -> None:
+    """为浏览器上下文中的所有页面注册弹窗监听，同一上下文重复调用只注册一次。"""
+    if context in _WATCHED_CONTEXTS:
+        return
+    _WATCHED_CONTEXTS.add(context)
+    try:
+        await context.expose_binding(POPUP_BINDING_NAME, _on_popup_appeared)
+        await context.add_init_script(POPUP_OBSERVER_SCRIPT)
+    except Exception as exc:
+        logging.warning(f"注册弹窗监听失败: {exc}")
+        return
+
+    # 初始化脚本只对之后加载的文档生效，已打开的页面补装一次
+    for page in list(context.pages):
+        try:
+            await page.evaluate(POPUP_OBSERVER_SCRIPT)
+        except Exception as exc:
+            logging.debug(f"为已打开页面注册弹窗监听失败: {exc}")
@@ -0,0 +1,147 @@
+"""
+挂课前的学习进度接口预检。
+
+打开标签页之前，用浏览器上下文的 request（与页面共享登录 Cookie）并发请求
+课程/主题进度接口，把已经学完的链接直接移出本轮队列，只把剩余链接交给浏览器。
+接口地址由 AFK_PREFILTER_COURSE_API / AFK_PREFILTER_SUBJECT_API 模板配置，
+请求失败、字段缺失或无法解析的链接一律视为未完成，照常进入浏览器学习。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from core.config import (
+    AFK_PREFILTER_CONCURRENCY,
+    AFK_PREFILTER_COURSE_API,
+    AFK_PREFILTER_PROGRESS_KEYS,
+    AFK_PREFILTER_SUBJECT_API,
+    ZHIXUEYUN_COURSE_PREFIX,
+    ZHIXUEYUN_SUBJECT_PREFIX,
+)
+
+_REQUEST_TIMEOUT_MS = 10_000
+
+
+@dataclass
+class PrefilterResult:
+    remaining: list[str]
+    completed: list[str] = field(default_factory=list)
+    unknown: list[str] = field(default_factory=list)
+
+
+def build_progress_api_url(url: str) -> str | None:
+    """按链接类型把课程/主题 ID 填入对应的接口模板；未配置模板时返回 None。"""
+    for prefix, template in (
+        (ZHIXUEYUN_COURSE_PREFIX, AFK_PREFILTER_COURSE_API),
+        (ZHIXUEYUN_SUBJECT_PREFIX, AFK_PREFILTER_SUBJECT_API),
+    ):
+        if url.startswith(prefix):
+            resource_id = url[len(prefix):].split("?", 1)[0].strip("/")
+            if not template or not resource_id:
+                return None
+            return template.replace("{id}", resource_id)
+    return None
+
+
+def _find_key(data, key: str):
+    pending = [data]
+    while pending:
+        current = pending.pop(0)
+        if isinstance(current, dict):
+            if key in current:
+                return current[key]
+            pending.extend(current.values())
+        elif isinstance(current, list):
+            pending.extend(current)
+    return None
+
+
+def _parse_percent(value) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip("%"))
+        except ValueError:
+            return None
+    return None
+
+
+def find_progress_percent(data, keys: tuple[str, ...] = AFK_PREFILTER_PROGRESS_KEYS) -> float | None:
+    """按 keys 顺序在接口响应中查找第一个可解析的进度百分比。"""
+    for key in keys:
+        percent = _parse_percent(_find_key(data, key))
+        if percent is not None:
+            return percent
+    return None
+
+
+async def check_learning_url_completed(request_context, url: str) -> bool | None:
+    """返回 True/False 表示接口确认的完成状态，无法确认时返回 None。"""
+    api_url = build_progress_api_url(url)
+    if api_url is None:
+        return None
+    try:
+        response = await request_context.get(api_url, timeout=_REQUEST_TIMEOUT_MS)
+        if not response.ok:
+            logging.debug(f"学习进度接口返回 {response.status}: {api_url}")
+            return None
+        data = await response.json()
+    except Exception as exc:
+        logging.debug(f"学习进度接口请求失败: {api_url}, {exc}")
+        return None
+
+    percent = find_progress_percent(data)
+    if percent is None:
+        return None
+    return percent >= 100
+
+
+def is_prefilter_configured() -> bool:
+    return bool(AFK_PREFILTER_COURSE_API or AFK_PREFILTER_SUBJECT_API)
+
+
+async def prefilter_learning_urls(
+    context,
+    urls: list[str],
+    *,
+    concurrency: int = AFK_PREFILTER_CONCURRENCY,
+) -> PrefilterResult:
+    """并发查询全部链接的学习进度，返回剩余需要学习的链接（保持原顺序）。"""
+    if not urls:
+        return PrefilterResult(remaining=[])
+    if not is_prefilter_configured():
+        logging.warning("已开启 AFK_PREFILTER, 但未配置学习进度接口地址, 跳过接口预检")
+        return PrefilterResult(remaining=list(urls))
+
+    started_at = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def check(url: str) -> bool | None:
+        async with semaphore:
+            return await check_learning_url_completed(context.request, url)
+
+    statuses = await asyncio.gather(*(check(url) for url in urls))
+
+    result = PrefilterResult(remaining=[])
+    for url, status in zip(urls, statuses):
+        if status is True:
+            logging.info(f"接口确认已学习完毕, 跳过: {url}")
+            result.completed.append(url)
+            continue
+        if status is None:
+            result.unknown.append(url)
+        result.remaining.append(url)
+
+    logging.info(
+        f"接口预检 {len(urls)} 条学习链接, 已完成 {len(result.completed)} 条, "
+        f"无法确认 {len(result.unknown)} 条, 待学习 {len(result.remaining)} 条, "
+        f"耗时 {time.perf_counter() - started_at:.1f} 秒"
+    )
+    return result
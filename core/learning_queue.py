@@ -2,10 +2,21 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from core.config import LEARNING_FAILURES_FILE, LEARNING_URLS_FILE
-from core.file_ops import del_file
+from core.file_ops import atomic_write_text, del_file, locked_file
+from core.queue_db import (
+    LEARNING_FAILURES_TABLE,
+    LEARNING_URLS_TABLE,
+    count_queue_rows,
+    is_sqlite_backend,
+    read_queue_rows,
+    replace_queue_rows,
+)
+from core.queue_owner import forward_queue_call
+from core.queue_store import get_active_queue_store, render_queue_json
 
 
 @dataclass(frozen=True)
@@ -102,7 +113,7 @@ def _serialize_failure_entries(
     ]
 
 
-def read_learning_queue(file_path: Path = LEARNING_URLS_FILE) -> list[LearningQueueEntry]:
+def _read_learning_queue_json(file_path: Path) -> list[LearningQueueEntry]:
     try:
         content = file_path.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
@@ -118,6 +129,48 @@ def read_learning_queue(file_path: Path = LEARNING_URLS_FILE) -> list[LearningQu
     return _normalize_queue_entries(raw_entries)
 
 
+def _read_learning_queue_file(file_path: Path) -> list[LearningQueueEntry]:
+    if is_sqlite_backend():
+        return _normalize_queue_entries(read_queue_rows(LEARNING_URLS_TABLE, file_path))
+    return _read_learning_queue_json(file_path)
+
+
+def read_learning_queue(
+    file_path: Path = LEARNING_URLS_FILE,
+    *,
+    refresh: bool = False,
+) -> list[LearningQueueEntry]:
+    store = get_active_queue_store()
+    if store is not None:
+        return store.read(file_path, _read_learning_queue_file, refresh=refresh)
+    return _read_learning_queue_file(file_path)
+
+
+def _write_learning_queue_json(
+    entries: list[LearningQueueEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    with locked_file(file_path):
+        if not entries and not keep_file:
+            del_file(file_path)
+            return
+        atomic_write_text(file_path, render_queue_json(_serialize_queue_entries(entries)))
+
+
+def _write_learning_queue_file(
+    entries: list[LearningQueueEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    if is_sqlite_backend():
+        replace_queue_rows(LEARNING_URLS_TABLE, file_path, _serialize_queue_entries(entries))
+        return
+    _write_learning_queue_json(entries, file_path=file_path, keep_file=keep_file)
+
+
 def write_learning_queue(
     entries: list[LearningQueueEntry],
     *,
@@ -125,14 +178,16 @@ def write_learning_queue(
     keep_file: bool = True,
 ) -> None:
     normalized = _normalize_queue_entries(_serialize_queue_entries(entries))
-    if not normalized and not keep_file:
-        del_file(file_path)
+    store = get_active_queue_store()
+    if store is not None:
+        store.write(
+            file_path,
+            normalized,
+            partial(_write_learning_queue_file, file_path=file_path, keep_file=keep_file),
+            loader=_read_learning_queue_file,
+        )
         return
-
-    file_path.write_text(
-        json.dumps(_serialize_queue_entries(normalized), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_learning_queue_file(normalized, file_path=file_path, keep_file=keep_file)
 
 
 def append_learning_url(url: str, *, file_path: Path = LEARNING_URLS_FILE) -> bool:
@@ -140,13 +195,14 @@ def append_learning_url(url: str, *, file_path: Path = LEARNING_URLS_FILE) -> bo
     if not normalized_url:
         return False
 
-    entries = read_learning_queue(file_path=file_path)
-    if normalized_url in {entry.url for entry in entries}:
-        return False
+    with locked_file(file_path):
+        entries = read_learning_queue(file_path=file_path, refresh=True)
+        if normalized_url in {entry.url for entry in entries}:
+            return False
 
-    entries.append(LearningQueueEntry(url=normalized_url))
-    write_learning_queue(entries, file_path=file_path)
-    return True
+        entries.append(LearningQueueEntry(url=normalized_url))
+        write_learning_queue(entries, file_path=file_path)
+        return True
 
 
 def append_learning_urls(
@@ -154,19 +210,20 @@ def append_learning_urls(
     *,
     file_path: Path = LEARNING_URLS_FILE,
 ) -> list[str]:
-    entries = read_learning_queue(file_path=file_path)
-    existing = {entry.url for entry in entries}
-    added: list[str] = []
-    for url in _unique_clean_strings(urls):
-        if url in existing:
-            continue
-        entries.append(LearningQueueEntry(url=url))
-        existing.add(url)
-        added.append(url)
-
-    if added:
-        write_learning_queue(entries, file_path=file_path)
-    return added
+    with locked_file(file_path):
+        entries = read_learning_queue(file_path=file_path, refresh=True)
+        existing = {entry.url for entry in entries}
+        added: list[str] = []
+        for url in _unique_clean_strings(urls):
+            if url in existing:
+                continue
+            entries.append(LearningQueueEntry(url=url))
+            existing.add(url)
+            added.append(url)
+
+        if added:
+            write_learning_queue(entries, file_path=file_path)
+        return added
 
 
 def read_learning_urls(file_path: Path = LEARNING_URLS_FILE) -> list[str]:
@@ -174,6 +231,8 @@ def read_learning_urls(file_path: Path = LEARNING_URLS_FILE) -> list[str]:
 
 
 def count_learning_urls(file_path: Path = LEARNING_URLS_FILE) -> int:
+    if is_sqlite_backend() and get_active_queue_store() is None:
+        return count_queue_rows(LEARNING_URLS_TABLE, file_path)
     return len(read_learning_urls(file_path=file_path))
 
 
@@ -187,9 +246,7 @@ def write_learning_urls(
     write_learning_queue(entries, file_path=file_path, keep_file=keep_file)
 
 
-def read_learning_failures(
-    file_path: Path = LEARNING_FAILURES_FILE,
-) -> list[LearningFailureEntry]:
+def _read_learning_failures_json(file_path: Path) -> list[LearningFailureEntry]:
     try:
         content = file_path.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
@@ -205,6 +262,48 @@ def read_learning_failures(
     return _normalize_failure_entries(raw_entries)
 
 
+def _read_learning_failures_file(file_path: Path) -> list[LearningFailureEntry]:
+    if is_sqlite_backend():
+        return _normalize_failure_entries(read_queue_rows(LEARNING_FAILURES_TABLE, file_path))
+    return _read_learning_failures_json(file_path)
+
+
+def read_learning_failures(
+    file_path: Path = LEARNING_FAILURES_FILE,
+    *,
+    refresh: bool = False,
+) -> list[LearningFailureEntry]:
+    store = get_active_queue_store()
+    if store is not None:
+        return store.read(file_path, _read_learning_failures_file, refresh=refresh)
+    return _read_learning_failures_file(file_path)
+
+
+def _write_learning_failures_json(
+    entries: list[LearningFailureEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    with locked_file(file_path):
+        if not entries and not keep_file:
+            del_file(file_path)
+            return
+        atomic_write_text(file_path, render_queue_json(_serialize_failure_entries(entries)))
+
+
+def _write_learning_failures_file(
+    entries: list[LearningFailureEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    if is_sqlite_backend():
+        replace_queue_rows(LEARNING_FAILURES_TABLE, file_path, _serialize_failure_entries(entries))
+        return
+    _write_learning_failures_json(entries, file_path=file_path, keep_file=keep_file)
+
+
 def write_learning_failures(
     entries: list[LearningFailureEntry],
     *,
@@ -212,14 +311,16 @@ def write_learning_failures(
     keep_file: bool = True,
 ) -> None:
     normalized = _normalize_failure_entries(_serialize_failure_entries(entries))
-    if not normalized and not keep_file:
-        del_file(file_path)
+    store = get_active_queue_store()
+    if store is not None:
+        store.write(
+            file_path,
+            normalized,
+            partial(_write_learning_failures_file, file_path=file_path, keep_file=keep_file),
+            loader=_read_learning_failures_file,
+        )
         return
-
-    file_path.write_text(
-        json.dumps(_serialize_failure_entries(normalized), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_learning_failures_file(normalized, file_path=file_path, keep_file=keep_file)
 
 
 def record_learning_failure(
@@ -230,6 +331,16 @@ def record_learning_failure(
     detail: dict[str, object] | None = None,
     file_path: Path = LEARNING_FAILURES_FILE,
 ) -> None:
+    if forward_queue_call(
+        "record_learning_failure",
+        url=url,
+        reason=reason,
+        reason_text=reason_text,
+        detail=detail,
+        file_path=file_path,
+    ):
+        return
+
     normalized_url = _normalize_text(url)
     normalized_reason = _normalize_text(reason)
     if not normalized_url or not normalized_reason:
@@ -241,16 +352,17 @@ def record_learning_failure(
         reason_text=_normalize_text(reason_text),
         detail=_normalize_detail(detail),
     )
-    entries = read_learning_failures(file_path=file_path)
-    existing = {entry.url: entry for entry in entries}
-    if incoming.url not in existing:
-        entries.append(incoming)
-    else:
-        entries = [
-            incoming if entry.url == incoming.url else entry
-            for entry in entries
-        ]
-    write_learning_failures(entries, file_path=file_path)
+    with locked_file(file_path):
+        entries = read_learning_failures(file_path=file_path, refresh=True)
+        existing = {entry.url: entry for entry in entries}
+        if incoming.url not in existing:
+            entries.append(incoming)
+        else:
+            entries = [
+                incoming if entry.url == incoming.url else entry
+                for entry in entries
+            ]
+        write_learning_failures(entries, file_path=file_path)
 
 
 def remove_learning_failure(
@@ -259,17 +371,28 @@ def remove_learning_failure(
     file_path: Path = LEARNING_FAILURES_FILE,
     keep_file: bool = True,
 ) -> None:
+    if forward_queue_call(
+        "remove_learning_failure",
+        url=url,
+        file_path=file_path,
+        keep_file=keep_file,
+    ):
+        return
+
     normalized_url = _normalize_text(url)
     if not normalized_url:
         return
 
-    entries = [
-        entry
-        for entry in read_learning_failures(file_path=file_path)
-        if entry.url != normalized_url
-    ]
-    write_learning_failures(entries, file_path=file_path, keep_file=keep_file)
+    with locked_file(file_path):
+        entries = [
+            entry
+            for entry in read_learning_failures(file_path=file_path, refresh=True)
+            if entry.url != normalized_url
+        ]
+        write_learning_failures(entries, file_path=file_path, keep_file=keep_file)
 
 
 def count_learning_failures(file_path: Path = LEARNING_FAILURES_FILE) -> int:
+    if is_sqlite_backend() and get_active_queue_store() is None:
+        return count_queue_rows(LEARNING_FAILURES_TABLE, file_path)
     return len(read_learning_failures(file_path=file_path))
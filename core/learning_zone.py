@@ -1,13 +1,95 @@
+"""
+学习专区解析：收集专区里的课程和主题链接，写入课程链接.json。
+
+专区列表由接口按页或按滚动懒加载返回。解析时监听 LEARNING_ZONE_LIST_API_PATTERN 命中的
+列表接口响应，从中提取课程/主题，同时读取已渲染的链接；随后反复滚动到底部并点击课程列表
+所在区域的"下一页"/"加载更多"，等页面接口请求全部返回后检查是否有新的课程，
+直到一轮下来没有新增、或页面跳转到其他地址为止。
+"""
+
 from __future__ import annotations
 
+import asyncio
+import logging
+import re
 from urllib.parse import parse_qs, urlparse
 
 from bs4 import BeautifulSoup
 
 from core.browser import create_browser_context
-from core.config import ZHIXUEYUN_COURSE_PREFIX, ZHIXUEYUN_SUBJECT_PREFIX
+from core.config import (
+    LEARNING_ZONE_LIST_API_PATTERN,
+    ZHIXUEYUN_COURSE_PREFIX,
+    ZHIXUEYUN_SUBJECT_PREFIX,
+)
+from core.diagnostics import trace_slow_page
 from core.file_ops import is_compliant_url_regex, normalize_url
 from core.learning_queue import append_learning_urls
+from core.resource_blocking import block_resources
+from core.spans import span
+
+# 一轮翻页/滚动后，接口请求全部返回且持续这么久没有新请求即视为本轮加载完成
+LEARNING_ZONE_QUIET_SECONDS = 0.5
+# 单轮最长等待，避免页面上的轮询请求让等待无法结束
+LEARNING_ZONE_ROUND_TIMEOUT = 10.0
+# 翻页/滚动的最多轮数
+LEARNING_ZONE_MAX_ROUNDS = 50
+# "下一页"/"加载更多"按钮；只在最后一个课程链接所在的列表区域里查找，
+# 不会点到其他栏目的"查看更多"等跳转链接
+LEARNING_ZONE_NEXT_SELECTORS = (
+    "li.ant-pagination-next:not(.ant-pagination-disabled)",
+    "button.btn-next:not([disabled])",
+)
+LEARNING_ZONE_LOAD_MORE_TEXTS = ("加载更多",)
+
+# 滚动到列表底部，并点击离最后一个课程/主题链接最近的翻页按钮；返回是否点击了按钮
+_LOAD_MORE_SCRIPT = """
+({ selectors, texts }) => {
+    window.scrollTo(0, document.body.scrollHeight);
+    const isLearningLink = (link) =>
+        /study\\/(course|subject)\\/detail|businessId=/.test(link.href);
+    const links = [...document.querySelectorAll("a[href]")].filter(isLearningLink);
+    if (!links.length) {
+        return false;
+    }
+    const lastLink = links[links.length - 1];
+    lastLink.scrollIntoView({ block: "end" });
+
+    const isVisible = (node) => node.getClientRects().length > 0;
+    const navigatesAway = (node) => {
+        const href = node.closest("a[href]")?.getAttribute("href") || "";
+        return href !== "" && href !== "#" && !href.startsWith("javascript:");
+    };
+    const findButton = (container) => {
+        for (const selector of selectors) {
+            const button = container.querySelector(selector);
+            if (button && isVisible(button)) {
+                return button;
+            }
+        }
+        for (const node of container.querySelectorAll("button, a, span, div")) {
+            const text = (node.textContent || "").trim();
+            if (texts.includes(text) && isVisible(node) && !navigatesAway(node)) {
+                return node;
+            }
+        }
+        return null;
+    };
+    for (let container = lastLink.parentElement; container; container = container.parentElement) {
+        const button = findButton(container);
+        if (button) {
+            button.click();
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+_BUSINESS_TYPE_PREFIXES = {
+    "1": ZHIXUEYUN_COURSE_PREFIX,
+    "2": ZHIXUEYUN_SUBJECT_PREFIX,
+}
 
 
 def _unique_urls(urls: list[str]) -> list[str]:
@@ -63,6 +145,197 @@ def extract_learning_links_from_learning_zone_html(html_content: str) -> list[st
     return _unique_urls(links)
 
 
+def extract_learning_links_from_learning_zone_json(data) -> list[str]:
+    """
+    从专区列表接口返回的 JSON 中提取课程/主题链接。
+
+    只读取 JSON 数组里的条目，页面配置、导航等数组之外的字段不读取。与专区页面上的 app 链接一致，
+    businessType 为 1 的 businessId 是课程、为 2 的是主题；条目字符串字段中出现的课程/主题链接
+    也按 _normalize_learning_zone_href 的规则收集。
+    """
+    links: list[str] = []
+    stack = [(data, False)]
+    while stack:
+        item, in_list = stack.pop()
+        if isinstance(item, dict):
+            if in_list:
+                prefix = _BUSINESS_TYPE_PREFIXES.get(str(item.get("businessType")))
+                business_id = item.get("businessId")
+                if prefix and business_id:
+                    url = f"{prefix}{business_id}"
+                    if is_compliant_url_regex(url):
+                        links.append(url)
+            stack.extend((value, in_list) for value in reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend((value, True) for value in reversed(item))
+        elif in_list and isinstance(item, str):
+            normalized = _normalize_learning_zone_href(item)
+            if normalized:
+                links.append(normalized)
+    return _unique_urls(links)
+
+
+def _page_location(url: str) -> str:
+    """去掉查询参数（包括 hash 路由里的）后的页面地址，翻页只改页码参数时地址不变。"""
+    location, _, fragment = (url or "").partition("#")
+    location = location.split("?", 1)[0]
+    fragment = fragment.split("?", 1)[0]
+    return f"{location}#{fragment}" if fragment else location
+
+
+class _LearningZoneCollector:
+    """监听专区页面的接口请求，汇总接口响应和已渲染链接中的课程/主题。"""
+
+    def __init__(self, page, list_api_pattern: str | None = LEARNING_ZONE_LIST_API_PATTERN):
+        self._page = page
+        self._list_api_pattern = re.compile(list_api_pattern) if list_api_pattern else None
+        self.location: str | None = None
+        self.links: list[str] = []
+        self._seen: set[str] = set()
+        self._pending_requests: set = set()
+        self._read_tasks: set[asyncio.Task] = set()
+        self._activity = asyncio.Event()
+
+    def start(self) -> None:
+        self._page.on("request", self._on_request)
+        self._page.on("requestfinished", self._on_request_done)
+        self._page.on("requestfailed", self._on_request_done)
+        self._page.on("response", self._on_response)
+
+    def stop(self) -> None:
+        remove_listener = getattr(self._page, "remove_listener", None)
+        if not callable(remove_listener):
+            return
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+            ("response", self._on_response),
+        ):
+            try:
+                remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def left_page(self) -> bool:
+        """页面是否已跳转到其他地址（如误点了跳转链接）。"""
+        return self.location is not None and _page_location(self._page.url) != self.location
+
+    def add(self, links: list[str]) -> int:
+        added = 0
+        for link in links:
+            if link not in self._seen:
+                self._seen.add(link)
+                self.links.append(link)
+                added += 1
+        return added
+
+    def _on_request(self, request) -> None:
+        if request.resource_type in ("xhr", "fetch"):
+            self._pending_requests.add(request)
+            self._activity.set()
+
+    def _on_request_done(self, request) -> None:
+        if request in self._pending_requests:
+            self._pending_requests.discard(request)
+            self._activity.set()
+
+    def _on_response(self, response) -> None:
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            if self._list_api_pattern and not self._list_api_pattern.search(response.url):
+                return
+        except Exception:
+            return
+        if self.left_page():
+            return
+        task = asyncio.get_running_loop().create_task(self._read_response(response))
+        self._read_tasks.add(task)
+        task.add_done_callback(self._read_tasks.discard)
+
+    async def _read_response(self, response) -> None:
+        try:
+            data = await response.json()
+        except Exception as exc:
+            logging.debug(f"读取学习专区接口响应失败: {exc}")
+            return
+        self.add(extract_learning_links_from_learning_zone_json(data))
+
+    async def wait_until_idle(self) -> None:
+        """等待接口请求全部返回并静默 LEARNING_ZONE_QUIET_SECONDS，最多等待 LEARNING_ZONE_ROUND_TIMEOUT。"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LEARNING_ZONE_ROUND_TIMEOUT
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._activity.clear()
+            timeout = (
+                remaining
+                if self._pending_requests
+                else min(LEARNING_ZONE_QUIET_SECONDS, remaining)
+            )
+            try:
+                await asyncio.wait_for(self._activity.wait(), timeout)
+            except asyncio.TimeoutError:
+                if not self._pending_requests:
+                    break
+        if self._read_tasks:
+            await asyncio.gather(*tuple(self._read_tasks), return_exceptions=True)
+
+    async def add_rendered_links(self) -> None:
+        hrefs = await self._page.eval_on_selector_all(
+            "a[href]",
+            "links => links.map(link => link.href)",
+        )
+        self.add(
+            _unique_urls(
+                [normalized for normalized in map(_normalize_learning_zone_href, hrefs) if normalized]
+            )
+        )
+
+
+async def _load_more_learning_zone_items(page) -> None:
+    try:
+        await page.evaluate(
+            _LOAD_MORE_SCRIPT,
+            {
+                "selectors": list(LEARNING_ZONE_NEXT_SELECTORS),
+                "texts": list(LEARNING_ZONE_LOAD_MORE_TEXTS),
+            },
+        )
+    except Exception as exc:
+        logging.debug(f"学习专区翻页失败: {exc}")
+
+
+async def collect_learning_zone_page_links(page, url: str) -> list[str]:
+    """打开学习专区页面，翻页/滚动直到没有新的课程或主题，返回收集到的学习链接。"""
+    collector = _LearningZoneCollector(page)
+    collector.start()
+    try:
+        with span("goto", url=url):
+            await page.goto(url, wait_until="load")
+        collector.location = _page_location(page.url)
+        await collector.wait_until_idle()
+        await collector.add_rendered_links()
+        for _ in range(LEARNING_ZONE_MAX_ROUNDS):
+            count_before = len(collector.links)
+            await _load_more_learning_zone_items(page)
+            await collector.wait_until_idle()
+            if collector.left_page():
+                logging.warning(f"学习专区翻页后页面跳转到了其他地址, 停止翻页: {page.url}")
+                break
+            await collector.add_rendered_links()
+            if len(collector.links) == count_before:
+                break
+    finally:
+        collector.stop()
+    return collector.links
+
+
 async def collect_learning_links_from_learning_zone_urls(
     learning_zone_urls: list[str],
     status_callback=None,
@@ -71,7 +344,10 @@ async def collect_learning_links_from_learning_zone_urls(
         return 0
 
     total_added = 0
-    async with create_browser_context() as (_, context):
+    async with (
+        create_browser_context() as (_, context),
+        block_resources(context, "学习专区解析"),
+    ):
         for index, url in enumerate(learning_zone_urls, start=1):
             if status_callback:
                 status_callback(
@@ -79,11 +355,8 @@ async def collect_learning_links_from_learning_zone_urls(
                 )
             page = await context.new_page()
             try:
-                await page.goto(url, wait_until="load")
-                await page.wait_for_timeout(1500)
-                learning_links = extract_learning_links_from_learning_zone_html(
-                    await page.content()
-                )
+                async with trace_slow_page(context, url):
+                    learning_links = await collect_learning_zone_page_links(page, url)
                 added = append_learning_urls(learning_links)
                 total_added += len(added)
                 if status_callback:
@@ -2,11 +2,20 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from core.config import MANUAL_EXAM_FILE
 from core.exam_queue import normalize_model_config, unique_model_configs
-from core.file_ops import del_file
+from core.file_ops import atomic_write_text, del_file, locked_file
+from core.queue_db import (
+    MANUAL_EXAM_TABLE,
+    count_queue_rows,
+    is_sqlite_backend,
+    read_queue_rows,
+    replace_queue_rows,
+)
+from core.queue_store import get_active_queue_store, render_queue_json
 
 
 @dataclass(frozen=True)
@@ -102,7 +111,7 @@ def _serialize_entries(entries: list[ManualExamEntry]) -> list[dict[str, object]
     ]
 
 
-def read_manual_exam_queue(file_path: Path = MANUAL_EXAM_FILE) -> list[ManualExamEntry]:
+def _read_manual_exam_queue_json(file_path: Path) -> list[ManualExamEntry]:
     try:
         content = file_path.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
@@ -118,6 +127,48 @@ def read_manual_exam_queue(file_path: Path = MANUAL_EXAM_FILE) -> list[ManualExa
     return _normalize_entries(raw_entries)
 
 
+def _read_manual_exam_queue_file(file_path: Path) -> list[ManualExamEntry]:
+    if is_sqlite_backend():
+        return _normalize_entries(read_queue_rows(MANUAL_EXAM_TABLE, file_path))
+    return _read_manual_exam_queue_json(file_path)
+
+
+def read_manual_exam_queue(
+    file_path: Path = MANUAL_EXAM_FILE,
+    *,
+    refresh: bool = False,
+) -> list[ManualExamEntry]:
+    store = get_active_queue_store()
+    if store is not None:
+        return store.read(file_path, _read_manual_exam_queue_file, refresh=refresh)
+    return _read_manual_exam_queue_file(file_path)
+
+
+def _write_manual_exam_queue_json(
+    entries: list[ManualExamEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    with locked_file(file_path):
+        if not entries and not keep_file:
+            del_file(file_path)
+            return
+        atomic_write_text(file_path, render_queue_json(_serialize_entries(entries)))
+
+
+def _write_manual_exam_queue_file(
+    entries: list[ManualExamEntry],
+    *,
+    file_path: Path,
+    keep_file: bool,
+) -> None:
+    if is_sqlite_backend():
+        replace_queue_rows(MANUAL_EXAM_TABLE, file_path, _serialize_entries(entries))
+        return
+    _write_manual_exam_queue_json(entries, file_path=file_path, keep_file=keep_file)
+
+
 def write_manual_exam_queue(
     entries: list[ManualExamEntry],
     *,
@@ -125,14 +176,16 @@ def write_manual_exam_queue(
     keep_file: bool = True,
 ) -> None:
     normalized = _normalize_entries(_serialize_entries(entries))
-    if not normalized and not keep_file:
-        del_file(file_path)
+    store = get_active_queue_store()
+    if store is not None:
+        store.write(
+            file_path,
+            normalized,
+            partial(_write_manual_exam_queue_file, file_path=file_path, keep_file=keep_file),
+            loader=_read_manual_exam_queue_file,
+        )
         return
-
-    file_path.write_text(
-        json.dumps(_serialize_entries(normalized), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_manual_exam_queue_file(normalized, file_path=file_path, keep_file=keep_file)
 
 
 def append_manual_exam_entry(
@@ -154,25 +207,26 @@ def append_manual_exam_entry(
     if normalized_model_config is not None:
         ai_failed_model_configs.append(normalized_model_config)
 
-    entries = read_manual_exam_queue(file_path=file_path)
-    incoming = ManualExamEntry(
-        url=normalized_url,
-        reason=reason,
-        reason_text=reason_text,
-        remaining_attempts=remaining_attempts,
-        threshold=threshold,
-        ai_failed_model_configs=ai_failed_model_configs,
-    )
-    entries_by_url = {entry.url: entry for entry in entries}
-    existing = entries_by_url.get(normalized_url)
-    if existing is None:
-        entries.append(incoming)
-    else:
-        entries = [
-            _merge_entries(entry, incoming) if entry.url == normalized_url else entry
-            for entry in entries
-        ]
-    write_manual_exam_queue(entries, file_path=file_path)
+    with locked_file(file_path):
+        entries = read_manual_exam_queue(file_path=file_path, refresh=True)
+        incoming = ManualExamEntry(
+            url=normalized_url,
+            reason=reason,
+            reason_text=reason_text,
+            remaining_attempts=remaining_attempts,
+            threshold=threshold,
+            ai_failed_model_configs=ai_failed_model_configs,
+        )
+        entries_by_url = {entry.url: entry for entry in entries}
+        existing = entries_by_url.get(normalized_url)
+        if existing is None:
+            entries.append(incoming)
+        else:
+            entries = [
+                _merge_entries(entry, incoming) if entry.url == normalized_url else entry
+                for entry in entries
+            ]
+        write_manual_exam_queue(entries, file_path=file_path)
 
 
 def read_manual_exam_urls(file_path: Path = MANUAL_EXAM_FILE) -> list[str]:
@@ -180,4 +234,6 @@ def read_manual_exam_urls(file_path: Path = MANUAL_EXAM_FILE) -> list[str]:
 
 
 def count_manual_exam_urls(file_path: Path = MANUAL_EXAM_FILE) -> int:
+    if is_sqlite_backend() and get_active_queue_store() is None:
+        return count_queue_rows(MANUAL_EXAM_TABLE, file_path)
     return len(read_manual_exam_urls(file_path=file_path))
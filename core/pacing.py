@@ -0,0 +1,23 @@
+"""
+挂课流程的按操作节奏控制。
+
+原先挂课浏览器以 slow_mo=3000 启动，每一次 Playwright 调用（包括 count、inner_text、
+get_attribute 这类读取）都会被延迟 3 秒。现在只在打开链接、打开学习标签页、开始播放、
+点击弹窗这些用户可见操作之前按 AFK_PACING 中对应类型的间隔等待，读取操作不再等待。
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from core.config import AFK_PACING
+
+
+async def pace(action: str) -> None:
+    """在指定类型的用户可见操作之前等待配置的间隔。"""
+    try:
+        delay_ms = AFK_PACING[action]
+    except KeyError:
+        raise ValueError(f"未知的挂课操作类型: {action}") from None
+    if delay_ms > 0:
+        await asyncio.sleep(delay_ms / 1000)
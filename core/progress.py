@@ -0,0 +1,107 @@
+"""
+进度事件：挂课、考试和各类等待只发出开始/更新/结束事件，由唯一的监听者（启动器的进度面板）统一显示。
+
+发出事件只是一次函数调用，没有监听者时直接丢弃；显示、刷新频率和控制台占用都由监听者决定，
+多个标签页同时等待时不会各自创建进度条争抢控制台。
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+PROGRESS_START = "start"
+PROGRESS_UPDATE = "update"
+PROGRESS_FINISH = "finish"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    kind: str
+    task_id: int
+    description: str = ""
+    total: float | None = None
+    completed: float | None = None
+    detail: str = ""
+    at: float = 0.0
+
+
+ProgressListener = Callable[[ProgressEvent], None]
+
+_ACTIVE_LISTENER: ProgressListener | None = None
+_TASK_IDS = itertools.count(1)
+
+
+def has_progress_listener() -> bool:
+    return _ACTIVE_LISTENER is not None
+
+
+def emit_progress(event: ProgressEvent) -> None:
+    listener = _ACTIVE_LISTENER
+    if listener is not None:
+        listener(event)
+
+
+@contextmanager
+def use_progress_listener(listener: ProgressListener):
+    """在当前进程内把进度事件交给 listener。"""
+    global _ACTIVE_LISTENER
+
+    previous = _ACTIVE_LISTENER
+    _ACTIVE_LISTENER = listener
+    try:
+        yield listener
+    finally:
+        _ACTIVE_LISTENER = previous
+
+
+class ProgressTask:
+    """一个进行中的任务（课程、考试或等待）；update 只在进度不由耗时推算时需要调用。"""
+
+    def __init__(self, task_id: int):
+        self.task_id = task_id
+
+    def update(
+        self,
+        *,
+        completed: float | None = None,
+        description: str = "",
+        detail: str = "",
+    ) -> None:
+        emit_progress(
+            ProgressEvent(
+                PROGRESS_UPDATE,
+                self.task_id,
+                description=description,
+                completed=completed,
+                detail=detail,
+                at=time.monotonic(),
+            )
+        )
+
+
+@contextmanager
+def progress_task(description: str, *, total: float | None = None, detail: str = ""):
+    """
+    with 块期间显示一行任务进度。
+
+    给出 total（秒）且不调用 update 时，监听者按已耗时推算进度，不需要逐秒发送事件。
+    """
+    task = ProgressTask(next(_TASK_IDS))
+    emit_progress(
+        ProgressEvent(
+            PROGRESS_START,
+            task.task_id,
+            description=description,
+            total=total,
+            detail=detail,
+            at=time.monotonic(),
+        )
+    )
+    try:
+        yield task
+    finally:
+        emit_progress(ProgressEvent(PROGRESS_FINISH, task.task_id, at=time.monotonic()))
@@ -211,6 +211,45 @@ async def _extract_judge_options(locator) -> tuple[list[dict], str | None]:
     return [], None
 
 
+def build_choice_options_from_raw(raw_specs) -> tuple[list[dict], str | None]:
+    """根据页面脚本返回的各选择器原始选项文本构造选项, 命中规则与逐元素提取一致。"""
+    for spec, raw_options in zip(CHOICE_OPTION_SPECS, raw_specs):
+        if not raw_options:
+            continue
+
+        options = []
+        has_text = False
+        for i, raw_option in enumerate(raw_options):
+            label = _normalize_option_label(raw_option.get("label") or "", i)
+            option_text = raw_option.get("text") or _strip_label_prefix(
+                raw_option.get("full") or "",
+                label,
+            )
+            if option_text:
+                has_text = True
+            options.append({"label": label, "text": option_text})
+
+        if has_text:
+            logging.debug(f"选项提取命中选择器: {spec['item_selector']}")
+            return options, spec["click_selector"]
+
+    return [], None
+
+
+def build_judge_options_from_raw(raw_specs) -> tuple[list[dict], str | None]:
+    for spec, raw_texts in zip(JUDGE_OPTION_SPECS, raw_specs):
+        options = [
+            {"label": "T" if "正确" in option_text else "F", "text": option_text}
+            for option_text in raw_texts or []
+            if option_text
+        ]
+        if options:
+            logging.debug(f"判断题选项提取命中选择器: {spec['item_selector']}")
+            return options, spec["click_selector"]
+
+    return [], None
+
+
 def parse_question_type(type_text: str) -> str:
     """根据题型文本解析题目类型"""
     for keyword, qtype in QUESTION_TYPE_MAP.items():
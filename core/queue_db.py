@@ -0,0 +1,222 @@
+"""
+队列的 SQLite 存储后端。
+
+设置 QUEUE_BACKEND=sqlite 后，课程链接、挂课失败、考试链接和人工考试四个队列
+改为保存在队列文件所在目录下的 queue_state.sqlite3 中，每个队列一张表，
+按队列文件名区分，url 和 reason 均建有索引，数量统计直接使用 COUNT 查询。
+各队列模块的读写接口保持不变。
+
+已有 JSON 队列可以导入数据库，也可以从数据库导出回 JSON：
+
+    python -m core.queue_db import
+    python -m core.queue_db export
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from contextlib import closing
+from pathlib import Path
+
+from core.config import QUEUE_BACKEND, QUEUE_DB_FILENAME
+
+LEARNING_URLS_TABLE = "learning_urls"
+LEARNING_FAILURES_TABLE = "learning_failures"
+EXAM_URLS_TABLE = "exam_urls"
+MANUAL_EXAM_TABLE = "manual_exams"
+QUEUE_TABLES = (
+    LEARNING_URLS_TABLE,
+    LEARNING_FAILURES_TABLE,
+    EXAM_URLS_TABLE,
+    MANUAL_EXAM_TABLE,
+)
+
+
+def is_sqlite_backend() -> bool:
+    return QUEUE_BACKEND == "sqlite"
+
+
+def queue_db_path(file_path) -> Path:
+    return Path(file_path).parent / QUEUE_DB_FILENAME
+
+
+def _check_table(table: str) -> str:
+    if table not in QUEUE_TABLES:
+        raise ValueError(f"未知队列表: {table}")
+    return table
+
+
+def _connect(file_path) -> sqlite3.Connection:
+    connection = sqlite3.connect(queue_db_path(file_path), timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    for table in QUEUE_TABLES:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "queue_file TEXT NOT NULL, "
+            "position INTEGER NOT NULL, "
+            "url TEXT NOT NULL, "
+            "reason TEXT, "
+            "payload TEXT NOT NULL, "
+            "PRIMARY KEY (queue_file, url))"
+        )
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_url ON {table}(url)")
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_reason ON {table}(queue_file, reason)"
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_position ON {table}(queue_file, position)"
+        )
+    connection.commit()
+    return connection
+
+
+def read_queue_rows(table: str, file_path) -> list[dict[str, object]]:
+    """按写入顺序返回队列条目的原始字典，格式与 JSON 文件中的元素相同。"""
+    table = _check_table(table)
+    if not queue_db_path(file_path).exists():
+        return []
+    with closing(_connect(file_path)) as connection:
+        rows = connection.execute(
+            f"SELECT payload FROM {table} WHERE queue_file = ? ORDER BY position",
+            (Path(file_path).name,),
+        ).fetchall()
+    return [json.loads(payload) for (payload,) in rows]
+
+
+def replace_queue_rows(table: str, file_path, rows: list[dict[str, object]]) -> None:
+    """在一个事务内用 rows 替换该队列的全部条目。"""
+    table = _check_table(table)
+    queue_file = Path(file_path).name
+    with closing(_connect(file_path)) as connection:
+        with connection:
+            connection.execute(f"DELETE FROM {table} WHERE queue_file = ?", (queue_file,))
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {table}(queue_file, position, url, reason, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        queue_file,
+                        position,
+                        str(row.get("url", "")),
+                        row.get("reason"),
+                        json.dumps(row, ensure_ascii=False),
+                    )
+                    for position, row in enumerate(rows)
+                ],
+            )
+
+
+def count_queue_rows(table: str, file_path) -> int:
+    table = _check_table(table)
+    if not queue_db_path(file_path).exists():
+        return 0
+    with closing(_connect(file_path)) as connection:
+        (count,) = connection.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE queue_file = ?",
+            (Path(file_path).name,),
+        ).fetchone()
+    return int(count)
+
+
+def _queue_specs():
+    from core import exam_queue, learning_queue, manual_exam_queue
+    from core.config import (
+        EXAM_URLS_FILE,
+        LEARNING_FAILURES_FILE,
+        LEARNING_URLS_FILE,
+        MANUAL_EXAM_FILE,
+    )
+
+    return [
+        (
+            LEARNING_URLS_FILE,
+            LEARNING_URLS_TABLE,
+            learning_queue._read_learning_queue_json,
+            learning_queue._write_learning_queue_json,
+            learning_queue._normalize_queue_entries,
+            learning_queue._serialize_queue_entries,
+        ),
+        (
+            LEARNING_FAILURES_FILE,
+            LEARNING_FAILURES_TABLE,
+            learning_queue._read_learning_failures_json,
+            learning_queue._write_learning_failures_json,
+            learning_queue._normalize_failure_entries,
+            learning_queue._serialize_failure_entries,
+        ),
+        (
+            EXAM_URLS_FILE,
+            EXAM_URLS_TABLE,
+            exam_queue._read_exam_queue_json,
+            exam_queue._write_exam_queue_json,
+            exam_queue._normalize_entries,
+            exam_queue._serialize_entries,
+        ),
+        (
+            MANUAL_EXAM_FILE,
+            MANUAL_EXAM_TABLE,
+            manual_exam_queue._read_manual_exam_queue_json,
+            manual_exam_queue._write_manual_exam_queue_json,
+            manual_exam_queue._normalize_entries,
+            manual_exam_queue._serialize_entries,
+        ),
+    ]
+
+
+def import_json_queues(queue_dir: Path | None = None) -> dict[str, int]:
+    """把四个 JSON 队列文件导入数据库，覆盖数据库中同名队列。返回各文件导入条数。"""
+    results: dict[str, int] = {}
+    for file_path, table, read_json, _, _, serialize in _queue_specs():
+        if queue_dir is not None:
+            file_path = Path(queue_dir) / file_path.name
+        if not file_path.exists():
+            continue
+        entries = read_json(file_path)
+        replace_queue_rows(table, file_path, serialize(entries))
+        results[file_path.name] = len(entries)
+    return results
+
+
+def export_json_queues(queue_dir: Path | None = None) -> dict[str, int]:
+    """把数据库中的四个队列导出为 JSON 队列文件。返回各文件导出条数。"""
+    results: dict[str, int] = {}
+    for file_path, table, _, write_json, normalize, _ in _queue_specs():
+        if queue_dir is not None:
+            file_path = Path(queue_dir) / file_path.name
+        if not queue_db_path(file_path).exists():
+            continue
+        entries = normalize(read_queue_rows(table, file_path))
+        write_json(entries, file_path=file_path, keep_file=bool(entries) or file_path.exists())
+        results[file_path.name] = len(entries)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.queue_db",
+        description="在 JSON 队列文件和 queue_state.sqlite3 之间导入/导出队列",
+    )
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("--dir", type=Path, default=None, help="队列文件所在目录，默认项目根目录")
+    args = parser.parse_args(argv)
+
+    if args.action == "import":
+        results = import_json_queues(args.dir)
+        verb = "导入"
+    else:
+        results = export_json_queues(args.dir)
+        verb = "导出"
+
+    if not results:
+        print(f"没有可{verb}的队列")
+        return 0
+    for name, count in results.items():
+        print(f"已{verb} {name}: {count} 条")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
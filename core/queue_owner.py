@@ -0,0 +1,37 @@
+"""
+多进程挂课时把队列写操作转交给唯一的队列所有者。
+
+挂课工作进程内启用转发后，记录/移除挂课失败链接、追加考试链接等写操作不再直接读写
+队列文件，而是把函数名和参数交给 send 发回协调进程，由协调进程统一写入，
+避免多个进程同时改写同一个队列文件。
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable
+
+QueueCall = tuple[str, dict[str, object]]
+
+_ACTIVE_FORWARDER: "Callable[[QueueCall], None] | None" = None
+
+
+def forward_queue_call(name: str, **kwargs) -> bool:
+    """启用转发时把写操作交给队列所有者并返回 True，否则返回 False 由调用方直接写入。"""
+    if _ACTIVE_FORWARDER is None:
+        return False
+    _ACTIVE_FORWARDER((name, kwargs))
+    return True
+
+
+@contextmanager
+def forward_queue_calls(send: Callable[[QueueCall], None]):
+    """在当前进程内把队列写操作转交给 send。"""
+    global _ACTIVE_FORWARDER
+
+    previous = _ACTIVE_FORWARDER
+    _ACTIVE_FORWARDER = send
+    try:
+        yield
+    finally:
+        _ACTIVE_FORWARDER = previous
@@ -0,0 +1,291 @@
+"""
+队列文件的内存快照与后台写回。
+
+运行期间四个队列文件（课程链接、挂课失败、考试链接、人工考试）各只从磁盘读取一次，
+之后的追加/修改都在内存中完成，由后台线程按防抖间隔把最新快照原子写回磁盘。
+写回内容与直接写文件完全一致，流程结束时会同步写回全部未落盘的变更。
+
+其他进程（如分片 worker）可能同时修改同一个队列文件。加锁的读-改-写通过
+read(..., refresh=True) 先把磁盘上的新变更合并进快照；后台写回同样在文件锁内进行，
+写回前按 url 与磁盘内容三方合并，不会覆盖掉其他进程的追加或删除。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from core.config import QUEUE_FLUSH_DELAY, QUEUE_FLUSH_MAX_DELAY
+from core.file_ops import locked_file
+from core.queue_db import is_sqlite_backend, queue_db_path
+
+
+_ACTIVE_QUEUE_STORE: "QueueStore | None" = None
+
+
+def render_queue_json(data: list[dict[str, object]]) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _store_key(file_path) -> Path:
+    return Path(file_path).resolve()
+
+
+def _disk_signature(file_path: Path) -> tuple:
+    """队列在磁盘上的状态标识（修改时间、大小、inode），用于判断其他进程是否写过。"""
+    if is_sqlite_backend():
+        db_path = queue_db_path(file_path)
+        paths = [db_path, db_path.with_name(f"{db_path.name}-wal")]
+    else:
+        paths = [file_path]
+
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(signature)
+
+
+def _merge_entries(base, ours, theirs) -> tuple:
+    """
+    按 url 三方合并：base 是上次读到或写入磁盘的条目，ours 是内存快照，theirs 是磁盘当前条目。
+
+    本进程改过的条目以 ours 为准；本进程没动过的条目跟随磁盘上的修改或删除；
+    其他进程新增的条目追加在末尾。
+    """
+    base_by_url = {entry.url: entry for entry in base}
+    ours_urls = {entry.url for entry in ours}
+    theirs_by_url = {entry.url: entry for entry in theirs}
+
+    merged = []
+    for entry in ours:
+        if base_by_url.get(entry.url) == entry:
+            if entry.url in theirs_by_url:
+                merged.append(theirs_by_url[entry.url])
+            continue
+        merged.append(entry)
+    merged.extend(
+        entry
+        for entry in theirs
+        if entry.url not in ours_urls and entry.url not in base_by_url
+    )
+    return tuple(merged)
+
+
+class QueueStore:
+    """按文件路径缓存已规范化的队列条目（需要有 url 属性），变更后由后台线程防抖写回。"""
+
+    def __init__(
+        self,
+        *,
+        flush_delay: float = QUEUE_FLUSH_DELAY,
+        max_flush_delay: float = QUEUE_FLUSH_MAX_DELAY,
+    ):
+        self.flush_delay = max(0.0, flush_delay)
+        self.max_flush_delay = max(self.flush_delay, max_flush_delay)
+        self._condition = threading.Condition(threading.RLock())
+        self._write_lock = threading.Lock()
+        self._entries: dict[Path, tuple] = {}
+        self._base: dict[Path, tuple] = {}
+        self._signatures: dict[Path, tuple] = {}
+        self._loaders: dict[Path, Callable[[Path], list]] = {}
+        self._pending: dict[Path, Callable[[list], None]] = {}
+        self._versions: dict[Path, int] = {}
+        self._first_dirty_at: float | None = None
+        self._deadline: float | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.flush_count = 0
+
+    def read(
+        self,
+        file_path,
+        loader: Callable[[Path], list],
+        *,
+        refresh: bool = False,
+    ) -> list:
+        """
+        返回队列条目副本；首次访问某个文件时通过 loader 从磁盘读取。
+
+        refresh=True 时（调用方应持有 locked_file），若其他进程改过磁盘上的队列，
+        先把这些变更合并进内存快照再返回。
+        """
+        key = _store_key(file_path)
+        with self._condition:
+            self._loaders[key] = loader
+            entries = self._entries.get(key)
+            if entries is None:
+                self._load_locked(key, loader)
+            elif refresh and _disk_signature(key) != self._signatures.get(key):
+                self._refresh_locked(key, loader)
+            return list(self._entries[key])
+
+    def _load_locked(self, key: Path, loader: Callable[[Path], list]) -> None:
+        signature = _disk_signature(key)
+        entries = tuple(loader(key))
+        self._entries[key] = entries
+        self._base[key] = entries
+        self._signatures[key] = signature
+
+    def _refresh_locked(self, key: Path, loader: Callable[[Path], list]) -> None:
+        signature = _disk_signature(key)
+        on_disk = tuple(loader(key))
+        # 没有读过就整体写入的快照以内存为准，只补上磁盘上新出现的条目
+        base = self._base.get(key, on_disk)
+        self._entries[key] = _merge_entries(base, self._entries[key], on_disk)
+        self._base[key] = on_disk
+        self._signatures[key] = signature
+
+    def write(
+        self,
+        file_path,
+        entries: list,
+        persist: Callable[[list], None],
+        *,
+        loader: Callable[[Path], list] | None = None,
+    ) -> None:
+        """替换内存中的队列条目，并安排由 persist 在后台写回；loader 用于写回前与磁盘合并。"""
+        key = _store_key(file_path)
+        snapshot = tuple(entries)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("队列存储已关闭")
+            if loader is not None:
+                self._loaders[key] = loader
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries[key] = snapshot
+            self._pending[key] = persist
+            self._schedule_flush_locked()
+
+    def _schedule_flush_locked(self) -> None:
+        now = time.monotonic()
+        if self._first_dirty_at is None:
+            self._first_dirty_at = now
+        self._deadline = min(
+            now + self.flush_delay,
+            self._first_dirty_at + self.max_flush_delay,
+        )
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run_flush_loop,
+                name="queue-store-flush",
+                daemon=True,
+            )
+            self._thread.start()
+        self._condition.notify_all()
+
+    def _run_flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._deadline is None:
+                        self._condition.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> None:
+        """立即把所有未写回的快照写入磁盘。"""
+        with self._write_lock:
+            with self._condition:
+                keys = list(self._pending)
+                self._first_dirty_at = None
+                self._deadline = None
+            if not keys:
+                return
+
+            failed = False
+            for key in keys:
+                try:
+                    self._flush_key(key)
+                except Exception as exc:
+                    logging.error(f"写回队列文件失败: {key}, {exc}")
+                    failed = True
+            self.flush_count += 1
+
+            if failed:
+                with self._condition:
+                    if not self._closed:
+                        self._schedule_flush_locked()
+
+    def _flush_key(self, key: Path) -> None:
+        # 与各队列模块的读-改-写使用同一把文件锁，写回期间其他进程不会插入修改
+        with locked_file(key):
+            with self._condition:
+                persist = self._pending.pop(key, None)
+                if persist is None:
+                    return
+                snapshot = self._entries[key]
+                version = self._versions.get(key, 0)
+                base = self._base.get(key)
+                loader = self._loaders.get(key)
+
+            written = snapshot
+            try:
+                if (
+                    base is not None
+                    and loader is not None
+                    and _disk_signature(key) != self._signatures.get(key)
+                ):
+                    written = _merge_entries(base, snapshot, tuple(loader(key)))
+                persist(list(written))
+            except Exception:
+                with self._condition:
+                    self._pending.setdefault(key, persist)
+                raise
+
+            with self._condition:
+                if self._versions.get(key, 0) == version:
+                    self._entries[key] = written
+                else:
+                    # 写回期间又有未加锁的写入，把刚合并进来的磁盘变更补到最新快照上
+                    self._entries[key] = _merge_entries(snapshot, self._entries[key], written)
+                self._base[key] = written
+                self._signatures[key] = _disk_signature(key)
+
+    def close(self) -> None:
+        """停止后台线程并同步写回剩余变更。"""
+        with self._condition:
+            self._closed = True
+            thread = self._thread
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+
+def get_active_queue_store() -> QueueStore | None:
+    return _ACTIVE_QUEUE_STORE
+
+
+@contextmanager
+def use_queue_store(store: QueueStore | None = None):
+    """在当前流程内启用队列内存快照；已有启用中的存储时直接复用。"""
+    global _ACTIVE_QUEUE_STORE
+
+    if _ACTIVE_QUEUE_STORE is not None:
+        yield _ACTIVE_QUEUE_STORE
+        return
+
+    store = store or QueueStore()
+    _ACTIVE_QUEUE_STORE = store
+    try:
+        yield store
+    finally:
+        _ACTIVE_QUEUE_STORE = None
+        store.close()
@@ -0,0 +1,254 @@
+"""
+页面就绪判断。
+
+用「页面已经可以操作」的具体条件（题干已变化、章节列表已渲染等）代替
+networkidle 和固定时长等待，条件满足即返回；超时后只记录日志并按原流程继续，
+不会因为判断失败中断考试或挂课。
+
+每次等待都会和被替换掉的固定等待时长对比，按考试/课程汇总节省的时间。
+networkidle 至少需要 500 毫秒无网络请求，因此按 500 毫秒计入对比基线，
+实际节省的时间通常比报告值更多。
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from core.config import PAGE_READY_TIMEOUT
+from core.spans import record_span
+
+NETWORK_IDLE_BASELINE_MS = 500
+
+EXAM_QUESTION_SELECTOR = ".question-type-item, .single-title, .single-btns"
+EXAM_NOTICE_SELECTOR = ".dialog.animated"
+SINGLE_QUESTION_STEM_SELECTOR = ".single-title .rich-text-style"
+SUBJECT_SECTION_SELECTOR = ".item.current-hover .section-type"
+COURSE_PAGE_SELECTOR = ".top"
+COURSE_EXAM_TAB_CONTENT_SELECTOR = (
+    ".tab-container .neer-status, .tab-container table.table, .btn.new-radius"
+)
+_NO_PERMISSION_TEXTS = ("您没有权限查看该资源", "该资源已不存在", "该资源已下架")
+
+_QUESTION_CHANGED_SCRIPT = """
+([selector, previousText]) => {
+  const stem = document.querySelector(selector);
+  const text = stem ? stem.innerText.trim() : "";
+  return text !== "" && text !== previousText;
+}
+"""
+
+_SUBJECT_READY_SCRIPT = """
+([selector, blockedTexts]) => {
+  if (document.querySelector(selector)) {
+    return true;
+  }
+  const bodyText = document.body ? document.body.innerText : "";
+  return blockedTexts.some((text) => bodyText.includes(text));
+}
+"""
+
+@dataclass
+class ReadinessReport:
+    label: str
+    waits: int = 0
+    timeouts: int = 0
+    waited_seconds: float = 0.0
+    baseline_seconds: float = 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        return max(0.0, self.baseline_seconds - self.waited_seconds)
+
+    def record(self, *, waited_seconds: float, baseline_seconds: float, ready: bool) -> None:
+        self.waits += 1
+        if not ready:
+            self.timeouts += 1
+        self.waited_seconds += waited_seconds
+        self.baseline_seconds += baseline_seconds
+
+    def summary(self) -> str:
+        text = (
+            f"{self.label}页面就绪等待 {self.waits} 次, 共 {self.waited_seconds:.1f} 秒, "
+            f"较固定等待节省约 {self.saved_seconds:.1f} 秒"
+        )
+        if self.timeouts:
+            text += f" (其中 {self.timeouts} 次超时后继续)"
+        return text
+
+
+_ACTIVE_REPORT: ContextVar[ReadinessReport | None] = ContextVar(
+    "readiness_report",
+    default=None,
+)
+
+
+def get_active_readiness_report() -> ReadinessReport | None:
+    return _ACTIVE_REPORT.get()
+
+
+@contextmanager
+def track_readiness(label: str):
+    """汇总当前考试/课程内的页面就绪等待，结束时输出节省时间。"""
+    report = ReadinessReport(label)
+    token = _ACTIVE_REPORT.set(report)
+    try:
+        yield report
+    finally:
+        _ACTIVE_REPORT.reset(token)
+        if report.waits:
+            logging.info(report.summary())
+
+
+def _timeout_ms(timeout_ms: int | None) -> int:
+    return PAGE_READY_TIMEOUT * 1000 if timeout_ms is None else timeout_ms
+
+
+async def wait_until_ready(
+    description: str,
+    check: Callable[[int], Awaitable[object]],
+    *,
+    baseline_ms: int,
+    timeout_ms: int | None = None,
+) -> bool:
+    """
+    执行就绪判断并记录耗时。
+
+    Args:
+        check: 接收超时毫秒数的等待函数，条件满足时返回
+        baseline_ms: 被替换掉的固定等待时长，用于统计节省的时间
+    """
+    started_at = time.monotonic()
+    try:
+        await check(_timeout_ms(timeout_ms))
+        ready = True
+    except Exception as exc:
+        logging.debug(f"等待{description}未完成, 按原流程继续: {exc}")
+        ready = False
+
+    waited_seconds = time.monotonic() - started_at
+    report = get_active_readiness_report()
+    if report is not None:
+        report.record(
+            waited_seconds=waited_seconds,
+            baseline_seconds=baseline_ms / 1000,
+            ready=ready,
+        )
+    record_span(
+        "readiness",
+        waited_seconds,
+        kind="ready_wait",
+        ok=ready,
+        description=description,
+    )
+    logging.debug(f"{description}就绪等待 {waited_seconds:.2f} 秒")
+    return ready
+
+
+async def wait_for_visible(
+    page,
+    selector: str,
+    *,
+    description: str,
+    baseline_ms: int,
+    timeout_ms: int | None = None,
+) -> bool:
+    return await wait_until_ready(
+        description,
+        lambda timeout: page.locator(selector).first.wait_for(
+            state="visible",
+            timeout=timeout,
+        ),
+        baseline_ms=baseline_ms,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def wait_for_condition(
+    page,
+    script: str,
+    arg,
+    *,
+    description: str,
+    baseline_ms: int,
+    timeout_ms: int | None = None,
+) -> bool:
+    return await wait_until_ready(
+        description,
+        lambda timeout: page.wait_for_function(
+            script,
+            arg=arg,
+            timeout=timeout,
+            polling=100,
+        ),
+        baseline_ms=baseline_ms,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def wait_for_exam_page_ready(page) -> bool:
+    """考试页：题目区域或考试提示弹窗已出现。"""
+    return await wait_for_visible(
+        page,
+        f"{EXAM_QUESTION_SELECTOR}, {EXAM_NOTICE_SELECTOR}",
+        description="考试页面",
+        baseline_ms=NETWORK_IDLE_BASELINE_MS + 1000,
+    )
+
+
+async def wait_for_exam_questions_ready(page) -> bool:
+    """多题目试卷：题目列表已渲染。"""
+    return await wait_for_visible(
+        page,
+        ".question-type-item",
+        description="试卷题目",
+        baseline_ms=NETWORK_IDLE_BASELINE_MS + 1000,
+    )
+
+
+async def wait_for_question_changed(page, previous_text: str) -> bool:
+    """单题目模式：点击下一题后题干已切换为新题目。"""
+    return await wait_for_condition(
+        page,
+        _QUESTION_CHANGED_SCRIPT,
+        [SINGLE_QUESTION_STEM_SELECTOR, str(previous_text or "").strip()],
+        description="下一题题干",
+        baseline_ms=1000 + NETWORK_IDLE_BASELINE_MS + 1000,
+    )
+
+
+async def wait_for_subject_page_ready(page) -> bool:
+    """主题页：学习项列表已渲染，或页面已提示无权限/资源下架。"""
+    return await wait_for_condition(
+        page,
+        _SUBJECT_READY_SCRIPT,
+        [SUBJECT_SECTION_SELECTOR, list(_NO_PERMISSION_TEXTS)],
+        description="主题学习列表",
+        baseline_ms=NETWORK_IDLE_BASELINE_MS,
+    )
+
+
+async def wait_for_course_exam_tab_ready(page, *, timeout_ms: int | None = None) -> bool:
+    """课程考试页签：考试状态、考试记录或开始考试按钮已渲染。"""
+    return await wait_for_visible(
+        page,
+        COURSE_EXAM_TAB_CONTENT_SELECTOR,
+        description="课程考试页签",
+        baseline_ms=1000,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def wait_for_course_page_ready(page) -> bool:
+    """课程详情页：章节目录入口已渲染。"""
+    return await wait_for_visible(
+        page,
+        COURSE_PAGE_SELECTOR,
+        description="课程详情页",
+        baseline_ms=1500,
+    )
+
@@ -0,0 +1,182 @@
+"""
+按页面类型拦截网络资源。
+
+开启 RESOURCE_BLOCKING 后，挂课、AI 考试和学习专区解析期间在浏览器上下文上注册
+context.route，按请求所属页面的类型（课程、主题、考试、学习专区）拦截
+RESOURCE_BLOCKING_PROFILES 中列出的资源类型，并拦截所有页面上的统计/埋点脚本。
+课程页默认放行媒体资源，视频章节照常播放。流程结束时移除拦截，并按页面类型输出
+拦截的请求数和页面加载耗时。
+
+统计只记请求数，不记字节数：被拦截的请求在发出前就被中止，没有响应，也就拿不到
+Content-Length。节省的下载字节数需要用 benchmarks.resource_blocking 对比拦截前后实测。
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+
+from core.config import (
+    RESOURCE_BLOCK_URL_PATTERN,
+    RESOURCE_BLOCKING,
+    RESOURCE_BLOCKING_PROFILES,
+    ZHIXUEYUN_COURSE_PREFIX,
+    ZHIXUEYUN_SUBJECT_PREFIX,
+)
+from core.links import is_learning_zone_url
+
+PAGE_TYPE_LABELS = {
+    "course": "课程页",
+    "subject": "主题页",
+    "exam": "考试页",
+    "learning_zone": "学习专区",
+    "other": "其他页面",
+}
+_EXAM_URL_PATTERN = re.compile(r"#/exam/", re.IGNORECASE)
+
+
+def classify_page_url(url: str) -> str:
+    url = url or ""
+    if url.startswith(ZHIXUEYUN_COURSE_PREFIX):
+        return "course"
+    if url.startswith(ZHIXUEYUN_SUBJECT_PREFIX):
+        return "subject"
+    if _EXAM_URL_PATTERN.search(url):
+        return "exam"
+    if is_learning_zone_url(url):
+        return "learning_zone"
+    return "other"
+
+
+def _request_page(request):
+    try:
+        return request.frame.page
+    except Exception:
+        return None
+
+
+class ResourceBlockingStats:
+    """按页面类型统计拦截的请求数和页面加载耗时。"""
+
+    def __init__(self):
+        self.blocked: dict[str, Counter] = defaultdict(Counter)
+        self.load_seconds: dict[str, list[float]] = defaultdict(list)
+        self._navigation_started: dict[int, float] = {}
+
+    def record_blocked(self, page_type: str, resource_type: str) -> None:
+        self.blocked[page_type][resource_type] += 1
+
+    def record_navigation_start(self, page) -> None:
+        self._navigation_started[id(page)] = time.perf_counter()
+
+    def record_load(self, page) -> None:
+        started_at = self._navigation_started.pop(id(page), None)
+        if started_at is None:
+            return
+        page_type = classify_page_url(getattr(page, "url", ""))
+        self.load_seconds[page_type].append(time.perf_counter() - started_at)
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        for page_type, label in PAGE_TYPE_LABELS.items():
+            blocked = self.blocked.get(page_type)
+            load_seconds = self.load_seconds.get(page_type)
+            if not blocked and not load_seconds:
+                continue
+            parts = [f"{label}: 拦截 {sum(blocked.values()) if blocked else 0} 个请求"]
+            if blocked:
+                details = ", ".join(
+                    f"{resource_type} {count}"
+                    for resource_type, count in blocked.most_common()
+                )
+                parts.append(f"({details})")
+            if load_seconds:
+                parts.append(
+                    f", 加载 {len(load_seconds)} 次, 平均 {sum(load_seconds) / len(load_seconds):.2f} 秒"
+                )
+            lines.append("".join(parts))
+        return lines
+
+
+def should_block_request(
+    page_type: str,
+    resource_type: str,
+    url: str,
+    *,
+    url_pattern: re.Pattern | None,
+) -> bool:
+    if resource_type == "document":
+        return False
+    if url_pattern is not None and url_pattern.search(url or ""):
+        return True
+    return resource_type in RESOURCE_BLOCKING_PROFILES.get(page_type, ())
+
+
+def build_route_handler(stats: ResourceBlockingStats):
+    url_pattern = re.compile(RESOURCE_BLOCK_URL_PATTERN) if RESOURCE_BLOCK_URL_PATTERN else None
+
+    async def handle_route(route):
+        request = route.request
+        page = _request_page(request)
+        resource_type = request.resource_type
+        if resource_type == "document" and page is not None:
+            try:
+                if request.is_navigation_request() and request.frame == page.main_frame:
+                    stats.record_navigation_start(page)
+            except Exception:
+                pass
+
+        page_type = classify_page_url(getattr(page, "url", "") if page is not None else "")
+        if should_block_request(page_type, resource_type, request.url, url_pattern=url_pattern):
+            stats.record_blocked(page_type, resource_type)
+            await route.abort("blockedbyclient")
+            return
+        await route.fallback()
+
+    return handle_route
+
+
+def _remove_listener_quietly(target, event: str, listener) -> None:
+    try:
+        target.remove_listener(event, listener)
+    except Exception:
+        pass
+
+
+@asynccontextmanager
+async def block_resources(context, label: str):
+    """在当前流程内按页面类型拦截资源；RESOURCE_BLOCKING 关闭时不做任何处理。"""
+    if not RESOURCE_BLOCKING:
+        yield None
+        return
+
+    stats = ResourceBlockingStats()
+    handler = build_route_handler(stats)
+    watched_pages = []
+
+    def on_page(page):
+        page.on("load", stats.record_load)
+        watched_pages.append(page)
+
+    await context.route("**/*", handler)
+    context.on("page", on_page)
+    for page in list(getattr(context, "pages", []) or []):
+        on_page(page)
+    try:
+        yield stats
+    finally:
+        _remove_listener_quietly(context, "page", on_page)
+        for page in watched_pages:
+            _remove_listener_quietly(page, "load", stats.record_load)
+        try:
+            await context.unroute("**/*", handler)
+        except Exception:
+            pass
+        lines = stats.summary_lines()
+        if lines:
+            logging.info(f"{label}资源拦截统计:")
+            for line in lines:
+                logging.info(f"  {line}")
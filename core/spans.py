@@ -0,0 +1,207 @@
+"""
+按阶段记录耗时区间（span），写入 JSONL 运行追踪文件。
+
+每个 span 一行，包含阶段名、类型、开始时间、耗时、是否成功和少量上下文（链接、章节类型等）。
+类型用于区分时间花在哪里：
+    work        实际操作：打开页面、请求 AI 答案、选择答案、交卷
+    ready_wait  条件等待：页面就绪判断，条件满足即返回
+    fixed_wait  固定等待：视频按时长学习、等待服务器同步进度
+    stage       外层阶段（如课程章节），包含其他 span，不参与占比统计
+启动器的「查看耗时统计」读取追踪文件，按阶段汇总 p50/p95，并计算三类时间的占比。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from core.config import RUN_TRACE_ENABLED, RUN_TRACE_FILE, RUN_TRACE_MAX_BYTES
+
+SPAN_KINDS = ("work", "ready_wait", "fixed_wait", "stage")
+
+STAGE_LABELS = {
+    "goto": "打开页面",
+    "readiness": "页面就绪等待",
+    "chapter": "课程章节",
+    "video_wait": "视频学习等待",
+    "video_sync_wait": "视频进度同步等待",
+    "ai_answer": "AI 作答",
+    "select_answers": "选择答案",
+    "submit_exam": "交卷",
+}
+
+RUN_ID = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+
+_WRITE_LOCK = threading.Lock()
+_ROTATED_FILES: set[Path] = set()
+
+
+def _rotate_if_needed(file_path: Path) -> None:
+    if file_path in _ROTATED_FILES:
+        return
+    _ROTATED_FILES.add(file_path)
+    try:
+        if file_path.stat().st_size > RUN_TRACE_MAX_BYTES:
+            os.replace(file_path, file_path.with_name(file_path.name + ".1"))
+    except FileNotFoundError:
+        pass
+
+
+def record_span(
+    stage: str,
+    seconds: float,
+    *,
+    kind: str = "work",
+    ok: bool = True,
+    started_at: float | None = None,
+    file_path: Path | None = None,
+    **detail,
+) -> None:
+    """追加一条 span；写入失败只记 DEBUG 日志，不影响挂课和考试流程。"""
+    if not RUN_TRACE_ENABLED:
+        return
+    if file_path is None:
+        file_path = RUN_TRACE_FILE
+    record = {
+        "run": RUN_ID,
+        "stage": stage,
+        "kind": kind,
+        "start": round(started_at if started_at is not None else time.time() - seconds, 3),
+        "seconds": round(seconds, 4),
+        "ok": ok,
+    }
+    if detail:
+        record["detail"] = detail
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _WRITE_LOCK:
+            _rotate_if_needed(Path(file_path))
+            with open(file_path, "a", encoding="utf-8") as file:
+                file.write(line)
+    except OSError as exc:
+        logging.debug(f"写入运行追踪失败: {exc}")
+
+
+@dataclass
+class SpanState:
+    ok: bool = True
+
+
+@contextmanager
+def span(stage: str, *, kind: str = "work", **detail):
+    """
+    记录 with 块的耗时；块内抛出异常时记为失败并继续抛出。
+
+    块内捕获了异常、但仍需记为失败时，把 as 得到的 SpanState.ok 设为 False。
+    """
+    started_at = time.time()
+    started = time.perf_counter()
+    state = SpanState()
+    try:
+        yield state
+    except BaseException:
+        state.ok = False
+        raise
+    finally:
+        record_span(
+            stage,
+            time.perf_counter() - started,
+            kind=kind,
+            ok=state.ok,
+            started_at=started_at,
+            **detail,
+        )
+
+
+def read_spans(file_path: Path | None = None) -> list[dict]:
+    if file_path is None:
+        file_path = RUN_TRACE_FILE
+    spans = []
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "stage" in record and "seconds" in record:
+                    spans.append(record)
+    except FileNotFoundError:
+        return []
+    return spans
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """最近秩法百分位数。"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class StageSummary:
+    stage: str
+    count: int
+    p50: float
+    p95: float
+    total: float
+    failures: int
+
+    @property
+    def label(self) -> str:
+        return STAGE_LABELS.get(self.stage, self.stage)
+
+
+@dataclass
+class TraceSummary:
+    stages: list[StageSummary]
+    seconds_by_kind: dict[str, float]
+    runs: int
+
+    def share(self, kind: str) -> float:
+        total = sum(
+            seconds for span_kind, seconds in self.seconds_by_kind.items() if span_kind != "stage"
+        )
+        return self.seconds_by_kind.get(kind, 0.0) / total if total else 0.0
+
+
+def summarize_spans(spans: list[dict]) -> TraceSummary:
+    durations: dict[str, list[float]] = {}
+    failures: dict[str, int] = {}
+    seconds_by_kind = {kind: 0.0 for kind in SPAN_KINDS}
+    for record in spans:
+        stage = str(record["stage"])
+        seconds = float(record["seconds"])
+        durations.setdefault(stage, []).append(seconds)
+        if not record.get("ok", True):
+            failures[stage] = failures.get(stage, 0) + 1
+        kind = record.get("kind", "work")
+        seconds_by_kind[kind] = seconds_by_kind.get(kind, 0.0) + seconds
+
+    stages = [
+        StageSummary(
+            stage=stage,
+            count=len(values),
+            p50=percentile(values, 0.5),
+            p95=percentile(values, 0.95),
+            total=sum(values),
+            failures=failures.get(stage, 0),
+        )
+        for stage, values in durations.items()
+    ]
+    stages.sort(key=lambda summary: summary.total, reverse=True)
+    return TraceSummary(
+        stages=stages,
+        seconds_by_kind=seconds_by_kind,
+        runs=len({record.get("run") for record in spans}),
+    )
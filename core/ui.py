@@ -1,29 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 
 from rich.align import Align
 from rich.box import DOUBLE_EDGE, HEAVY_HEAD, ROUNDED, SIMPLE_HEAVY
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeRemainingColumn,
-)
+from rich.progress_bar import ProgressBar
 from rich.prompt import IntPrompt, Prompt
 from rich.rule import Rule
 from rich.table import Table
 from rich.text import Text
 
 from core.credential import load_credential_metadata
+from core.progress import (
+    PROGRESS_FINISH,
+    PROGRESS_START,
+    ProgressEvent,
+    progress_task,
+    use_progress_listener,
+)
 from core.state import ProjectState, recommend_next_step
 
 
 console = Console()
 
+# 进度面板每秒最多重绘的次数；进度按耗时推算，重绘频率与任务数量和事件数量无关
+DASHBOARD_REFRESH_PER_SECOND = 2
+
 
 def show_title(title: str, subtitle: str | None = None) -> None:
     console.print()
@@ -230,28 +240,142 @@ def show_summary(title: str, rows: list[tuple[str, str]]) -> None:
     console.print(Align.center(table))
 
 
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(max(0, int(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+@dataclass
+class _DashboardRow:
+    description: str
+    total: float | None
+    started_at: float
+    completed: float | None = None
+    detail: str = ""
+
+    def completed_at(self, now: float) -> float:
+        if self.completed is not None:
+            return self.completed
+        return now - self.started_at
+
+
+class ProgressDashboard:
+    """
+    所有进行中的课程、考试和等待共用的进度面板，每个任务一行。
+
+    进度事件只更新内存中的行；面板在有任务时由 Rich Live 按固定频率重绘，
+    没有任务时停止，不占用控制台。
+    """
+
+    def __init__(
+        self,
+        live_console: Console | None = None,
+        refresh_per_second: float = DASHBOARD_REFRESH_PER_SECOND,
+    ):
+        self.console = live_console or console
+        self.refresh_per_second = refresh_per_second
+        self.rows: dict[int, _DashboardRow] = {}
+        self._lock = threading.Lock()
+        self._live: Live | None = None
+
+    def handle(self, event: ProgressEvent) -> None:
+        with self._lock:
+            if event.kind == PROGRESS_START:
+                self.rows[event.task_id] = _DashboardRow(
+                    description=event.description,
+                    total=event.total,
+                    started_at=event.at,
+                    detail=event.detail,
+                )
+            elif event.kind == PROGRESS_FINISH:
+                self.rows.pop(event.task_id, None)
+            else:
+                row = self.rows.get(event.task_id)
+                if row is not None:
+                    if event.completed is not None:
+                        row.completed = event.completed
+                    if event.description:
+                        row.description = event.description
+                    if event.detail:
+                        row.detail = event.detail
+            has_rows = bool(self.rows)
+        # Live 启停时会立即重绘并等待刷新线程退出，必须在释放锁之后进行
+        if has_rows:
+            self._start()
+        else:
+            self.stop()
+
+    def _start(self) -> None:
+        if self._live is not None:
+            return
+        self._live = Live(
+            console=self.console,
+            auto_refresh=True,
+            refresh_per_second=self.refresh_per_second,
+            transient=True,
+            get_renderable=self.render,
+        )
+        self._live.start()
+
+    def stop(self) -> None:
+        live, self._live = self._live, None
+        if live is not None:
+            live.stop()
+
+    def render(self) -> Table:
+        now = time.monotonic()
+        with self._lock:
+            rows = list(self.rows.values())
+
+        table = Table(show_header=False, box=None, padding=(0, 1))
+        table.add_column("任务", overflow="ellipsis", no_wrap=True, max_width=48)
+        table.add_column("进度", width=28)
+        table.add_column("用时", justify="right", no_wrap=True)
+        table.add_column("剩余", justify="right", no_wrap=True)
+        for row in rows:
+            completed = row.completed_at(now)
+            label = Text(row.description, style="cyan")
+            if row.detail:
+                label.append(f"  {row.detail}", style="dim")
+            if row.total:
+                completed = min(completed, row.total)
+                table.add_row(
+                    label,
+                    ProgressBar(total=row.total, completed=completed, width=28),
+                    Text(f"{_format_seconds(completed)}/{_format_seconds(row.total)}", style="cyan"),
+                    Text(f"剩余 {_format_seconds(row.total - completed)}", style="dim"),
+                )
+            else:
+                table.add_row(
+                    label,
+                    ProgressBar(total=None, width=28, animation_time=now),
+                    Text(_format_seconds(now - row.started_at), style="cyan"),
+                    Text(""),
+                )
+        return table
+
+
+@contextmanager
+def progress_dashboard():
+    """在启动器进程内启用共享进度面板，挂课、考试和等待的进度事件都显示在同一个面板里。"""
+    dashboard = ProgressDashboard()
+    try:
+        with use_progress_listener(dashboard.handle):
+            yield dashboard
+    finally:
+        dashboard.stop()
+
+
 async def wait_with_progress(
     duration: int,
     description: str = "处理中",
 ) -> None:
-    import asyncio
-
+    """等待指定秒数，期间在进度面板中显示一行按耗时推算的进度。"""
     duration = int(duration)
     if duration <= 0:
         return
-    with Progress(
-        SpinnerColumn(spinner_name="dots"),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(bar_width=28),
-        TextColumn("[cyan]{task.completed}[/cyan][dim]/{task.total}s[/dim]"),
-        TextColumn("[dim]([/dim][bold]{task.percentage:>3.0f}%[/bold][dim])[/dim]"),
-        TimeRemainingColumn(),
-        console=console,
-        auto_refresh=True,
-        refresh_per_second=10,
-        transient=True,
-    ) as progress:
-        task = progress.add_task(description, total=duration)
-        for _ in range(duration):
-            await asyncio.sleep(1)
-            progress.update(task, advance=1)
+    with progress_task(description, total=duration):
+        await asyncio.sleep(duration)
@@ -11,8 +11,15 @@ from typing import Callable
 from playwright.async_api import async_playwright
 
 from core.afk_runner import run_afk_until_complete
-from core.browser import build_browser_context_options, launch_async_browser
+from core.afk_shards import run_afk_sharded
+from core.browser import (
+    build_browser_context_options,
+    create_browser_context,
+    get_active_browser_session,
+    launch_async_browser,
+)
 from core.config import (
+    AFK_PROCESSES,
     COOKIES_FILE,
     LEARNING_URLS_FILE,
     MANUAL_EXAM_FILE,
@@ -24,12 +31,14 @@ from core.credential import (
     extract_account_profile_from_async_context,
     save_credential_metadata,
 )
+from core.diagnostics import diagnose_workflow
 from core.exam_runner import run_ai_exam_batch, run_manual_exam_batch
 from core.learning_zone import collect_learning_links_from_learning_zone_urls
 from core.links import extract_urls_from_text, split_manual_selection_urls
 from core.file_ops import is_compliant_url_regex, normalize_url
 from core.learning_queue import append_learning_urls, read_learning_urls
 from core.login import login_and_save_credential
+from core.queue_store import use_queue_store
 from core.state import collect_project_state, read_non_empty_lines
 from core.config import summarize_exception_message
 
@@ -128,36 +137,50 @@ async def collect_learning_links_from_entry_urls(
             except Exception:
                 pass
 
+    async def collect_from_entry_pages(context) -> None:
+        def on_new_page(page):
+            _track_background_task(
+                asyncio.create_task(handle_new_page(page)),
+                popup_tasks,
+            )
+
+        context.on("page", on_new_page)
+        try:
+            for index, entry_url in enumerate(entry_urls, start=1):
+                if status_callback:
+                    status_callback(
+                        f"正在打开入口链接 {index}/{len(entry_urls)}，处理完成后请关闭当前入口页面继续下一条"
+                    )
+                entry_page = await context.new_page()
+                await entry_page.goto(entry_url, wait_until="load")
+                await entry_page.wait_for_event("close", timeout=0)
+
+            if popup_tasks:
+                await asyncio.gather(*tuple(popup_tasks), return_exceptions=True)
+        finally:
+            remove_listener = getattr(context, "remove_listener", None)
+            if callable(remove_listener):
+                remove_listener("page", on_new_page)
+
+    browser_session = get_active_browser_session()
+    if browser_session is not None:
+        async with create_browser_context(COOKIES_FILE) as (_, context):
+            await collect_from_entry_pages(context)
+        return len(collected_urls), new_popup_count
+
     async with async_playwright() as playwright:
         browser = await launch_async_browser(playwright, headless=False)
         context = await browser.new_context(
             **build_browser_context_options(headless=False)
         )
         await context.add_cookies(cookies)
-        context.on(
-            "page",
-            lambda page: _track_background_task(
-                asyncio.create_task(handle_new_page(page)),
-                popup_tasks,
-            ),
-        )
 
         auth_page = await context.new_page()
         await auth_page.goto(ZHIXUEYUN_HOME)
         await auth_page.wait_for_url(re.compile(ZHIXUEYUN_HOME_PATTERN), timeout=0)
         await auth_page.close()
 
-        for index, entry_url in enumerate(entry_urls, start=1):
-            if status_callback:
-                status_callback(
-                    f"正在打开入口链接 {index}/{len(entry_urls)}，处理完成后请关闭当前入口页面继续下一条"
-                )
-            entry_page = await context.new_page()
-            await entry_page.goto(entry_url, wait_until="load")
-            await entry_page.wait_for_event("close", timeout=0)
-
-        if popup_tasks:
-            await asyncio.gather(*tuple(popup_tasks), return_exceptions=True)
+        await collect_from_entry_pages(context)
         await context.close()
         await browser.close()
 
@@ -181,22 +204,23 @@ async def run_manual_course_selection(
     if status_callback and added_learning:
         status_callback(f"已直接写入 {len(added_learning)} 条学习链接")
 
-    learning_zone_parsed_count = 0
-    manual_entry_urls = entry_urls
-    if learning_zone_urls:
-        if learning_zone_mode == "auto":
-            learning_zone_parsed_count = (
-                await collect_learning_links_from_learning_zone_urls(
-                    learning_zone_urls,
-                    status_callback=status_callback,
+    async with diagnose_workflow("manual-selection"):
+        learning_zone_parsed_count = 0
+        manual_entry_urls = entry_urls
+        if learning_zone_urls:
+            if learning_zone_mode == "auto":
+                learning_zone_parsed_count = (
+                    await collect_learning_links_from_learning_zone_urls(
+                        learning_zone_urls,
+                        status_callback=status_callback,
+                    )
                 )
-            )
-        else:
-            manual_entry_urls = learning_zone_urls + entry_urls
+            else:
+                manual_entry_urls = learning_zone_urls + entry_urls
 
-    _, manual_record_count = await collect_learning_links_from_entry_urls(
-        manual_entry_urls, status_callback=status_callback
-    )
+        _, manual_record_count = await collect_learning_links_from_entry_urls(
+            manual_entry_urls, status_callback=status_callback
+        )
     return {
         "input_url_count": len(urls),
         "direct_learning_count": len(added_learning),
@@ -211,7 +235,11 @@ async def run_manual_course_selection(
 async def run_afk_workflow(status_callback: StatusCallback | None = None) -> bool:
     if status_callback:
         status_callback("开始挂课")
-    await run_afk_until_complete(status_callback=status_callback)
+    with use_queue_store():
+        if AFK_PROCESSES > 1:
+            await run_afk_sharded(status_callback=status_callback, processes=AFK_PROCESSES)
+        else:
+            await run_afk_until_complete(status_callback=status_callback)
     state = collect_project_state()
     if status_callback:
         if state.exam_count > 0:
@@ -233,10 +261,11 @@ async def run_ai_exam_workflow(
 
     if status_callback:
         status_callback(f"开始 AI 自动考试，共 {state.exam_count} 条考试链接")
-    manual_count = await run_ai_exam_batch(
-        status_callback=status_callback,
-        auto_submit=auto_submit,
-    )
+    with use_queue_store():
+        manual_count = await run_ai_exam_batch(
+            status_callback=status_callback,
+            auto_submit=auto_submit,
+        )
     if status_callback:
         status_callback(f"AI 自动考试结束，人工处理 {manual_count} 条")
     return manual_count
@@ -251,7 +280,8 @@ async def run_manual_exam_workflow(status_callback: StatusCallback | None = None
 
     if status_callback:
         status_callback(f"开始人工考试，共 {state.manual_exam_count} 条链接")
-    processed_count = await run_manual_exam_batch(status_callback=status_callback)
+    with use_queue_store():
+        processed_count = await run_manual_exam_batch(status_callback=status_callback)
     if status_callback:
         status_callback("人工考试流程完成")
     return processed_count
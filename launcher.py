@@ -41,6 +41,7 @@ MENU_OPTIONS = [
     "人工考试",
     "查看当前状态与输出文件",
     "查看待学习链接状态",
+    "查看耗时统计",
     "退出",
 ]
 
@@ -55,11 +56,13 @@ MANUAL_SELECTION_PROMPTS = [
 
 def main() -> int:
     from core.abort import UserAbortRequested
+    from core.browser import launcher_browser_session
     from core.config import setup_logging
     from core.config import (
         EXAM_URLS_FILE,
         LEARNING_URLS_FILE,
         MANUAL_EXAM_FILE,
+        RUN_TRACE_FILE,
     )
     import core.ui as ui
     from core.launcher_controller import (
@@ -71,50 +74,54 @@ def main() -> int:
         handle_refresh_credential,
         handle_show_learning_links,
         handle_show_output_state,
+        handle_show_run_trace,
     )
     from core.state import collect_project_state
 
     setup_logging()
 
-    try:
-        while True:
-            state = collect_project_state()
-            ui.show_title("中国电信挂课统一入口", "登录、挂课、考试统一入口")
-            ui.render_dashboard(state)
-            choice = ui.show_menu(MENU_OPTIONS)
-
-            if choice == 1:
-                handle_recommended_flow(ui)
-            elif choice == 2:
-                handle_afk(ui)
-            elif choice == 3:
-                handle_refresh_credential(state, ui)
-            elif choice == 4:
-                handle_manual_selection(MANUAL_SELECTION_PROMPTS, ui)
-            elif choice == 5:
-                handle_ai_exam(ui)
-            elif choice == 6:
-                handle_manual_exam(ui)
-            elif choice == 7:
-                handle_show_output_state(
-                    EXAM_URLS_FILE,
-                    LEARNING_URLS_FILE,
-                    MANUAL_EXAM_FILE,
-                    ui,
-                )
-            elif choice == 8:
-                handle_show_learning_links(LEARNING_URLS_FILE, ui)
-            elif choice == 9:
-                ui.show_success("已退出统一入口")
-                return 0
-            else:
-                ui.show_error("无效选择，请重试")
-    except UserAbortRequested as exc:
-        ui.show_warning(str(exc))
-        return 0
-    except KeyboardInterrupt:
-        ui.show_warning("已收到 Ctrl+C，程序退出")
-        return 0
+    with launcher_browser_session(), ui.progress_dashboard():
+        try:
+            while True:
+                state = collect_project_state()
+                ui.show_title("中国电信挂课统一入口", "登录、挂课、考试统一入口")
+                ui.render_dashboard(state)
+                choice = ui.show_menu(MENU_OPTIONS)
+
+                if choice == 1:
+                    handle_recommended_flow(ui)
+                elif choice == 2:
+                    handle_afk(ui)
+                elif choice == 3:
+                    handle_refresh_credential(state, ui)
+                elif choice == 4:
+                    handle_manual_selection(MANUAL_SELECTION_PROMPTS, ui)
+                elif choice == 5:
+                    handle_ai_exam(ui)
+                elif choice == 6:
+                    handle_manual_exam(ui)
+                elif choice == 7:
+                    handle_show_output_state(
+                        EXAM_URLS_FILE,
+                        LEARNING_URLS_FILE,
+                        MANUAL_EXAM_FILE,
+                        ui,
+                    )
+                elif choice == 8:
+                    handle_show_learning_links(LEARNING_URLS_FILE, ui)
+                elif choice == 9:
+                    handle_show_run_trace(RUN_TRACE_FILE, ui)
+                elif choice == 10:
+                    ui.show_success("已退出统一入口")
+                    return 0
+                else:
+                    ui.show_error("无效选择，请重试")
+        except UserAbortRequested as exc:
+            ui.show_warning(str(exc))
+            return 0
+        except KeyboardInterrupt:
+            ui.show_warning("已收到 Ctrl+C，程序退出")
+            return 0
 
 
 if __name__ == "__main__":
@@ -1 +1,5 @@
 # 测试包标记文件
+import os
+
+# 测试运行期间不向项目目录下的 run_trace.jsonl 追加运行追踪
+os.environ.setdefault("RUN_TRACE", "0")
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+COURSE_PREFIX = "https://kc.zhixueyun.com/#/study/course/detail/"
+SUBJECT_URL = "https://kc.zhixueyun.com/#/study/subject/detail/s"
+
+
+class _FakeChapterLocator:
+    def __init__(self, chapters):
+        self._chapters = chapters
+
+    @property
+    def last(self):
+        return self
+
+    async def wait_for(self, timeout=None):
+        if self._chapters is None:
+            raise TimeoutError("Timeout exceeded")
+
+    async def evaluate_all(self, _script):
+        return self._chapters
+
+
+class _FakePage:
+    def __init__(self, chapters_by_url):
+        self._chapters_by_url = chapters_by_url
+        self._url = None
+        self.closed = False
+
+    async def goto(self, url):
+        self._url = url
+
+    def locator(self, _selector):
+        return _FakeChapterLocator(self._chapters_by_url.get(self._url))
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self, chapters_by_url):
+        self._chapters_by_url = chapters_by_url
+        self.pages = []
+
+    async def new_page(self):
+        page = _FakePage(self._chapters_by_url)
+        self.pages.append(page)
+        return page
+
+
+class AfkSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    def test_estimate_counts_unlearned_video_and_document_chapters(self):
+        from core.afk_scheduler import estimate_chapters_seconds
+
+        with patch("core.afk_scheduler.DOCUMENT_INITIAL_WAIT", 5):
+            seconds = estimate_chapters_seconds(
+                [
+                    ("6", "总时长 60:00 需再学 30:00"),
+                    ("5", "已完成 总时长 10:00"),
+                    ("1", "需学"),
+                    ("9", "需学"),
+                ]
+            )
+
+        self.assertEqual(seconds, 30 * 60 + 5)
+
+    def test_longest_first_order_shortens_simulated_makespan(self):
+        from core.afk_scheduler import order_longest_first, simulate_makespan
+
+        urls = ["a", "b", "c", "d", "e"]
+        estimates = {"a": 600, "b": 600, "c": 600, "d": 600, "e": 4 * 3600}
+
+        ordered = order_longest_first(urls, estimates)
+
+        self.assertEqual(ordered, ["e", "a", "b", "c", "d"])
+        self.assertEqual(simulate_makespan([estimates[url] for url in urls], 2), 1200 + 4 * 3600)
+        self.assertEqual(simulate_makespan([estimates[url] for url in ordered], 2), 4 * 3600)
+
+    async def test_schedule_probes_courses_and_puts_unknown_links_first(self):
+        from core.afk_scheduler import schedule_longest_first
+
+        short_url = f"{COURSE_PREFIX}short"
+        long_url = f"{COURSE_PREFIX}long"
+        broken_url = f"{COURSE_PREFIX}broken"
+        context = _FakeContext(
+            {
+                short_url: [["6", "总时长 10:00 需再学 05:00"]],
+                long_url: [["6", "总时长 60:00 需再学 50:00"], ["6", "总时长 60:00 需再学 60:00"]],
+                broken_url: None,
+            }
+        )
+
+        with (
+            patch("core.afk_scheduler.ensure_controller_page", new=AsyncMock()),
+            patch("core.afk_scheduler.pace", new=AsyncMock()),
+            self.assertLogs(level="INFO") as logs,
+        ):
+            schedule = await schedule_longest_first(
+                context,
+                [short_url, SUBJECT_URL, broken_url, long_url],
+                workers=2,
+            )
+
+        self.assertEqual(schedule.urls, [SUBJECT_URL, broken_url, long_url, short_url])
+        self.assertEqual(schedule.estimates[long_url], 110 * 60)
+        self.assertEqual(schedule.makespan_seconds, 110 * 60)
+        self.assertEqual(schedule.unknown_count, 2)
+        self.assertIsNotNone(schedule.finish_at)
+        self.assertEqual(len(context.pages), 3)
+        self.assertTrue(all(page.closed for page in context.pages))
+        self.assertTrue(any("预计 1:50:00 后完成" in line for line in logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
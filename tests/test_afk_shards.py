@@ -0,0 +1,204 @@
+import asyncio
+import json
+import queue
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock, patch
+
+
+class _FinishedWorker:
+    name = "afk-1"
+    exitcode = 0
+
+    def is_alive(self):
+        return False
+
+
+class AfkLeaseTests(unittest.TestCase):
+    def test_claim_url_succeeds_only_once_per_url(self):
+        from core.afk_shards import claim_url, lease_path, reset_lease_dir
+
+        with TemporaryDirectory() as tmp:
+            lease_dir = Path(tmp) / "leases"
+            reset_lease_dir(lease_dir)
+
+            self.assertTrue(claim_url(lease_dir, "https://example.com/course/1"))
+            self.assertFalse(claim_url(lease_dir, "https://example.com/course/1"))
+            self.assertTrue(claim_url(lease_dir, "https://example.com/course/2"))
+            self.assertIn(
+                "https://example.com/course/1",
+                lease_path(lease_dir, "https://example.com/course/1").read_text(encoding="utf-8"),
+            )
+
+    def test_reset_lease_dir_discards_stale_leases(self):
+        from core.afk_shards import claim_url, reset_lease_dir
+
+        with TemporaryDirectory() as tmp:
+            lease_dir = Path(tmp) / "leases"
+            reset_lease_dir(lease_dir)
+            claim_url(lease_dir, "https://example.com/course/1")
+
+            reset_lease_dir(lease_dir)
+
+            self.assertTrue(claim_url(lease_dir, "https://example.com/course/1"))
+
+
+class QueueForwardingTests(unittest.TestCase):
+    def test_forwarded_queue_writes_are_applied_by_owner(self):
+        from core.afk_shards import apply_queue_call
+        from core.exam_queue import append_exam_url, read_exam_urls
+        from core.learning_queue import read_learning_failures, record_learning_failure
+        from core.queue_owner import forward_queue_calls
+
+        with TemporaryDirectory() as tmp:
+            failures_file = Path(tmp) / "failures.json"
+            exam_file = Path(tmp) / "exams.json"
+            calls = []
+
+            with forward_queue_calls(calls.append):
+                record_learning_failure(
+                    "https://example.com/course/1",
+                    reason="retryable_error",
+                    reason_text="失败",
+                    file_path=failures_file,
+                )
+                append_exam_url("https://example.com/exam/1", file_path=exam_file)
+
+            self.assertFalse(failures_file.exists())
+            self.assertFalse(exam_file.exists())
+            self.assertEqual(
+                [name for name, _ in calls],
+                ["record_learning_failure", "append_exam_url"],
+            )
+
+            for call in calls:
+                apply_queue_call(call)
+
+            self.assertEqual(
+                [entry.url for entry in read_learning_failures(file_path=failures_file)],
+                ["https://example.com/course/1"],
+            )
+            self.assertEqual(read_exam_urls(file_path=exam_file), ["https://example.com/exam/1"])
+
+    def test_apply_queue_call_rejects_unknown_operation(self):
+        from core.afk_shards import apply_queue_call
+
+        with self.assertRaises(ValueError):
+            apply_queue_call(("write_everything", {}))
+
+
+class CoordinatorTests(unittest.TestCase):
+    def test_coordinator_applies_messages_until_workers_exit(self):
+        from core import afk_shards
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            failures_file = Path(tmp) / "failures.json"
+            message_queue = queue.Queue()
+            message_queue.put(("status", "进程 1 挂课 1/2: https://example.com/course/1"))
+            message_queue.put(
+                (
+                    "call",
+                    "record_learning_failure",
+                    {
+                        "url": "https://example.com/course/1",
+                        "reason": "retryable_error",
+                        "reason_text": "失败",
+                        "file_path": failures_file,
+                    },
+                )
+            )
+            message_queue.put(("done", "https://example.com/course/1"))
+            pending = ["https://example.com/course/1", "https://example.com/course/2"]
+            statuses = []
+
+            with patch("core.afk_runner.LEARNING_URLS_FILE", learning_file), patch(
+                "core.afk_shards._POLL_SECONDS", 0.01
+            ):
+                asyncio.run(
+                    afk_shards._coordinate([_FinishedWorker()], message_queue, pending, statuses.append)
+                )
+
+            self.assertEqual(pending, ["https://example.com/course/2"])
+            self.assertEqual(
+                json.loads(learning_file.read_text(encoding="utf-8")),
+                [{"url": "https://example.com/course/2"}],
+            )
+            self.assertEqual(len(json.loads(failures_file.read_text(encoding="utf-8"))), 1)
+            self.assertEqual(statuses, ["进程 1 挂课 1/2: https://example.com/course/1"])
+
+    def test_coordinator_raises_user_abort_reported_by_worker(self):
+        from core import afk_shards
+        from core.abort import UserAbortRequested
+
+        message_queue = queue.Queue()
+        message_queue.put(("abort", "已关闭浏览器窗口，程序退出", False))
+
+        with self.assertRaises(UserAbortRequested) as context:
+            asyncio.run(afk_shards._coordinate([_FinishedWorker()], message_queue, [], None))
+
+        self.assertFalse(context.exception.save_pending_urls)
+
+
+class ShardedPlanningTests(unittest.IsolatedAsyncioTestCase):
+    async def test_coordinator_prefilters_and_orders_urls_before_workers_start(self):
+        from core import afk_shards
+        from core.afk_scheduler import AfkSchedule
+        from core.learning_prefilter import PrefilterResult
+
+        class FakeBrowserContextManager:
+            async def __aenter__(self):
+                return None, object()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        urls = [
+            "https://example.com/course/done",
+            "https://example.com/course/short",
+            "https://example.com/course/long",
+        ]
+        pending = list(urls)
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            with (
+                patch("core.afk_runner.LEARNING_URLS_FILE", learning_file),
+                patch("core.afk_runner.AFK_PREFILTER", True),
+                patch("core.afk_runner.AFK_LONGEST_FIRST", True),
+                patch("core.afk_shards.AFK_PREFILTER", True),
+                patch(
+                    "core.afk_shards.create_browser_context",
+                    return_value=FakeBrowserContextManager(),
+                ),
+                patch(
+                    "core.afk_runner.prefilter_learning_urls",
+                    new=AsyncMock(
+                        return_value=PrefilterResult(remaining=urls[1:], completed=urls[:1])
+                    ),
+                ),
+                patch(
+                    "core.afk_runner.schedule_longest_first",
+                    new=AsyncMock(return_value=AfkSchedule(urls=[urls[2], urls[1]])),
+                ) as mock_schedule,
+            ):
+                planned = await afk_shards._plan_sharded_urls(
+                    urls,
+                    pending,
+                    None,
+                    processes=3,
+                    concurrency=2,
+                )
+
+            self.assertEqual(planned, [urls[2], urls[1]])
+            self.assertEqual(pending, [urls[2], urls[1]])
+            self.assertEqual(mock_schedule.await_args.kwargs["workers"], 4)
+            self.assertEqual(
+                [entry["url"] for entry in json.loads(learning_file.read_text(encoding="utf-8"))],
+                [urls[2], urls[1]],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
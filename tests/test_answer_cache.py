@@ -0,0 +1,197 @@
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock
+
+
+def _question(options, *, text="中国电信的英文缩写是什么？", question_type="single"):
+    return {
+        "type": question_type,
+        "text": text,
+        "options": [{"label": label, "text": option_text} for label, option_text in options],
+    }
+
+
+MODEL_CONFIG = {"model": "test-model", "request_type": "responses"}
+
+
+class AnswerCacheKeyTests(unittest.TestCase):
+    def test_cache_key_ignores_option_order_and_whitespace(self):
+        from core.answer_cache import build_answer_cache_key
+
+        first = _question([("A", "CT"), ("B", "CU")])
+        shuffled = _question([("A", "CU"), ("B", " CT ")], text="中国电信的英文缩写是什么？\n")
+
+        self.assertEqual(
+            build_answer_cache_key(MODEL_CONFIG, first),
+            build_answer_cache_key(MODEL_CONFIG, shuffled),
+        )
+
+    def test_cache_key_depends_on_model_config_and_type(self):
+        from core.answer_cache import build_answer_cache_key
+
+        question = _question([("A", "CT"), ("B", "CU")])
+        other_model = {"model": "other-model", "request_type": "responses"}
+
+        self.assertNotEqual(
+            build_answer_cache_key(MODEL_CONFIG, question),
+            build_answer_cache_key(other_model, question),
+        )
+        self.assertNotEqual(
+            build_answer_cache_key(MODEL_CONFIG, question),
+            build_answer_cache_key(
+                MODEL_CONFIG,
+                _question([("A", "CT"), ("B", "CU")], question_type="multiple"),
+            ),
+        )
+
+    def test_cache_key_skips_incomplete_or_fill_blank_questions(self):
+        from core.answer_cache import build_answer_cache_key
+
+        self.assertIsNone(build_answer_cache_key(MODEL_CONFIG, _question([("A", ""), ("B", "CU")])))
+        self.assertIsNone(
+            build_answer_cache_key(MODEL_CONFIG, _question([], question_type="fill_blank"))
+        )
+
+
+class AnswerCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_cached_answer_maps_back_onto_shuffled_option_labels(self):
+        from core.answer_cache import AnswerCache
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            fetch = AsyncMock(return_value=["A"])
+            with cache.attempt() as attempt:
+                first = await cache.get_answers(
+                    MODEL_CONFIG,
+                    _question([("A", "CT"), ("B", "CU")]),
+                    fetch,
+                )
+            attempt.commit()
+            cache.close()
+
+            reopened = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            second_fetch = AsyncMock(return_value=["A"])
+            second = await reopened.get_answers(
+                MODEL_CONFIG,
+                _question([("A", "CU"), ("B", "CT")]),
+                second_fetch,
+            )
+            reopened.close()
+
+        self.assertEqual(first, ["A"])
+        self.assertEqual(second, ["B"])
+        fetch.assert_awaited_once()
+        second_fetch.assert_not_awaited()
+
+    async def test_identical_inflight_questions_share_one_request(self):
+        from core.answer_cache import AnswerCache
+
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["A", "C"]
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            options = [("A", "甲"), ("B", "乙"), ("C", "丙")]
+            shuffled = [("A", "丙"), ("B", "甲"), ("C", "乙")]
+            results = await asyncio.gather(
+                cache.get_answers(MODEL_CONFIG, _question(options, question_type="multiple"), fetch),
+                cache.get_answers(MODEL_CONFIG, _question(shuffled, question_type="multiple"), fetch),
+            )
+            cache.close()
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [["A", "C"], ["B", "A"]])
+
+    async def test_cache_evicts_least_recently_used_entries(self):
+        from core.answer_cache import AnswerCache, build_answer_cache_key
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=2)
+            questions = [
+                _question([("A", "CT"), ("B", "CU")], text=f"题目{index}")
+                for index in range(3)
+            ]
+            for question in questions:
+                with cache.attempt() as attempt:
+                    await cache.get_answers(MODEL_CONFIG, question, AsyncMock(return_value=["A"]))
+                attempt.commit()
+
+            self.assertIsNone(cache.lookup(build_answer_cache_key(MODEL_CONFIG, questions[0])))
+            self.assertEqual(
+                cache.lookup(build_answer_cache_key(MODEL_CONFIG, questions[2])),
+                ["CT"],
+            )
+            cache.close()
+
+    async def test_empty_answers_are_not_cached(self):
+        from core.answer_cache import AnswerCache
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            question = _question([("A", "CT"), ("B", "CU")])
+            await cache.get_answers(MODEL_CONFIG, question, AsyncMock(return_value=[]))
+            retry = AsyncMock(return_value=["A"])
+            answers = await cache.get_answers(MODEL_CONFIG, question, retry)
+            cache.close()
+
+        self.assertEqual(answers, ["A"])
+        retry.assert_awaited_once()
+
+    async def test_answers_are_cached_only_after_attempt_is_committed(self):
+        from core.answer_cache import AnswerCache, build_answer_cache_key
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            question = _question([("A", "CT"), ("B", "CU")])
+            key = build_answer_cache_key(MODEL_CONFIG, question)
+
+            await cache.get_answers(MODEL_CONFIG, question, AsyncMock(return_value=["A"]))
+            self.assertIsNone(cache.lookup(key))
+
+            with cache.attempt() as attempt:
+                await cache.get_answers(MODEL_CONFIG, question, AsyncMock(return_value=["A"]))
+            self.assertIsNone(cache.lookup(key))
+
+            attempt.discard()
+            attempt.commit()
+            self.assertIsNone(cache.lookup(key))
+            cache.close()
+
+    async def test_failed_attempt_forgets_hits_and_retake_skips_cache(self):
+        from core.answer_cache import AnswerCache, build_answer_cache_key
+
+        with TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp) / "cache.sqlite3", max_entries=10)
+            question = _question([("A", "CT"), ("B", "CU")])
+            key = build_answer_cache_key(MODEL_CONFIG, question)
+            cache.store(key, ["CT"])
+
+            with cache.attempt(use_cached=False) as retake:
+                fetch = AsyncMock(return_value=["B"])
+                answers = await cache.get_answers(MODEL_CONFIG, question, fetch)
+            self.assertEqual(answers, ["B"])
+            fetch.assert_awaited_once()
+            self.assertEqual(cache.lookup(key), ["CT"])
+
+            with cache.attempt() as failed:
+                fetch = AsyncMock(return_value=["B"])
+                answers = await cache.get_answers(MODEL_CONFIG, question, fetch)
+            self.assertEqual(answers, ["A"])
+            fetch.assert_not_awaited()
+
+            failed.discard()
+            self.assertIsNone(cache.lookup(key))
+            retake.commit()
+            self.assertEqual(cache.lookup(key), ["CU"])
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
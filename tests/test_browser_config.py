@@ -1,5 +1,9 @@
 import asyncio
+import json
+import os
 import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import AsyncMock
 
 from core import browser
@@ -50,6 +54,35 @@ class BrowserLaunchConfigTests(unittest.TestCase):
 
         self.assertEqual(options["args"], ["--mute-audio"])
 
+    def test_headless_afk_profile_forces_headless_with_autoplay_args(self):
+        with (
+            unittest.mock.patch.object(browser, "BROWSER_TYPE", "chromium"),
+            unittest.mock.patch.object(browser, "BROWSER_CHANNEL", "msedge"),
+            unittest.mock.patch.object(browser, "BROWSER_ARGS", ["--mute-audio"]),
+        ):
+            options = browser.build_browser_launch_options(
+                headless=False,
+                slow_mo=3000,
+                profile=browser.HEADLESS_AFK_PROFILE,
+            )
+
+        self.assertTrue(options["headless"])
+        self.assertEqual(options["slow_mo"], 3000)
+        self.assertEqual(options["args"][0], "--mute-audio")
+        self.assertIn("--autoplay-policy=no-user-gesture-required", options["args"])
+        self.assertNotIn("--start-maximized", options["args"])
+        self.assertEqual(
+            browser.build_browser_context_options(
+                headless=True,
+                profile=browser.HEADLESS_AFK_PROFILE,
+            ),
+            {"viewport": {"width": 1280, "height": 720}},
+        )
+
+    def test_unknown_launch_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            browser.build_browser_launch_options(headless=True, profile="unknown")
+
     def test_launch_async_browser_uses_selected_browser_type(self):
         fake_browser = object()
         fake_launcher = type("FakeLauncher", (), {"launch": AsyncMock(return_value=fake_browser)})()
@@ -168,5 +201,140 @@ class BrowserControllerPageTests(unittest.IsolatedAsyncioTestCase):
         )
 
 
+
+class _FakeSessionPage:
+    def __init__(self):
+        self.closed = False
+        self.goto_calls = []
+
+    async def goto(self, url, wait_until=None):
+        self.goto_calls.append(url)
+
+    async def wait_for_url(self, _pattern, timeout=0):
+        return None
+
+    def is_closed(self):
+        return self.closed
+
+    def on(self, _event, _handler):
+        return None
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeSessionBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **_kwargs):
+        context = _FakeSessionContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakeSessionContext:
+    def __init__(self, fake_browser):
+        self.browser = fake_browser
+        self.pages = []
+        self.cookies = []
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def new_page(self):
+        page = _FakeSessionPage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        for page in self.pages:
+            page.closed = True
+
+
+class _FakeSessionPlaywrightManager:
+    def __init__(self):
+        self.launch = AsyncMock(side_effect=lambda **_kwargs: _FakeSessionBrowser())
+        self.stopped = False
+
+    async def start(self):
+        return type("FakePlaywright", (), {"chromium": type("L", (), {"launch": self.launch})()})()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.stopped = True
+
+
+class BrowserSessionTests(unittest.TestCase):
+    def test_launcher_session_reuses_authenticated_context_across_workflows(self):
+        from core.config import run_async
+
+        manager = _FakeSessionPlaywrightManager()
+
+        async def use_browser():
+            async with browser.create_browser_context(cookies_path) as (_, context):
+                workflow_page = await context.new_page()
+            return context, workflow_page
+
+        with TemporaryDirectory() as tmp:
+            cookies_path = Path(tmp) / "cookies.json"
+            cookies_path.write_text(json.dumps([{"name": "token"}]), encoding="utf-8")
+            with (
+                unittest.mock.patch.object(browser, "BROWSER_TYPE", "chromium"),
+                unittest.mock.patch.object(browser, "async_playwright", return_value=manager),
+            ):
+                with browser.launcher_browser_session() as session:
+                    first_context, first_page = run_async(use_browser())
+                    second_context, _ = run_async(use_browser())
+
+                    self.assertIs(first_context, second_context)
+                    self.assertTrue(first_page.closed)
+                    self.assertFalse(first_context.pages[0].closed)
+                    self.assertEqual(session.launch_count, 1)
+
+                    stat = cookies_path.stat()
+                    os.utime(cookies_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                    refreshed_context, _ = run_async(use_browser())
+
+                    self.assertIsNot(refreshed_context, first_context)
+                    self.assertFalse(first_context.browser.is_connected())
+                    self.assertEqual(session.launch_count, 2)
+
+                    browser.invalidate_browser_session()
+                    self.assertFalse(refreshed_context.browser.is_connected())
+
+        self.assertTrue(manager.stopped)
+        self.assertIsNone(browser.get_active_browser_session())
+
+    def test_launch_profiles_get_separate_browsers(self):
+        manager = _FakeSessionPlaywrightManager()
+        session = browser.BrowserSession()
+
+        async def acquire_profiles(cookies_path):
+            _, visible = await session.acquire(cookies_path, headless=False)
+            _, slowed = await session.acquire(cookies_path, headless=False, slow_mo=3000)
+            _, visible_again = await session.acquire(cookies_path, headless=False)
+            await session.close()
+            return visible, slowed, visible_again
+
+        with TemporaryDirectory() as tmp:
+            cookies_path = Path(tmp) / "cookies.json"
+            cookies_path.write_text(json.dumps([]), encoding="utf-8")
+            with (
+                unittest.mock.patch.object(browser, "BROWSER_TYPE", "chromium"),
+                unittest.mock.patch.object(browser, "async_playwright", return_value=manager),
+            ):
+                visible, slowed, visible_again = asyncio.run(acquire_profiles(cookies_path))
+
+        self.assertIs(visible, visible_again)
+        self.assertIsNot(visible, slowed)
+        self.assertEqual(manager.launch.await_count, 2)
+
 if __name__ == "__main__":
     unittest.main()
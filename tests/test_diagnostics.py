@@ -0,0 +1,118 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+
+class _FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    async def start(self, **kwargs):
+        self.calls.append(("start", kwargs))
+
+    async def start_chunk(self, title=None):
+        self.calls.append(("start_chunk", title))
+
+    async def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+        if path is not None:
+            Path(path).write_bytes(b"trace")
+
+    async def stop(self):
+        self.calls.append(("stop", None))
+
+
+class _FakeContext:
+    def __init__(self):
+        self.tracing = _FakeTracing()
+
+
+class DiagnosticsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_workflow_passes_through_when_disabled(self):
+        from core.diagnostics import diagnose_workflow, trace_slow_page
+
+        context = _FakeContext()
+        with TemporaryDirectory() as tmp, patch("core.diagnostics.DIAGNOSTICS_ENABLED", False), patch(
+            "core.diagnostics.DIAGNOSTICS_DIR", Path(tmp)
+        ):
+            async with diagnose_workflow("afk") as session:
+                async with trace_slow_page(context, "https://example.com/course"):
+                    pass
+
+            self.assertIsNone(session)
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+        self.assertEqual(context.tracing.calls, [])
+
+    async def test_workflow_writes_profile_and_memory_snapshots(self):
+        from core.diagnostics import diagnose_workflow
+
+        with TemporaryDirectory() as tmp, patch("core.diagnostics.DIAGNOSTICS_ENABLED", True), patch(
+            "core.diagnostics.DIAGNOSTICS_DIR", Path(tmp)
+        ):
+            async with diagnose_workflow("afk") as session:
+                async with diagnose_workflow("ai-exam") as nested:
+                    self.assertIs(nested, session)
+                await asyncio.sleep(0)
+
+            files = {path.name for path in session.directory.iterdir()}
+            self.assertTrue(session.directory.name.endswith(f"-afk-{os.getpid()}"))
+            self.assertIn("profile.txt", files)
+            self.assertIn("profile.prof", files)
+            self.assertIn("tracemalloc_start.snapshot", files)
+            self.assertIn("tracemalloc_end.snapshot", files)
+            self.assertIn("tracemalloc_top.txt", files)
+            self.assertEqual(len(list(Path(tmp).iterdir())), 1)
+
+    async def test_slow_page_trace_is_saved_and_fast_page_chunk_is_discarded(self):
+        from core.diagnostics import diagnose_workflow, trace_slow_page
+
+        context = _FakeContext()
+        with TemporaryDirectory() as tmp, patch("core.diagnostics.DIAGNOSTICS_ENABLED", True), patch(
+            "core.diagnostics.DIAGNOSTICS_DIR", Path(tmp)
+        ), patch("core.diagnostics.DIAGNOSTICS_SLOW_PAGE_SECONDS", 0.05):
+            async with diagnose_workflow("afk") as session:
+                async with trace_slow_page(context, "https://example.com/fast"):
+                    pass
+                async with trace_slow_page(context, "https://example.com/slow"):
+                    await asyncio.sleep(0.06)
+
+            trace_path = session.traces_dir / "slow-page-001.zip"
+            self.assertTrue(trace_path.exists())
+            slow_pages = (session.traces_dir / "slow_pages.txt").read_text(encoding="utf-8")
+
+        self.assertIn("https://example.com/slow", slow_pages)
+        self.assertNotIn("https://example.com/fast", slow_pages)
+        self.assertEqual(
+            [name for name, _ in context.tracing.calls],
+            ["start", "start_chunk", "stop_chunk", "start_chunk", "stop_chunk", "stop"],
+        )
+        self.assertIsNone(context.tracing.calls[2][1])
+        self.assertEqual(context.tracing.calls[4][1], trace_path)
+
+    async def test_overlapping_pages_share_one_chunk(self):
+        from core.diagnostics import diagnose_workflow, trace_slow_page
+
+        context = _FakeContext()
+
+        async def visit(label, delay):
+            async with trace_slow_page(context, label):
+                await asyncio.sleep(delay)
+
+        with TemporaryDirectory() as tmp, patch("core.diagnostics.DIAGNOSTICS_ENABLED", True), patch(
+            "core.diagnostics.DIAGNOSTICS_DIR", Path(tmp)
+        ), patch("core.diagnostics.DIAGNOSTICS_SLOW_PAGE_SECONDS", 0.05):
+            async with diagnose_workflow("afk") as session:
+                await asyncio.gather(visit("slow", 0.06), visit("fast", 0.01))
+
+            self.assertEqual(session.trace_count, 1)
+
+        names = [name for name, _ in context.tracing.calls]
+        self.assertEqual(names.count("start_chunk"), 1)
+        self.assertEqual(names.count("stop_chunk"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -74,6 +74,41 @@ class _FakeSubmitPage:
         return None
 
 
+class _FakeNoticeLocator:
+    def __init__(self, page):
+        self._page = page
+
+    @property
+    def first(self):
+        return self
+
+    def locator(self, selector):
+        self._page.locator_calls.append(selector)
+        return self
+
+    async def is_visible(self):
+        self._page.visibility_checks += 1
+        return self._page.notice_visible
+
+    async def click(self, timeout=0):
+        self._page.clicks += 1
+
+
+class _FakeNoticePage:
+    def __init__(self, notice_visible):
+        self.notice_visible = notice_visible
+        self.locator_calls = []
+        self.visibility_checks = 0
+        self.clicks = 0
+
+    def locator(self, selector):
+        self.locator_calls.append(selector)
+        return _FakeNoticeLocator(self)
+
+    async def wait_for_timeout(self, _milliseconds):
+        return None
+
+
 class ExamActionTests(unittest.IsolatedAsyncioTestCase):
     async def test_select_answers_routes_empty_choice_answers_without_claiming_fill_blank(self):
         from core.exam_actions import MANUAL_EXAM_FILE, select_answers
@@ -182,6 +217,27 @@ class ExamActionTests(unittest.IsolatedAsyncioTestCase):
         )
         self.assertNotIn("text=确定", page.locator_calls)
 
+    async def test_close_exam_notice_clicks_visible_notice_without_extra_wait(self):
+        from core.exam_actions import close_exam_notice_if_present
+
+        page = _FakeNoticePage(notice_visible=True)
+
+        await close_exam_notice_if_present(page)
+
+        self.assertEqual(page.visibility_checks, 1)
+        self.assertEqual(page.locator_calls, [".dialog.animated", ".dialog-footer .btn"])
+        self.assertEqual(page.clicks, 1)
+
+    async def test_close_exam_notice_skips_click_when_no_notice_appears(self):
+        from core.exam_actions import close_exam_notice_if_present
+
+        page = _FakeNoticePage(notice_visible=False)
+
+        await close_exam_notice_if_present(page)
+
+        self.assertEqual(page.visibility_checks, 1)
+        self.assertEqual(page.clicks, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from types import SimpleNamespace
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 
 def _responses_stream(*events):
@@ -360,5 +360,93 @@ class ExamAnswerChatApiTests(unittest.IsolatedAsyncioTestCase):
                 await exam_answers.get_ai_answers(client, "qwen3.6-max-preview", question_data)
 
 
+class _AsyncEventStream:
+    def __init__(self, *events):
+        self._events = list(events)
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self._events:
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+class ExamAnswerAsyncClientTests(unittest.IsolatedAsyncioTestCase):
+    async def test_get_ai_answers_consumes_async_responses_stream(self):
+        from core import exam_answers
+
+        stream = _AsyncEventStream(
+            SimpleNamespace(type="response.output_text.delta", delta="B"),
+            SimpleNamespace(type="response.output_text.done", text="B"),
+        )
+        create = AsyncMock(return_value=stream)
+        client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        question_data = {
+            "type": "single",
+            "text": "中国电信的英文缩写是什么？",
+            "options": [
+                {"label": "A", "text": "CU"},
+                {"label": "B", "text": "CT"},
+            ],
+        }
+
+        with patch.object(exam_answers, "AI_REQUEST_TYPE", "responses"):
+            answers = await exam_answers.get_ai_answers(client, "qwen3.6-plus", question_data)
+
+        self.assertEqual(answers, ["B"])
+        create.assert_awaited_once()
+        self.assertTrue(stream.closed)
+
+    async def test_get_ai_answers_consumes_async_chat_stream(self):
+        from core import exam_answers
+
+        stream = _AsyncEventStream(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="正确"))]),
+        )
+        create = AsyncMock(return_value=stream)
+        client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        question_data = {"type": "judge", "text": "判断题", "options": []}
+
+        with patch.object(exam_answers, "AI_REQUEST_TYPE", "chat"):
+            answers = await exam_answers.get_ai_answers(client, "qwen3.6-plus", question_data)
+
+        self.assertEqual(answers, ["正确"])
+        self.assertTrue(stream.closed)
+
+    async def test_get_ai_answers_runs_sync_client_off_event_loop_thread(self):
+        import threading
+
+        from core import exam_answers
+
+        request_threads = []
+
+        def create(**_kwargs):
+            request_threads.append(threading.current_thread())
+            return _responses_stream(
+                SimpleNamespace(type="response.output_text.done", text="A"),
+            )
+
+        client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        question_data = {
+            "type": "single",
+            "text": "中国电信的英文缩写是什么？",
+            "options": [{"label": "A", "text": "CT"}],
+        }
+
+        with patch.object(exam_answers, "AI_REQUEST_TYPE", "responses"):
+            answers = await exam_answers.get_ai_answers(client, "qwen3.6-plus", question_data)
+
+        self.assertEqual(answers, ["A"])
+        self.assertEqual(len(request_threads), 1)
+        self.assertIsNot(request_threads[0], threading.main_thread())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -255,6 +255,57 @@ class ExamFlowLoggingTests(unittest.IsolatedAsyncioTestCase):
         mock_wait_manual_submit.assert_awaited_once_with(page)
         mock_info.assert_any_call("检测到需要人工处理的题目，已自动切换为手动交卷")
 
+    async def test_answer_multi_questions_caps_concurrency_and_selects_on_arrival(self):
+        import asyncio
+
+        from core.exam_flow import _answer_multi_questions
+
+        questions = [
+            {
+                "index": index,
+                "item_id": f"item-{index}",
+                "type": "single",
+                "text": f"题目{index}",
+                "options": [{"label": "A", "text": "甲"}],
+            }
+            for index in range(4)
+        ]
+        delays = {"题目0": 0.04, "题目1": 0.01, "题目2": 0.02, "题目3": 0.01}
+        active = 0
+        max_active = 0
+
+        async def fake_get_ai_answers(_client, _model, question_data):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(delays[question_data["text"]])
+            active -= 1
+            return ["A"]
+
+        selected = []
+
+        async def fake_select_answers(_page, question_data, *_args, **_kwargs):
+            selected.append(question_data["index"])
+
+        with (
+            patch("core.exam_flow.get_ai_answers", new=AsyncMock(side_effect=fake_get_ai_answers)),
+            patch("core.exam_flow.select_answers", new=AsyncMock(side_effect=fake_select_answers)),
+        ):
+            auto_submit = await _answer_multi_questions(
+                object(),
+                "test-model",
+                _FakePage(),
+                "https://example.com/exam",
+                questions,
+                auto_submit=True,
+                concurrency=2,
+            )
+
+        self.assertTrue(auto_submit)
+        self.assertEqual(max_active, 2)
+        self.assertEqual(sorted(selected), [0, 1, 2, 3])
+        self.assertNotEqual(selected[0], 0)
+
     async def test_wait_for_manual_submit_completion_closes_result_modal_when_present(self):
         from core.exam_flow import _wait_for_manual_submit_completion
 
@@ -40,5 +40,141 @@ class DetectExamModeTests(unittest.IsolatedAsyncioTestCase):
         mock_info.assert_called_once_with("检测为多题目模式(无下一题按钮)")
 
 
+
+def _raw_choice_specs(first_spec_options):
+    return [first_spec_options, [], [], [], []]
+
+
+class BulkExtractionTests(unittest.IsolatedAsyncioTestCase):
+    def test_parse_bulk_questions_data_matches_locator_question_shape(self):
+        from core.exam_parsing import parse_bulk_questions_data
+
+        questions = parse_bulk_questions_data(
+            [
+                {
+                    "typeText": "单选题（2分）",
+                    "stem": "中国电信的英文缩写是什么？",
+                    "itemId": "q-1",
+                    "hasSentenceInput": False,
+                    "hasAnswerInputShot": False,
+                    "choice": _raw_choice_specs(
+                        [
+                            {"label": "A.", "text": "CT", "full": "A. CT"},
+                            {"label": "", "text": "", "full": "B. CU"},
+                        ]
+                    ),
+                    "judge": [[], [], []],
+                },
+                {
+                    "typeText": "判断题",
+                    "stem": "天空是蓝色的",
+                    "itemId": None,
+                    "hasSentenceInput": False,
+                    "hasAnswerInputShot": False,
+                    "choice": _raw_choice_specs([]),
+                    "judge": [["正确", "错误"], [], []],
+                },
+                {
+                    "typeText": "",
+                    "stem": "请填空",
+                    "itemId": "q-3",
+                    "hasSentenceInput": True,
+                    "hasAnswerInputShot": False,
+                    "choice": _raw_choice_specs([]),
+                    "judge": [[], [], []],
+                },
+                {
+                    "typeText": "单选题",
+                    "stem": None,
+                    "itemId": "q-4",
+                    "choice": _raw_choice_specs([]),
+                    "judge": [[], [], []],
+                },
+            ]
+        )
+
+        self.assertEqual(
+            questions,
+            [
+                {
+                    "index": 0,
+                    "type": "single",
+                    "text": "中国电信的英文缩写是什么？",
+                    "options": [
+                        {"label": "A", "text": "CT"},
+                        {"label": "B", "text": "CU"},
+                    ],
+                    "item_id": "q-1",
+                    "option_click_selector": ".preview-list dd",
+                },
+                {
+                    "index": 1,
+                    "type": "judge",
+                    "text": "天空是蓝色的",
+                    "options": [
+                        {"label": "T", "text": "正确"},
+                        {"label": "F", "text": "错误"},
+                    ],
+                    "item_id": "item-1",
+                    "option_click_selector": ".preview-list dd .pointer",
+                },
+                {
+                    "index": 2,
+                    "type": "fill_blank",
+                    "text": "请填空",
+                    "options": [],
+                    "item_id": "q-3",
+                },
+            ],
+        )
+
+    async def test_extract_multi_questions_data_uses_single_page_script(self):
+        from core import exam_parsing
+
+        class FakeBulkPage:
+            def __init__(self):
+                self.evaluate_calls = 0
+
+            async def evaluate(self, _script, _arg):
+                self.evaluate_calls += 1
+                return [
+                    {
+                        "typeText": "单选题",
+                        "stem": "题干",
+                        "itemId": "q-1",
+                        "choice": _raw_choice_specs([{"label": "A", "text": "甲", "full": "A 甲"}]),
+                        "judge": [[], [], []],
+                    }
+                ]
+
+            def locator(self, selector):
+                raise AssertionError(f"不应逐元素读取: {selector}")
+
+        page = FakeBulkPage()
+        with patch.object(exam_parsing, "EXAM_BULK_EXTRACTION", True):
+            questions = await exam_parsing.extract_multi_questions_data(page)
+
+        self.assertEqual(page.evaluate_calls, 1)
+        self.assertEqual(questions[0]["options"], [{"label": "A", "text": "甲"}])
+
+    async def test_extract_multi_questions_data_falls_back_when_script_fails(self):
+        from unittest.mock import AsyncMock
+
+        from core import exam_parsing
+
+        class FailingBulkPage:
+            async def evaluate(self, _script, _arg):
+                raise RuntimeError("evaluate failed")
+
+        fallback = AsyncMock(return_value=[{"index": 0}])
+        with (
+            patch.object(exam_parsing, "EXAM_BULK_EXTRACTION", True),
+            patch.object(exam_parsing, "extract_multi_questions_data_by_locator", new=fallback),
+        ):
+            questions = await exam_parsing.extract_multi_questions_data(FailingBulkPage())
+
+        self.assertEqual(questions, [{"index": 0}])
+        fallback.assert_awaited_once()
+
 if __name__ == "__main__":
     unittest.main()
@@ -135,6 +135,34 @@ class LauncherControllerTests(unittest.TestCase):
             self.assertFalse(learning_file.exists())
             self.assertIn("已删除空的课程链接.json", ui.messages)
 
+    def test_maybe_delete_empty_learning_queue_file_skips_json_file_on_sqlite_backend(self):
+        from core.launcher_controller import _maybe_delete_empty_learning_queue_file
+
+        class FakeUi:
+            def __init__(self):
+                self.messages = []
+
+            def prompt_yes_no(self, message, default="N"):
+                self.messages.append((message, default))
+                return True
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "课程链接.json"
+            learning_file.write_text(
+                '[{"url": "https://example.com/course/1"}]',
+                encoding="utf-8",
+            )
+            ui = FakeUi()
+
+            with (
+                patch("core.config.LEARNING_URLS_FILE", learning_file),
+                patch("core.queue_db.QUEUE_BACKEND", "sqlite"),
+            ):
+                _maybe_delete_empty_learning_queue_file(ui)
+
+            self.assertTrue(learning_file.exists())
+            self.assertEqual(ui.messages, [])
+
     def test_handle_ai_exam_prompts_for_auto_submit(self):
         from core.launcher_controller import handle_ai_exam
 
@@ -175,5 +203,44 @@ class LauncherControllerTests(unittest.TestCase):
         )
 
 
+    def test_handle_show_run_trace_summarizes_stages_and_wait_shares(self):
+        from core.launcher_controller import handle_show_run_trace
+
+        class FakeUi:
+            def __init__(self):
+                self.summaries = []
+                self.warnings = []
+                self.paused = 0
+
+            def show_summary(self, title, rows):
+                self.summaries.append((title, dict(rows)))
+
+            def show_warning(self, message):
+                self.warnings.append(message)
+
+            def pause(self):
+                self.paused += 1
+
+        with TemporaryDirectory() as tmp:
+            trace_file = Path(tmp) / "run_trace.jsonl"
+            ui = FakeUi()
+            handle_show_run_trace(trace_file, ui)
+
+            trace_file.write_text(
+                '{"run": "a", "stage": "video_wait", "kind": "fixed_wait", "seconds": 3.0}\n'
+                '{"run": "a", "stage": "goto", "kind": "work", "seconds": 1.0}\n',
+                encoding="utf-8",
+            )
+            handle_show_run_trace(trace_file, ui)
+
+        self.assertEqual(len(ui.warnings), 1)
+        self.assertEqual(ui.paused, 2)
+        title, rows = ui.summaries[0]
+        self.assertEqual(title, "耗时统计")
+        self.assertEqual(rows["视频学习等待"], "1 次, p50 3.00 秒, p95 3.00 秒")
+        self.assertEqual(rows["固定等待占比"], "75%")
+        self.assertEqual(rows["实际操作占比"], "25%")
+
+
 if __name__ == "__main__":
     unittest.main()
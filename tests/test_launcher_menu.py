@@ -16,6 +16,7 @@ class LauncherMenuTests(unittest.TestCase):
                 "人工考试",
                 "查看当前状态与输出文件",
                 "查看待学习链接状态",
+                "查看耗时统计",
                 "退出",
             ],
         )
@@ -184,6 +184,7 @@ class LearningExamTests(unittest.IsolatedAsyncioTestCase):
         mock_error.assert_not_called()
         mock_info.assert_any_call("考试状态: 暂无考试记录")
 
+    @patch("core.learning_flows.pace", new=AsyncMock())
     async def test_course_learning_checks_exam_status_only_once_for_exam_section(self):
         from core.learning_flows import course_learning
 
@@ -192,7 +193,6 @@ class LearningExamTests(unittest.IsolatedAsyncioTestCase):
 
         with (
             patch("core.learning_flows.check_permission", new=AsyncMock(return_value=True)),
-            patch("core.learning_flows.handle_rating_popup", new=AsyncMock(return_value=False)),
             patch("core.learning_flows._is_course_completed", new=AsyncMock(return_value=False)),
             patch("core.learning_flows.check_exam_passed", new=mock_check),
             patch("core.learning_exam.check_exam_passed", new=mock_check),
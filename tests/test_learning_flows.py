@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 
 class SubjectLearningFlowTests(unittest.IsolatedAsyncioTestCase):
+    @patch("core.learning_flows.pace", new=AsyncMock())
     async def test_subject_learning_skips_closed_popup_course_and_continues(self):
         from core.learning_flows import subject_learning
 
@@ -134,5 +135,152 @@ class SubjectLearningFlowTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(all(page.closed for page in popup_pages))
 
 
+
+class _ConcurrentLocator:
+    def __init__(self, *, items=None, count_value=0, inner_text_value="", attribute=None):
+        self._items = items or []
+        self._count_value = count_value
+        self._inner_text_value = inner_text_value
+        self._attribute = attribute
+
+    @property
+    def last(self):
+        return self
+
+    async def wait_for(self):
+        return None
+
+    async def count(self):
+        return len(self._items) if self._items else self._count_value
+
+    def locator(self, _selector):
+        return self
+
+    def nth(self, index):
+        return self._items[index]
+
+    async def inner_text(self):
+        return self._inner_text_value
+
+    async def click(self):
+        return None
+
+    async def get_attribute(self, _name):
+        return self._attribute
+
+
+class _ConcurrentLearnItem:
+    def __init__(self, course_id):
+        self.course_id = course_id
+
+    def locator(self, selector):
+        if selector == ".iconfont.m-right.icon-reload":
+            return _ConcurrentLocator(count_value=0)
+        if selector == ".section-type":
+            return _ConcurrentLocator(inner_text_value="课程")
+        return _ConcurrentLocator()
+
+    async def get_attribute(self, _name):
+        return self.course_id
+
+
+class _ConcurrentPopupPage:
+    def __init__(self, learn_item):
+        self.learn_item = learn_item
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class _ConcurrentSubjectPage:
+    def __init__(self, course_ids):
+        self.main_frame = object()
+        self.url = "https://kc.zhixueyun.com/#/study/subject/detail/test-subject"
+        self.items = [_ConcurrentLearnItem(course_id) for course_id in course_ids]
+        self.popups = []
+
+    def locator(self, selector):
+        if selector == ".item.current-hover":
+            return _ConcurrentLocator(items=self.items)
+        raise AssertionError(f"unexpected selector: {selector}")
+
+    def expect_popup(self):
+        page = self
+
+        class PopupContextManager:
+            async def __aenter__(self):
+                popup = _ConcurrentPopupPage(page.items[len(page.popups)])
+                page.popups.append(popup)
+                info = type("PopupInfo", (), {})()
+                info.value = asyncio.Future()
+                info.value.set_result(popup)
+                return info
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        return PopupContextManager()
+
+
+class SubjectCourseConcurrencyTests(unittest.IsolatedAsyncioTestCase):
+    async def _run_subject(self, subject_page, fake_course_learning):
+        from core.learning_flows import subject_learning
+
+        with (
+            patch("core.learning_flows.SUBJECT_COURSE_CONCURRENCY", 2),
+            patch("core.learning_flows.pace", new=AsyncMock()),
+            patch("core.learning_flows.wait_for_subject_page_ready", new=AsyncMock()),
+            patch("core.learning_flows.check_permission", new=AsyncMock(return_value=True)),
+            patch("core.learning_flows.course_learning", new=fake_course_learning),
+            patch("core.learning_flows.record_learning_failure") as mock_record_failure,
+        ):
+            try:
+                await subject_learning(subject_page)
+            finally:
+                self.record_failure_calls = mock_record_failure.call_args_list
+
+    async def test_subject_courses_run_concurrently_up_to_limit(self):
+        subject_page = _ConcurrentSubjectPage(["a", "b", "c", "d"])
+        active = 0
+        max_active = 0
+
+        async def fake_course_learning(_page_detail, _learn_item):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await self._run_subject(subject_page, fake_course_learning)
+
+        self.assertEqual(max_active, 2)
+        self.assertEqual(len(subject_page.popups), 4)
+        self.assertTrue(all(popup.closed for popup in subject_page.popups))
+        self.assertEqual(self.record_failure_calls, [])
+
+    async def test_failed_course_is_recorded_and_raised_after_running_courses_finish(self):
+        subject_page = _ConcurrentSubjectPage(["slow", "broken", "never"])
+        finished = []
+
+        async def fake_course_learning(_page_detail, learn_item):
+            if learn_item.course_id == "broken":
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.02)
+            finished.append(learn_item.course_id)
+
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            await self._run_subject(subject_page, fake_course_learning)
+
+        self.assertEqual(finished, ["slow"])
+        self.assertEqual([popup.learn_item.course_id for popup in subject_page.popups], ["slow", "broken"])
+        self.assertTrue(all(popup.closed for popup in subject_page.popups))
+        self.assertEqual(len(self.record_failure_calls), 1)
+        self.assertEqual(
+            self.record_failure_calls[0].args[0],
+            "https://kc.zhixueyun.com/#/study/course/detail/broken",
+        )
+        self.assertEqual(self.record_failure_calls[0].kwargs["reason"], "retryable_error")
+
 if __name__ == "__main__":
     unittest.main()
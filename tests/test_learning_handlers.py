@@ -1,6 +1,6 @@
 import asyncio
 import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 
 class _FakeLocator:
@@ -43,6 +43,50 @@ class _FakePage:
         raise self._error_type("Target page, context or browser has been closed")
 
 
+class _FakeRequest:
+    def __init__(self, resource_type):
+        self.resource_type = resource_type
+
+
+class _FakeResponse:
+    def __init__(self, url, resource_type="xhr"):
+        self.url = url
+        self.request = _FakeRequest(resource_type)
+
+
+class _ProgressBox:
+    def __init__(self):
+        self.section_text = "总时长 01:00 需再学 00:31"
+
+    def locator(self, _selector):
+        return _FakeLocator(inner_text_value=self.section_text)
+
+
+class _EventPage:
+    def __init__(self):
+        self.listeners = {}
+        self.removed = []
+
+    def locator(self, selector):
+        if selector == ".register-mask-layer":
+            return _FakeLocator(all_values=[])
+        return _FakeLocator()
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.removed.append(event)
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, *args):
+        for handler in list(self.listeners.get(event, [])):
+            handler(*args)
+
+    async def wait_for_timeout(self, _milliseconds):
+        raise AssertionError("监听到进度接口时不应按固定时长等待")
+
+
 class LearningHandlerTests(unittest.IsolatedAsyncioTestCase):
     async def test_handle_video_cleans_up_background_tasks_when_page_closes(self):
         from core.learning_handlers import handle_video
@@ -56,9 +100,6 @@ class LearningHandlerTests(unittest.IsolatedAsyncioTestCase):
         async def never_finishing_timer(*args, **kwargs):
             await asyncio.Future()
 
-        async def never_finishing_popup_check(*args, **kwargs):
-            await asyncio.Future()
-
         def tracking_create_task(coro):
             task = original_create_task(coro)
             created_tasks.append(task)
@@ -66,14 +107,6 @@ class LearningHandlerTests(unittest.IsolatedAsyncioTestCase):
 
         with (
             patch("core.learning_handlers.timer", new=never_finishing_timer),
-            patch(
-                "core.learning_handlers.check_rating_popup_periodically",
-                new=never_finishing_popup_check,
-            ),
-            patch(
-                "core.learning_handlers.check_and_handle_rating_popup",
-                new=AsyncMock(return_value=False),
-            ),
             patch(
                 "core.learning_handlers.asyncio.create_task",
                 side_effect=tracking_create_task,
@@ -90,8 +123,55 @@ class LearningHandlerTests(unittest.IsolatedAsyncioTestCase):
         if created_tasks:
             await asyncio.gather(*created_tasks, return_exceptions=True)
 
-        self.assertEqual(len(created_tasks), 2)
-        self.assertEqual(task_states_before_cleanup, [True, True])
+        self.assertEqual(len(created_tasks), 1)
+        self.assertEqual(task_states_before_cleanup, [True])
+
+    async def test_handle_video_finishes_when_server_confirms_progress(self):
+        from core.learning_handlers import handle_video
+
+        page = _EventPage()
+        box = _ProgressBox()
+
+        async def slow_timer(*args, **kwargs):
+            await asyncio.Future()
+
+        async def report_progress():
+            await asyncio.sleep(0)
+            page.emit("response", _FakeResponse("https://example.com/api/static.js", "script"))
+            page.emit("response", _FakeResponse("https://example.com/api/course/other"))
+            box.section_text = "已完成"
+            page.emit("response", _FakeResponse("https://example.com/api/course/progress"))
+
+        with (
+            patch("core.learning_handlers.timer", new=slow_timer),
+            patch("core.learning_handlers._PROGRESS_CONFIRM_DELAYS", (0,)),
+        ):
+            reporter = asyncio.create_task(report_progress())
+            await asyncio.wait_for(handle_video(box, page), timeout=2)
+            await reporter
+
+        self.assertEqual(sorted(page.removed), ["close", "response"])
+        self.assertEqual(page.listeners, {"response": [], "close": []})
+
+    async def test_handle_video_raises_when_page_closes_while_waiting_for_server(self):
+        from core.learning_handlers import handle_video
+
+        page = _EventPage()
+
+        async def slow_timer(*args, **kwargs):
+            await asyncio.Future()
+
+        with (
+            patch("core.learning_handlers.timer", new=slow_timer),
+        ):
+            handler = asyncio.create_task(handle_video(_ProgressBox(), page))
+            while not page.listeners.get("close"):
+                await asyncio.sleep(0)
+            page.emit("close", page)
+            with self.assertRaisesRegex(Exception, "has been closed"):
+                await asyncio.wait_for(handler, timeout=2)
+
+        self.assertEqual(page.listeners, {"response": [], "close": []})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+
+class _FakePage:
+    def __init__(self):
+        self.scripts = []
+
+    async def evaluate(self, script):
+        self.scripts.append(script)
+
+
+class _FakeContext:
+    def __init__(self, pages=()):
+        self.pages = list(pages)
+        self.bindings = {}
+        self.init_scripts = []
+
+    async def expose_binding(self, name, callback):
+        if name in self.bindings:
+            raise Exception(f'Function "{name}" has been already registered')
+        self.bindings[name] = callback
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+
+class LearningPopupTests(unittest.IsolatedAsyncioTestCase):
+    async def test_watch_popups_registers_binding_once_and_covers_open_pages(self):
+        from core.learning_popups import POPUP_BINDING_NAME, POPUP_OBSERVER_SCRIPT, watch_popups
+
+        page = _FakePage()
+        context = _FakeContext([page])
+
+        await watch_popups(context)
+        await watch_popups(context)
+
+        self.assertEqual(list(context.bindings), [POPUP_BINDING_NAME])
+        self.assertEqual(context.init_scripts, [POPUP_OBSERVER_SCRIPT])
+        self.assertEqual(page.scripts, [POPUP_OBSERVER_SCRIPT])
+        self.assertIn(POPUP_BINDING_NAME, POPUP_OBSERVER_SCRIPT)
+
+    async def test_binding_dispatches_popup_kind_to_matching_handler(self):
+        from core.learning_popups import watch_popups
+
+        page = _FakePage()
+        context = _FakeContext()
+        rate = AsyncMock(return_value=True)
+        skip = AsyncMock(return_value=True)
+
+        with patch.dict("core.learning_popups._POPUP_HANDLERS", {"rating": rate, "interact": skip}):
+            await watch_popups(context)
+            callback = next(iter(context.bindings.values()))
+            callback({"page": page}, "rating")
+            callback({"page": page}, "unknown")
+            await asyncio.sleep(0)
+
+        rate.assert_awaited_once_with(page)
+        skip.assert_not_awaited()
+
+    async def test_skip_interact_popup_clicks_skip_button(self):
+        from core.learning_popups import skip_interact_popup
+
+        class FakeButton:
+            def __init__(self):
+                self.clicked = False
+
+            @property
+            def first(self):
+                return self
+
+            async def count(self):
+                return 1
+
+            async def click(self):
+                self.clicked = True
+
+        button = FakeButton()
+
+        class Page:
+            def locator(self, selector):
+                assert selector == "button:has-text('跳 过')"
+                return button
+
+        with patch("core.learning_popups.pace", new=AsyncMock()):
+            self.assertTrue(await skip_interact_popup(Page()))
+        self.assertTrue(button.clicked)
+
+
+if __name__ == "__main__":
+    unittest.main()
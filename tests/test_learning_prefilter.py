@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+COURSE_PREFIX = "https://kc.zhixueyun.com/#/study/course/detail/"
+SUBJECT_PREFIX = "https://kc.zhixueyun.com/#/study/subject/detail/"
+
+
+class _FakeResponse:
+    def __init__(self, data, status=200):
+        self._data = data
+        self.status = status
+        self.ok = 200 <= status < 300
+
+    async def json(self):
+        if isinstance(self._data, Exception):
+            raise self._data
+        return self._data
+
+
+class _FakeRequest:
+    def __init__(self, responses):
+        self._responses = responses
+        self.requested = []
+        self.active = 0
+        self.max_active = 0
+
+    async def get(self, url, timeout=None):
+        self.requested.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        response = self._responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class _FakeContext:
+    def __init__(self, responses):
+        self.request = _FakeRequest(responses)
+
+
+class LearningPrefilterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_prefilter_drops_completed_urls_and_keeps_unknown_ones(self):
+        from core.learning_prefilter import prefilter_learning_urls
+
+        urls = [f"{COURSE_PREFIX}a", f"{SUBJECT_PREFIX}b", f"{COURSE_PREFIX}c", f"{COURSE_PREFIX}d"]
+        context = _FakeContext(
+            {
+                "https://api.example.com/course/a": _FakeResponse({"data": {"progress": 100}}),
+                "https://api.example.com/subject/b": _FakeResponse({"data": [{"finishRate": "100%"}]}),
+                "https://api.example.com/course/c": _FakeResponse({"data": {"progress": 40}}),
+                "https://api.example.com/course/d": _FakeResponse({}, status=500),
+            }
+        )
+
+        with (
+            patch("core.learning_prefilter.AFK_PREFILTER_COURSE_API", "https://api.example.com/course/{id}"),
+            patch("core.learning_prefilter.AFK_PREFILTER_SUBJECT_API", "https://api.example.com/subject/{id}"),
+        ):
+            result = await prefilter_learning_urls(context, urls, concurrency=2)
+
+        self.assertEqual(result.remaining, [f"{COURSE_PREFIX}c", f"{COURSE_PREFIX}d"])
+        self.assertEqual(result.completed, [f"{COURSE_PREFIX}a", f"{SUBJECT_PREFIX}b"])
+        self.assertEqual(result.unknown, [f"{COURSE_PREFIX}d"])
+        self.assertEqual(len(context.request.requested), 4)
+        self.assertEqual(context.request.max_active, 2)
+
+    async def test_prefilter_keeps_all_urls_when_api_is_not_configured(self):
+        from core.learning_prefilter import prefilter_learning_urls
+
+        urls = [f"{COURSE_PREFIX}a", f"{SUBJECT_PREFIX}b"]
+        context = _FakeContext({})
+
+        with (
+            patch("core.learning_prefilter.AFK_PREFILTER_COURSE_API", None),
+            patch("core.learning_prefilter.AFK_PREFILTER_SUBJECT_API", None),
+            self.assertLogs(level="WARNING"),
+        ):
+            result = await prefilter_learning_urls(context, urls)
+
+        self.assertEqual(result.remaining, urls)
+        self.assertEqual(context.request.requested, [])
+
+    def test_find_progress_percent_uses_first_parsable_key_in_order(self):
+        from core.learning_prefilter import find_progress_percent
+
+        data = {"data": {"finishRate": "80%", "detail": {"progress": "n/a"}}}
+
+        self.assertEqual(find_progress_percent(data, ("progress", "finishRate")), 80.0)
+        self.assertIsNone(find_progress_percent({"progress": True}, ("progress",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -77,6 +77,23 @@ class LearningUtilityTests(unittest.TestCase):
 
         wait_with_progress.assert_not_awaited()
 
+    def test_timer_shows_progress_only_when_dashboard_is_listening(self):
+        from core.learning_common import timer
+        from core.progress import use_progress_listener
+
+        with (
+            patch("core.ui.wait_with_progress", new_callable=AsyncMock) as wait_with_progress,
+            patch("core.learning_common.asyncio.sleep", new_callable=AsyncMock) as fake_sleep,
+        ):
+            asyncio.run(timer(10, fallback_interval=4, description="视频学习进度"))
+            self.assertEqual([call.args[0] for call in fake_sleep.await_args_list], [4, 4, 2])
+            wait_with_progress.assert_not_awaited()
+
+            with use_progress_listener(lambda event: None):
+                asyncio.run(timer(10, fallback_interval=4, description="视频学习进度"))
+
+        wait_with_progress.assert_awaited_once_with(10, description="视频学习进度")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,93 @@
+import asyncio
 import unittest
+from unittest.mock import patch
 
-from core.learning_zone import extract_learning_links_from_learning_zone_html
+from core.learning_zone import (
+    extract_learning_links_from_learning_zone_html,
+    extract_learning_links_from_learning_zone_json,
+)
+
+COURSE = "https://kc.zhixueyun.com/#/study/course/detail/"
+SUBJECT = "https://kc.zhixueyun.com/#/study/subject/detail/"
+
+
+def _zone_id(number: int) -> str:
+    return f"{number:08d}-1111-1111-1111-111111111111"
+
+
+class _FakeRequest:
+    resource_type = "xhr"
+
+
+ZONE_URL = "https://cms.mylearning.cn/safe/topic/resource/2025/zycp/pc.html"
+LIST_API_URL = "https://kc.zhixueyun.com/api/v1/course-study/zone-resource/page"
+
+
+class _FakeResponse:
+    def __init__(self, data, url=LIST_API_URL):
+        self.request = _FakeRequest()
+        self.headers = {"content-type": "application/json;charset=UTF-8"}
+        self.url = url
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+class _FakeZonePage:
+    """每次翻页/滚动返回下一页接口数据，页面上始终只渲染第一条链接。"""
+
+    def __init__(self, pages, *, navigate_on_load_more=None):
+        self._pages = list(pages)
+        self._navigate_on_load_more = navigate_on_load_more
+        self.url = "about:blank"
+        self.listeners = {}
+        self.load_more_count = 0
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def _serve_next_page(self):
+        if not self._pages:
+            return
+        request = _FakeRequest()
+        data = self._pages.pop(0)
+        response = data if isinstance(data, _FakeResponse) else _FakeResponse(data)
+        for handler in self.listeners.get("request", []):
+            handler(request)
+        for handler in self.listeners.get("response", []):
+            handler(response)
+        for handler in self.listeners.get("requestfinished", []):
+            handler(request)
+
+    async def goto(self, url, wait_until=None):
+        self.url = url
+        self._serve_next_page()
+
+    async def evaluate(self, _script, _arg=None):
+        self.load_more_count += 1
+        if self._navigate_on_load_more:
+            self.url = self._navigate_on_load_more
+        self._serve_next_page()
+
+    def locator(self, _selector):
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    async def count(self):
+        return 0
+
+    async def eval_on_selector_all(self, _selector, _script):
+        return [
+            f"https://kc.zhixueyun.com/app/#/resource?businessType=1&businessId={_zone_id(1)}",
+            "https://example.com/ignore",
+        ]
 
 
 class LearningZoneParsingTests(unittest.TestCase):
@@ -26,6 +113,110 @@ class LearningZoneParsingTests(unittest.TestCase):
             ],
         )
 
+    def test_extract_learning_links_from_learning_zone_json_reads_business_items_and_urls(self):
+        data = {
+            "code": 0,
+            "data": {
+                "list": [
+                    {"businessId": _zone_id(1), "businessType": 1, "name": "课程A"},
+                    {"businessId": _zone_id(2), "businessType": "2", "name": "主题B"},
+                    {"businessId": _zone_id(3), "businessType": 3, "name": "其他资源"},
+                    {"link": f"{COURSE}{_zone_id(4)}"},
+                    {"businessId": _zone_id(1), "businessType": 1, "name": "课程A重复"},
+                ],
+                "total": 4,
+            },
+        }
+
+        self.assertEqual(
+            extract_learning_links_from_learning_zone_json(data),
+            [f"{COURSE}{_zone_id(1)}", f"{SUBJECT}{_zone_id(2)}", f"{COURSE}{_zone_id(4)}"],
+        )
+
+    def test_extract_learning_links_from_learning_zone_json_ignores_fields_outside_lists(self):
+        data = {
+            "banner": {"businessId": _zone_id(1), "businessType": 1},
+            "more": f"{COURSE}{_zone_id(2)}",
+            "data": {"items": [{"businessId": _zone_id(3), "businessType": 1}]},
+        }
+
+        self.assertEqual(
+            extract_learning_links_from_learning_zone_json(data),
+            [f"{COURSE}{_zone_id(3)}"],
+        )
+
+
+class LearningZoneCollectionTests(unittest.IsolatedAsyncioTestCase):
+    async def test_collect_learning_zone_page_links_pages_until_no_new_items(self):
+        from core.learning_zone import collect_learning_zone_page_links
+
+        pages = [
+            {
+                "list": [
+                    {"businessId": _zone_id(1), "businessType": 1},
+                    {"businessId": _zone_id(2), "businessType": 1},
+                ]
+            },
+            {"list": [{"businessId": _zone_id(3), "businessType": 2}]},
+            {"list": [{"businessId": _zone_id(3), "businessType": 2}]},
+            {"list": [{"businessId": _zone_id(4), "businessType": 1}]},
+        ]
+        page = _FakeZonePage(pages)
+
+        with patch("core.learning_zone.LEARNING_ZONE_QUIET_SECONDS", 0.01):
+            links = await asyncio.wait_for(
+                collect_learning_zone_page_links(page, ZONE_URL),
+                timeout=2,
+            )
+
+        self.assertEqual(
+            links,
+            [f"{COURSE}{_zone_id(1)}", f"{COURSE}{_zone_id(2)}", f"{SUBJECT}{_zone_id(3)}"],
+        )
+        self.assertEqual(page.load_more_count, 2)
+        self.assertTrue(all(not handlers for handlers in page.listeners.values()))
+
+    async def test_collect_learning_zone_page_links_ignores_responses_outside_list_api(self):
+        from core.learning_zone import collect_learning_zone_page_links
+
+        pages = [
+            {"list": [{"businessId": _zone_id(2), "businessType": 1}]},
+            _FakeResponse(
+                {"list": [{"businessId": _zone_id(3), "businessType": 1}]},
+                url="https://kc.zhixueyun.com/api/v1/system/recommend",
+            ),
+        ]
+        page = _FakeZonePage(pages)
+
+        with patch("core.learning_zone.LEARNING_ZONE_QUIET_SECONDS", 0.01):
+            links = await asyncio.wait_for(
+                collect_learning_zone_page_links(page, ZONE_URL),
+                timeout=2,
+            )
+
+        self.assertEqual(links, [f"{COURSE}{_zone_id(2)}", f"{COURSE}{_zone_id(1)}"])
+
+    async def test_collect_learning_zone_page_links_stops_when_page_navigates_away(self):
+        from core.learning_zone import collect_learning_zone_page_links
+
+        pages = [
+            {"list": [{"businessId": _zone_id(2), "businessType": 1}]},
+            {"list": [{"businessId": _zone_id(3), "businessType": 1}]},
+        ]
+        page = _FakeZonePage(
+            pages,
+            navigate_on_load_more="https://cms.mylearning.cn/safe/topic/other.html",
+        )
+
+        with patch("core.learning_zone.LEARNING_ZONE_QUIET_SECONDS", 0.01):
+            links = await asyncio.wait_for(
+                collect_learning_zone_page_links(page, ZONE_URL),
+                timeout=2,
+            )
+
+        self.assertEqual(links, [f"{COURSE}{_zone_id(2)}", f"{COURSE}{_zone_id(1)}"])
+        self.assertEqual(page.load_more_count, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
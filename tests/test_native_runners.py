@@ -171,6 +171,49 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
             self.assertTrue(learning_file.exists())
             self.assertEqual(json.loads(learning_file.read_text(encoding="utf-8")), [])
 
+    async def test_run_afk_once_drains_sqlite_learning_queue(self):
+        from core.afk_runner import AfkBatch, run_afk_once
+        from core.learning_queue import read_learning_urls, write_learning_urls
+
+        class FakeContext:
+            pass
+
+        class FakeBrowserContextManager:
+            async def __aenter__(self):
+                return None, FakeContext()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        with TemporaryDirectory() as tmp, patch("core.queue_db.QUEUE_BACKEND", "sqlite"):
+            learning_file = Path(tmp) / "learning.json"
+            write_learning_urls(
+                ["https://kc.zhixueyun.com/#/study/course/detail/a"],
+                file_path=learning_file,
+            )
+            batch = AfkBatch(
+                urls=["https://kc.zhixueyun.com/#/study/course/detail/a"],
+                is_retry=False,
+            )
+
+            with (
+                patch("core.afk_runner.LEARNING_URLS_FILE", learning_file),
+                patch("core.afk_runner.prepare_afk_batch", return_value=batch),
+                patch(
+                    "core.afk_runner.create_browser_context",
+                    return_value=FakeBrowserContextManager(),
+                ),
+                patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
+                patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner._process_url", new=AsyncMock(return_value=False)),
+                patch("core.afk_runner._recheck_url_type_links", new=AsyncMock()),
+            ):
+                needs_retry = await run_afk_once()
+
+            self.assertFalse(needs_retry)
+            self.assertFalse(learning_file.exists())
+            self.assertEqual(read_learning_urls(file_path=learning_file), [])
+
     async def test_run_afk_once_removes_failed_url_from_learning_queue(self):
         from core.afk_runner import AfkBatch, run_afk_once
 
@@ -221,6 +264,167 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
             self.assertFalse(needs_retry)
             self.assertEqual(json.loads(learning_file.read_text(encoding="utf-8")), [])
 
+    async def test_run_afk_once_runs_urls_concurrently_with_worker_pool(self):
+        import asyncio
+
+        from core.afk_runner import AfkBatch, run_afk_once
+
+        class FakeContext:
+            pass
+
+        class FakeBrowserContextManager:
+            async def __aenter__(self):
+                return None, FakeContext()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        urls = [
+            "https://kc.zhixueyun.com/#/study/course/detail/a",
+            "https://kc.zhixueyun.com/#/study/course/detail/b",
+            "https://kc.zhixueyun.com/#/study/course/detail/c",
+        ]
+        active = 0
+        max_active = 0
+
+        async def fake_process_url(_context, _url, _handler):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return False
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            _write_learning_queue_fixture(learning_file, urls)
+            batch = AfkBatch(urls=urls, is_retry=False)
+
+            with (
+                patch("core.afk_runner.LEARNING_URLS_FILE", learning_file),
+                patch("core.afk_runner.prepare_afk_batch", return_value=batch),
+                patch(
+                    "core.afk_runner.create_browser_context",
+                    return_value=FakeBrowserContextManager(),
+                ),
+                patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
+                patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner._process_url", new=AsyncMock(side_effect=fake_process_url)) as mock_process,
+                patch("core.afk_runner._recheck_url_type_links", new=AsyncMock()),
+            ):
+                await run_afk_once(concurrency=2)
+
+            self.assertEqual(mock_process.await_count, 3)
+            self.assertEqual(max_active, 2)
+            self.assertEqual(json.loads(learning_file.read_text(encoding="utf-8")), [])
+
+    async def test_run_afk_once_skips_urls_completed_by_prefilter(self):
+        from core.afk_runner import AfkBatch, run_afk_once
+        from core.learning_prefilter import PrefilterResult
+
+        class FakeContext:
+            pass
+
+        class FakeBrowserContextManager:
+            async def __aenter__(self):
+                return None, FakeContext()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        urls = [
+            "https://kc.zhixueyun.com/#/study/course/detail/a",
+            "https://kc.zhixueyun.com/#/study/course/detail/b",
+        ]
+        remaining_queue_snapshots = []
+
+        async def fake_process_url(_context, url, _handler):
+            remaining_queue_snapshots.append(_read_learning_queue_urls(learning_file))
+            return False
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            _write_learning_queue_fixture(learning_file, urls)
+            batch = AfkBatch(urls=urls, is_retry=False)
+
+            with (
+                patch("core.afk_runner.LEARNING_URLS_FILE", learning_file),
+                patch("core.afk_runner.AFK_PREFILTER", True),
+                patch("core.afk_runner.prepare_afk_batch", return_value=batch),
+                patch(
+                    "core.afk_runner.create_browser_context",
+                    return_value=FakeBrowserContextManager(),
+                ),
+                patch(
+                    "core.afk_runner.prefilter_learning_urls",
+                    new=AsyncMock(
+                        return_value=PrefilterResult(remaining=[urls[1]], completed=[urls[0]])
+                    ),
+                ),
+                patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
+                patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner._process_url", new=AsyncMock(side_effect=fake_process_url)) as mock_process,
+                patch("core.afk_runner._recheck_url_type_links", new=AsyncMock()),
+            ):
+                await run_afk_once()
+
+            self.assertEqual([call.args[1] for call in mock_process.await_args_list], [urls[1]])
+            self.assertEqual(remaining_queue_snapshots, [[urls[1]]])
+            self.assertEqual(_read_learning_queue_urls(learning_file), [])
+
+    async def test_run_afk_once_learns_urls_in_longest_first_order(self):
+        from core.afk_runner import AfkBatch, run_afk_once
+        from core.afk_scheduler import AfkSchedule
+
+        class FakeContext:
+            pass
+
+        class FakeBrowserContextManager:
+            async def __aenter__(self):
+                return None, FakeContext()
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        urls = [
+            "https://kc.zhixueyun.com/#/study/course/detail/short",
+            "https://kc.zhixueyun.com/#/study/course/detail/long",
+        ]
+        statuses = []
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            _write_learning_queue_fixture(learning_file, urls)
+            batch = AfkBatch(urls=urls, is_retry=False)
+            schedule = AfkSchedule(urls=list(reversed(urls)))
+
+            with (
+                patch("core.afk_runner.LEARNING_URLS_FILE", learning_file),
+                patch("core.afk_runner.AFK_LONGEST_FIRST", True),
+                patch("core.afk_runner.prepare_afk_batch", return_value=batch),
+                patch(
+                    "core.afk_runner.create_browser_context",
+                    return_value=FakeBrowserContextManager(),
+                ),
+                patch(
+                    "core.afk_runner.schedule_longest_first",
+                    new=AsyncMock(return_value=schedule),
+                ) as mock_schedule,
+                patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
+                patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner._process_url", new=AsyncMock(return_value=False)) as mock_process,
+                patch("core.afk_runner._recheck_url_type_links", new=AsyncMock()),
+            ):
+                await run_afk_once(statuses.append, concurrency=1)
+
+            self.assertEqual(mock_schedule.await_args.kwargs["workers"], 1)
+            self.assertEqual(
+                [call.args[1] for call in mock_process.await_args_list],
+                list(reversed(urls)),
+            )
+            self.assertIn("挂课 1/2: https://kc.zhixueyun.com/#/study/course/detail/long", statuses)
+
+    @patch("core.afk_runner.pace", new=AsyncMock())
     async def test_process_url_records_retryable_failure_to_learning_failures(self):
         from core.afk_runner import _process_url
 
@@ -377,6 +581,7 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
                 ],
             )
 
+    @patch("core.afk_runner.pace", new=AsyncMock())
     async def test_run_afk_once_skips_current_url_and_continues_when_only_course_tab_is_closed(self):
         from core.afk_runner import AfkBatch, run_afk_once
 
@@ -430,6 +635,7 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
                 ),
                 patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
                 patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner.watch_popups", new=AsyncMock()),
                 patch(
                     "core.afk_runner.course_learning",
                     new=AsyncMock(
@@ -450,6 +656,7 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(json.loads(learning_file.read_text(encoding="utf-8")), [])
             mock_warning.assert_not_called()
 
+    @patch("core.afk_runner.pace", new=AsyncMock())
     async def test_run_afk_once_exits_without_saving_retry_urls_when_browser_window_is_closed(self):
         from core.abort import UserAbortRequested
         from core.afk_runner import AfkBatch, run_afk_once
@@ -504,6 +711,7 @@ class AfkGracefulExitTests(unittest.IsolatedAsyncioTestCase):
                 ),
                 patch("core.afk_runner.normalize_url", side_effect=lambda url: url),
                 patch("core.afk_runner.is_compliant_url_regex", return_value=True),
+                patch("core.afk_runner.watch_popups", new=AsyncMock()),
                 patch(
                     "core.afk_runner.course_learning",
                     new=AsyncMock(
@@ -553,7 +761,7 @@ class AiExamRunnerTests(unittest.IsolatedAsyncioTestCase):
             patch("core.exam_runner.OPENAI_COMPLETION_BASE_URL", "https://openai-compatible.example/v1"),
             patch("core.exam_runner.OPENAI_COMPLETION_API_KEY", "test-key"),
             patch("core.exam_runner.MODEL_NAME", "test-model"),
-            patch("core.exam_runner.OpenAI") as mock_openai,
+            patch("core.exam_runner.AsyncOpenAI") as mock_openai,
         ):
             client, model = exam_runner._build_exam_client()
 
@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+
+class PacingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_pace_sleeps_configured_delay_for_action_type(self):
+        from core.pacing import pace
+
+        with (
+            patch.dict("core.pacing.AFK_PACING", {"navigate": 2500, "popup": 0}),
+            patch("core.pacing.asyncio.sleep", new=AsyncMock()) as sleep,
+        ):
+            await pace("navigate")
+            await pace("popup")
+
+        sleep.assert_awaited_once_with(2.5)
+
+    async def test_unknown_action_type_is_rejected(self):
+        from core.pacing import pace
+
+        with self.assertRaises(ValueError):
+            await pace("read")
+
+    def test_default_pacing_covers_every_paced_action(self):
+        from core.config import AFK_PACING
+
+        self.assertEqual(set(AFK_PACING), {"navigate", "open_popup", "play", "popup"})
+
+
+if __name__ == "__main__":
+    unittest.main()
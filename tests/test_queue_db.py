@@ -0,0 +1,161 @@
+import json
+import sqlite3
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+
+MODEL_CONFIG = {
+    "model": "test-model",
+    "request_type": "responses",
+    "web_search": False,
+    "thinking": False,
+    "reasoning_effort": None,
+}
+
+
+class SqliteQueueBackendTests(unittest.TestCase):
+    def test_queue_apis_use_sqlite_database_when_backend_is_sqlite(self):
+        from core.exam_queue import (
+            append_exam_url,
+            count_exam_urls,
+            has_ai_failed_model_config,
+            record_ai_failed_model_config,
+        )
+        from core.learning_queue import (
+            append_learning_urls,
+            count_learning_failures,
+            count_learning_urls,
+            read_learning_failures,
+            read_learning_urls,
+            record_learning_failure,
+        )
+        from core.manual_exam_queue import append_manual_exam_entry, read_manual_exam_queue
+
+        with TemporaryDirectory() as tmp, patch("core.queue_db.QUEUE_BACKEND", "sqlite"):
+            learning_file = Path(tmp) / "课程链接.json"
+            failures_file = Path(tmp) / "挂课失败链接.json"
+            exam_file = Path(tmp) / "考试链接.json"
+            manual_file = Path(tmp) / "人工考试链接.json"
+
+            append_learning_urls(
+                ["https://example.com/course/2", "https://example.com/course/1"],
+                file_path=learning_file,
+            )
+            append_learning_urls(["https://example.com/course/2"], file_path=learning_file)
+            record_learning_failure(
+                "https://example.com/course/3",
+                reason="no_permission",
+                reason_text="无权限访问该学习资源",
+                file_path=failures_file,
+            )
+            append_exam_url("https://example.com/exam/1", file_path=exam_file)
+            record_ai_failed_model_config(
+                "https://example.com/exam/1",
+                MODEL_CONFIG,
+                file_path=exam_file,
+            )
+            append_manual_exam_entry(
+                "https://example.com/exam/1",
+                reason="ai_failed",
+                reason_text="AI 自动考试仍未通过",
+                file_path=manual_file,
+            )
+
+            self.assertEqual(
+                read_learning_urls(learning_file),
+                ["https://example.com/course/2", "https://example.com/course/1"],
+            )
+            self.assertEqual(read_learning_failures(failures_file)[0].reason, "no_permission")
+            self.assertTrue(
+                has_ai_failed_model_config(
+                    "https://example.com/exam/1",
+                    MODEL_CONFIG,
+                    file_path=exam_file,
+                )
+            )
+            self.assertEqual(read_manual_exam_queue(manual_file)[0].reason, "ai_failed")
+
+            with patch("core.learning_queue.read_learning_urls") as read_urls:
+                self.assertEqual(count_learning_urls(learning_file), 2)
+            read_urls.assert_not_called()
+            self.assertEqual(count_learning_failures(failures_file), 1)
+            self.assertEqual(count_exam_urls(exam_file), 1)
+
+            self.assertEqual(
+                sorted(path.name for path in Path(tmp).glob("*.json")),
+                [],
+            )
+            with sqlite3.connect(Path(tmp) / "queue_state.sqlite3") as connection:
+                indexes = {
+                    row[0]
+                    for row in connection.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'index'"
+                    )
+                }
+            self.assertIn("idx_learning_failures_reason", indexes)
+            self.assertIn("idx_exam_urls_url", indexes)
+
+    def test_import_and_export_round_trip_json_queue_files(self):
+        from core.exam_queue import record_ai_failed_model_config
+        from core.learning_queue import append_learning_urls, record_learning_failure
+        from core.queue_db import export_json_queues, import_json_queues, main
+
+        with TemporaryDirectory() as tmp:
+            queue_dir = Path(tmp)
+            append_learning_urls(
+                ["https://example.com/course/1", "https://example.com/course/2"],
+                file_path=queue_dir / "课程链接.json",
+            )
+            record_learning_failure(
+                "https://example.com/course/3",
+                reason="retryable_error",
+                reason_text="挂课处理失败",
+                detail={"source": "subject_course"},
+                file_path=queue_dir / "挂课失败链接.json",
+            )
+            record_ai_failed_model_config(
+                "https://example.com/exam/1",
+                MODEL_CONFIG,
+                file_path=queue_dir / "考试链接.json",
+            )
+            original = {
+                path.name: path.read_text(encoding="utf-8")
+                for path in queue_dir.glob("*.json")
+            }
+
+            self.assertEqual(
+                import_json_queues(queue_dir),
+                {"课程链接.json": 2, "挂课失败链接.json": 1, "考试链接.json": 1},
+            )
+            for path in queue_dir.glob("*.json"):
+                path.unlink()
+
+            with patch("core.queue_db.QUEUE_BACKEND", "sqlite"):
+                from core.learning_queue import count_learning_urls
+
+                self.assertEqual(count_learning_urls(queue_dir / "课程链接.json"), 2)
+
+            output = StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(main(["export", "--dir", str(queue_dir)]), 0)
+
+            self.assertIn("已导出 课程链接.json: 2 条", output.getvalue())
+            exported = {
+                path.name: path.read_text(encoding="utf-8")
+                for path in queue_dir.glob("*.json")
+            }
+            self.assertEqual(exported, original)
+            self.assertEqual(
+                json.loads(exported["考试链接.json"])[0]["ai_failed_model_configs"],
+                [MODEL_CONFIG],
+            )
+            self.assertEqual(export_json_queues(queue_dir)["人工考试链接.json"], 0)
+            self.assertFalse((queue_dir / "人工考试链接.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import json
+import multiprocessing
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+
+def _append_urls_in_process(file_path: str, prefix: str, count: int) -> None:
+    from core.learning_queue import append_learning_url
+
+    for index in range(count):
+        append_learning_url(f"{prefix}/{index}", file_path=Path(file_path))
+
+
+MODEL_CONFIG = {
+    "model": "test-model",
+    "request_type": "responses",
+    "web_search": False,
+    "thinking": False,
+    "reasoning_effort": None,
+}
+
+
+class QueueStoreTests(unittest.TestCase):
+    def test_store_reads_each_file_once_and_writes_same_format_on_close(self):
+        from core import learning_queue
+        from core.learning_queue import read_learning_failures, record_learning_failure
+        from core.queue_store import QueueStore, use_queue_store
+
+        with TemporaryDirectory() as tmp:
+            direct_file = Path(tmp) / "direct.json"
+            stored_file = Path(tmp) / "stored.json"
+            for index in range(3):
+                record_learning_failure(
+                    f"https://example.com/course/{index}",
+                    reason="retryable_error",
+                    reason_text=f"失败 {index}",
+                    file_path=direct_file,
+                )
+
+            with patch.object(
+                learning_queue,
+                "_read_learning_failures_file",
+                wraps=learning_queue._read_learning_failures_file,
+            ) as read_file:
+                with use_queue_store(QueueStore(flush_delay=60, max_flush_delay=60)):
+                    for index in range(3):
+                        record_learning_failure(
+                            f"https://example.com/course/{index}",
+                            reason="retryable_error",
+                            reason_text=f"失败 {index}",
+                            file_path=stored_file,
+                        )
+                    self.assertEqual(len(read_learning_failures(stored_file)), 3)
+                    self.assertFalse(stored_file.exists())
+
+            self.assertEqual(read_file.call_count, 1)
+            self.assertEqual(
+                stored_file.read_text(encoding="utf-8"),
+                direct_file.read_text(encoding="utf-8"),
+            )
+
+    def test_background_thread_flushes_debounced_snapshot(self):
+        from core.exam_queue import append_exam_url
+        from core.queue_store import QueueStore, use_queue_store
+
+        with TemporaryDirectory() as tmp:
+            exam_file = Path(tmp) / "exam.json"
+            store = QueueStore(flush_delay=0.01, max_flush_delay=0.05)
+            with use_queue_store(store):
+                append_exam_url("https://example.com/exam/1", file_path=exam_file)
+                append_exam_url("https://example.com/exam/2", file_path=exam_file)
+                deadline = time.monotonic() + 2
+                while not exam_file.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                self.assertEqual(
+                    [entry["url"] for entry in json.loads(exam_file.read_text(encoding="utf-8"))],
+                    ["https://example.com/exam/1", "https://example.com/exam/2"],
+                )
+            self.assertGreaterEqual(store.flush_count, 1)
+            self.assertEqual(list(Path(tmp).glob("*.tmp")), [])
+
+    def test_empty_queue_without_keep_file_is_deleted_on_flush(self):
+        from core.learning_queue import write_learning_urls
+        from core.queue_store import QueueStore, use_queue_store
+
+        with TemporaryDirectory() as tmp:
+            learning_file = Path(tmp) / "learning.json"
+            write_learning_urls(["https://example.com/course/1"], file_path=learning_file)
+
+            with use_queue_store(QueueStore(flush_delay=60, max_flush_delay=60)):
+                write_learning_urls([], file_path=learning_file, keep_file=False)
+                self.assertTrue(learning_file.exists())
+
+            self.assertFalse(learning_file.exists())
+
+    def test_nested_use_reuses_active_store(self):
+        from core.queue_store import get_active_queue_store, use_queue_store
+
+        with use_queue_store() as outer:
+            with use_queue_store() as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(get_active_queue_store(), outer)
+        self.assertIsNone(get_active_queue_store())
+
+    def test_record_ai_failed_model_config_reads_queue_once(self):
+        from core import exam_queue
+
+        with TemporaryDirectory() as tmp:
+            exam_file = Path(tmp) / "exam.json"
+            exam_queue.append_exam_url("https://example.com/exam/1", file_path=exam_file)
+
+            with patch.object(
+                exam_queue,
+                "read_exam_queue",
+                wraps=exam_queue.read_exam_queue,
+            ) as read_queue:
+                exam_queue.record_ai_failed_model_config(
+                    "https://example.com/exam/1",
+                    MODEL_CONFIG,
+                    file_path=exam_file,
+                )
+
+            self.assertEqual(read_queue.call_count, 1)
+            self.assertTrue(
+                exam_queue.has_ai_failed_model_config(
+                    "https://example.com/exam/1",
+                    MODEL_CONFIG,
+                    file_path=exam_file,
+                )
+            )
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_atomic_write_text_replaces_file_without_leaving_temp_files(self):
+        from core.file_ops import atomic_write_text
+
+        with TemporaryDirectory() as tmp:
+            target = Path(tmp) / "课程链接.json"
+            target.write_text("old", encoding="utf-8")
+
+            atomic_write_text(target, "[]")
+
+            self.assertEqual(target.read_text(encoding="utf-8"), "[]")
+            self.assertEqual(sorted(path.name for path in Path(tmp).iterdir()), ["课程链接.json"])
+
+
+class QueueFileLockTests(unittest.TestCase):
+    def test_locked_file_is_reentrant_and_leaves_sidecar_lock_file(self):
+        from core.file_ops import atomic_write_text, lock_file_path, locked_file
+
+        with TemporaryDirectory() as tmp:
+            target = Path(tmp) / "课程链接.json"
+
+            with locked_file(target):
+                with locked_file(target):
+                    atomic_write_text(target, "[]")
+
+            self.assertEqual(target.read_text(encoding="utf-8"), "[]")
+            self.assertTrue(lock_file_path(target).exists())
+            self.assertEqual(lock_file_path(target).name, "课程链接.json.lock")
+
+    def test_locked_file_blocks_other_threads_until_released(self):
+        from core.file_ops import locked_file
+
+        with TemporaryDirectory() as tmp:
+            target = Path(tmp) / "课程链接.json"
+            events = []
+
+            def contender():
+                with locked_file(target):
+                    events.append("contender")
+
+            with locked_file(target):
+                thread = threading.Thread(target=contender)
+                thread.start()
+                thread.join(0.2)
+                events.append("owner")
+            thread.join()
+
+            self.assertEqual(events, ["owner", "contender"])
+
+    def test_concurrent_processes_do_not_lose_appended_urls(self):
+        from core.learning_queue import read_learning_urls
+
+        with TemporaryDirectory() as tmp:
+            target = Path(tmp) / "课程链接.json"
+            mp_context = multiprocessing.get_context("spawn")
+            processes = [
+                mp_context.Process(
+                    target=_append_urls_in_process,
+                    args=(str(target), f"https://example.com/course/{worker}", 20),
+                )
+                for worker in range(3)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join(60)
+
+            self.assertEqual([process.exitcode for process in processes], [0, 0, 0])
+            self.assertEqual(len(read_learning_urls(file_path=target)), 60)
+
+    def test_other_process_appends_are_kept_while_store_is_active(self):
+        from core.learning_queue import append_learning_url, read_learning_urls
+        from core.queue_store import QueueStore, use_queue_store
+
+        with TemporaryDirectory() as tmp:
+            target = Path(tmp) / "课程链接.json"
+            mp_context = multiprocessing.get_context("spawn")
+
+            def append_in_other_process(prefix):
+                process = mp_context.Process(
+                    target=_append_urls_in_process,
+                    args=(str(target), prefix, 5),
+                )
+                process.start()
+                process.join(60)
+                self.assertEqual(process.exitcode, 0)
+
+            with use_queue_store(QueueStore(flush_delay=60, max_flush_delay=60)):
+                append_learning_url("https://example.com/local/1", file_path=target)
+                append_in_other_process("https://example.com/worker-a")
+                # 加锁的追加先合并磁盘上其他进程写入的条目
+                append_learning_url("https://example.com/local/2", file_path=target)
+                self.assertEqual(len(read_learning_urls(file_path=target)), 7)
+                append_in_other_process("https://example.com/worker-b")
+
+            # 写回时与磁盘内容合并，不覆盖其他进程的追加
+            urls = read_learning_urls(file_path=target)
+            self.assertEqual(len(urls), 12)
+            self.assertEqual(urls[:2], ["https://example.com/local/1", "https://example.com/worker-a/0"])
+            self.assertIn("https://example.com/local/2", urls)
+            self.assertIn("https://example.com/worker-b/4", urls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+
+class _FakeReadyLocator:
+    def __init__(self, page, selector):
+        self._page = page
+        self._selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    async def wait_for(self, state="visible", timeout=None):
+        self._page.calls.append(("wait_for", self._selector, state, timeout))
+        if self._page.fail:
+            raise TimeoutError("Timeout exceeded")
+
+
+class _FakeReadyPage:
+    def __init__(self, *, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def locator(self, selector):
+        return _FakeReadyLocator(self, selector)
+
+    async def wait_for_function(self, script, arg=None, timeout=None, polling=None):
+        self.calls.append(("wait_for_function", arg, timeout, polling))
+        if self.fail:
+            raise TimeoutError("Timeout exceeded")
+
+
+class ReadinessTests(unittest.IsolatedAsyncioTestCase):
+    async def test_question_changed_waits_for_stem_different_from_previous_text(self):
+        from core.readiness import SINGLE_QUESTION_STEM_SELECTOR, wait_for_question_changed
+
+        page = _FakeReadyPage()
+        with patch("core.readiness.PAGE_READY_TIMEOUT", 3):
+            ready = await wait_for_question_changed(page, " 上一题题干 \n")
+
+        self.assertTrue(ready)
+        self.assertEqual(
+            page.calls,
+            [("wait_for_function", [SINGLE_QUESTION_STEM_SELECTOR, "上一题题干"], 3000, 100)],
+        )
+
+    async def test_timeout_is_not_raised_and_is_counted_in_report(self):
+        from core.readiness import track_readiness, wait_for_course_page_ready
+
+        page = _FakeReadyPage(fail=True)
+        with self.assertLogs(level="INFO") as logs:
+            with track_readiness("本次考试") as report:
+                ready = await wait_for_course_page_ready(page)
+
+        self.assertFalse(ready)
+        self.assertEqual(report.waits, 1)
+        self.assertEqual(report.timeouts, 1)
+        self.assertEqual(report.baseline_seconds, 1.5)
+        self.assertTrue(any("本次考试页面就绪等待 1 次" in line for line in logs.output))
+
+    async def test_report_accumulates_saved_seconds_against_fixed_waits(self):
+        from core.readiness import (
+            get_active_readiness_report,
+            track_readiness,
+            wait_for_course_exam_tab_ready,
+            wait_for_exam_page_ready,
+        )
+
+        page = _FakeReadyPage()
+        with track_readiness("本课程") as report:
+            await wait_for_exam_page_ready(page)
+            await wait_for_course_exam_tab_ready(page)
+
+        self.assertIsNone(get_active_readiness_report())
+        self.assertEqual(report.waits, 2)
+        self.assertEqual(report.timeouts, 0)
+        self.assertAlmostEqual(report.baseline_seconds, 2.5)
+        self.assertGreater(report.saved_seconds, 2.0)
+        self.assertEqual([call[2] for call in page.calls], ["visible", "visible"])
+
+    async def test_waits_outside_tracked_scope_are_not_reported(self):
+        from core.readiness import ReadinessReport, wait_for_course_exam_tab_ready
+
+        page = _FakeReadyPage()
+        with patch.object(ReadinessReport, "record") as record:
+            self.assertTrue(await wait_for_course_exam_tab_ready(page, timeout_ms=1000))
+
+        record.assert_not_called()
+        self.assertEqual(page.calls[0][3], 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
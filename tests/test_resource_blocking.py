@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import patch
+
+COURSE_URL = "https://kc.zhixueyun.com/#/study/course/detail/a"
+SUBJECT_URL = "https://kc.zhixueyun.com/#/study/subject/detail/b"
+
+
+class _FakePage:
+    def __init__(self, url):
+        self.url = url
+        self.main_frame = _FakeFrame(self)
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+
+class _FakeFrame:
+    def __init__(self, page):
+        self.page = page
+
+
+class _FakeRequest:
+    def __init__(self, page, url, resource_type, *, navigation=False):
+        self.frame = page.main_frame
+        self.url = url
+        self.resource_type = resource_type
+        self._navigation = navigation
+
+    def is_navigation_request(self):
+        return self._navigation
+
+
+class _FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.result = None
+
+    async def abort(self, error_code=None):
+        self.result = "abort"
+
+    async def fallback(self):
+        self.result = "fallback"
+
+
+class _FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.routes = []
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def unroute(self, pattern, handler):
+        self.routes.remove((pattern, handler))
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+
+class ResourceBlockingTests(unittest.IsolatedAsyncioTestCase):
+    async def _route(self, handler, page, url, resource_type, **kwargs):
+        route = _FakeRoute(_FakeRequest(page, url, resource_type, **kwargs))
+        await handler(route)
+        return route.result
+
+    async def test_blocks_by_page_type_and_keeps_course_media(self):
+        from core.resource_blocking import block_resources
+
+        context = _FakeContext()
+        course_page = _FakePage(COURSE_URL)
+        subject_page = _FakePage(SUBJECT_URL)
+
+        with (
+            patch("core.resource_blocking.RESOURCE_BLOCKING", True),
+            self.assertLogs(level="INFO") as logs,
+        ):
+            async with block_resources(context, "本轮挂课") as stats:
+                (_, handler), = context.routes
+                for listener in context.listeners["page"]:
+                    listener(course_page)
+                    listener(subject_page)
+
+                results = [
+                    await self._route(handler, course_page, "https://cdn.example.com/v.mp4", "media"),
+                    await self._route(handler, course_page, "https://cdn.example.com/a.png", "image"),
+                    await self._route(handler, course_page, "https://cdn.example.com/f.woff2", "font"),
+                    await self._route(handler, subject_page, "https://cdn.example.com/b.png", "image"),
+                    await self._route(handler, subject_page, "https://hm.baidu.com/hm.js", "script"),
+                    await self._route(handler, subject_page, SUBJECT_URL, "document", navigation=True),
+                ]
+                for listener in subject_page.listeners["load"]:
+                    listener(subject_page)
+
+        self.assertEqual(
+            results,
+            ["fallback", "fallback", "abort", "abort", "abort", "fallback"],
+        )
+        self.assertEqual(stats.blocked["course"]["font"], 1)
+        self.assertEqual(stats.blocked["subject"]["image"], 1)
+        self.assertEqual(stats.blocked["subject"]["script"], 1)
+        self.assertEqual(len(stats.load_seconds["subject"]), 1)
+        self.assertEqual(context.routes, [])
+        self.assertEqual(context.listeners["page"], [])
+        self.assertEqual(subject_page.listeners["load"], [])
+        self.assertTrue(any("主题页: 拦截 2 个请求" in line for line in logs.output))
+
+    async def test_disabled_blocking_does_not_register_routes(self):
+        from core.resource_blocking import block_resources
+
+        context = _FakeContext()
+        with patch("core.resource_blocking.RESOURCE_BLOCKING", False):
+            async with block_resources(context, "本轮挂课") as stats:
+                self.assertIsNone(stats)
+
+        self.assertEqual(context.routes, [])
+        self.assertEqual(context.listeners, {})
+
+    def test_classify_page_url(self):
+        from core.resource_blocking import classify_page_url
+
+        self.assertEqual(classify_page_url(COURSE_URL), "course")
+        self.assertEqual(classify_page_url(SUBJECT_URL), "subject")
+        self.assertEqual(
+            classify_page_url("https://kc.zhixueyun.com/#/exam/exam/answer-paper/c"),
+            "exam",
+        )
+        self.assertEqual(classify_page_url("https://kc.zhixueyun.com/#/topic/d"), "learning_zone")
+        self.assertEqual(classify_page_url("about:blank"), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from core.spans import percentile, read_spans, record_span, span, summarize_spans
+
+
+class SpanTests(unittest.TestCase):
+    def test_span_appends_jsonl_record_with_detail(self):
+        with TemporaryDirectory() as tmp:
+            trace_file = Path(tmp) / "run_trace.jsonl"
+            with patch("core.spans.RUN_TRACE_ENABLED", True), patch("core.spans.RUN_TRACE_FILE", trace_file):
+                with span("goto", url="https://example.com"):
+                    pass
+
+            records = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["stage"], "goto")
+        self.assertEqual(records[0]["kind"], "work")
+        self.assertTrue(records[0]["ok"])
+        self.assertEqual(records[0]["detail"], {"url": "https://example.com"})
+
+    def test_span_marks_failure_on_exception_and_state_flag(self):
+        with TemporaryDirectory() as tmp:
+            trace_file = Path(tmp) / "run_trace.jsonl"
+            with patch("core.spans.RUN_TRACE_ENABLED", True), patch("core.spans.RUN_TRACE_FILE", trace_file):
+                with self.assertRaises(RuntimeError):
+                    with span("submit_exam"):
+                        raise RuntimeError("boom")
+                with span("chapter", kind="stage") as chapter_span:
+                    chapter_span.ok = False
+
+            spans = read_spans(trace_file)
+
+        self.assertEqual([record["ok"] for record in spans], [False, False])
+        self.assertEqual(spans[1]["kind"], "stage")
+
+    def test_record_span_does_nothing_when_disabled(self):
+        with TemporaryDirectory() as tmp:
+            trace_file = Path(tmp) / "run_trace.jsonl"
+            with patch("core.spans.RUN_TRACE_ENABLED", False):
+                record_span("goto", 1.0, file_path=trace_file)
+
+            self.assertFalse(trace_file.exists())
+
+    def test_read_spans_skips_broken_lines_and_missing_file(self):
+        with TemporaryDirectory() as tmp:
+            trace_file = Path(tmp) / "run_trace.jsonl"
+            self.assertEqual(read_spans(trace_file), [])
+            trace_file.write_text(
+                '{"stage": "goto", "seconds": 1.0}\n{"stage": \n[]\n',
+                encoding="utf-8",
+            )
+
+            self.assertEqual(read_spans(trace_file), [{"stage": "goto", "seconds": 1.0}])
+
+    def test_percentile_uses_nearest_rank(self):
+        values = [float(value) for value in range(1, 21)]
+
+        self.assertEqual(percentile(values, 0.5), 10.0)
+        self.assertEqual(percentile(values, 0.95), 19.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_summarize_spans_groups_stages_and_excludes_outer_stage_from_shares(self):
+        spans = [
+            {"run": "a", "stage": "video_wait", "kind": "fixed_wait", "seconds": 6.0},
+            {"run": "a", "stage": "readiness", "kind": "ready_wait", "seconds": 1.0},
+            {"run": "b", "stage": "goto", "kind": "work", "seconds": 2.0, "ok": False},
+            {"run": "b", "stage": "goto", "kind": "work", "seconds": 1.0},
+            {"run": "b", "stage": "chapter", "kind": "stage", "seconds": 10.0},
+        ]
+
+        summary = summarize_spans(spans)
+
+        self.assertEqual(summary.runs, 2)
+        self.assertEqual(summary.stages[0].stage, "chapter")
+        goto = next(stage for stage in summary.stages if stage.stage == "goto")
+        self.assertEqual((goto.count, goto.p50, goto.p95, goto.failures), (2, 1.0, 2.0, 1))
+        self.assertEqual(goto.label, "打开页面")
+        self.assertAlmostEqual(summary.share("fixed_wait"), 0.6)
+        self.assertAlmostEqual(summary.share("ready_wait"), 0.1)
+        self.assertAlmostEqual(summary.share("work"), 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
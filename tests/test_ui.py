@@ -3,60 +3,82 @@ import unittest
 from unittest.mock import AsyncMock, patch
 
 
-class FakeProgress:
-    def __init__(self, *args, **kwargs):
-        self.args = args
-        self.kwargs = kwargs
-        self.add_task_calls = []
-        self.update_calls = []
-        self.refresh_calls = 0
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        return False
+class FakeLive:
+    instances = []
 
-    def add_task(self, description, total):
-        self.add_task_calls.append((description, total))
-        return "task-1"
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.started = False
+        self.stopped = False
+        FakeLive.instances.append(self)
 
-    def update(self, task_id, advance):
-        self.update_calls.append((task_id, advance))
+    def start(self):
+        self.started = True
 
-    def refresh(self):
-        self.refresh_calls += 1
+    def stop(self):
+        self.stopped = True
 
 
 class UiProgressTests(unittest.TestCase):
-    def test_wait_with_progress_uses_ten_hz_rich_refresh(self):
+    def test_wait_with_progress_emits_one_timed_task_and_sleeps_once(self):
+        from core.progress import use_progress_listener
         from core.ui import wait_with_progress
 
         fake_sleep = AsyncMock()
-        created_progress = []
-
-        def make_progress(*args, **kwargs):
-            progress = FakeProgress(*args, **kwargs)
-            created_progress.append(progress)
-            return progress
+        events = []
 
-        with (
-            patch("core.ui.Progress", side_effect=make_progress),
-            patch("asyncio.sleep", fake_sleep),
-        ):
+        with use_progress_listener(events.append), patch("asyncio.sleep", fake_sleep):
             asyncio.run(wait_with_progress(3, description="视频学习进度"))
 
-        progress = created_progress[0]
-        self.assertTrue(progress.kwargs.get("auto_refresh", False))
-        self.assertEqual(progress.kwargs.get("refresh_per_second"), 10)
-        self.assertTrue(progress.kwargs.get("transient"))
-        self.assertEqual(progress.add_task_calls, [("视频学习进度", 3)])
-        self.assertEqual(progress.update_calls, [("task-1", 1), ("task-1", 1), ("task-1", 1)])
-        self.assertEqual(progress.refresh_calls, 0)
-        self.assertEqual(
-            [call.args[0] for call in fake_sleep.await_args_list],
-            [1, 1, 1],
-        )
+        self.assertEqual([event.kind for event in events], ["start", "finish"])
+        self.assertEqual(events[0].description, "视频学习进度")
+        self.assertEqual(events[0].total, 3)
+        self.assertEqual({event.task_id for event in events}, {events[0].task_id})
+        self.assertEqual([call.args[0] for call in fake_sleep.await_args_list], [3])
+
+    def test_dashboard_shares_one_bounded_live_display_between_tasks(self):
+        from core.progress import progress_task
+        from core.ui import DASHBOARD_REFRESH_PER_SECOND, progress_dashboard
+
+        FakeLive.instances = []
+        with patch("core.ui.Live", FakeLive), progress_dashboard() as dashboard:
+            with progress_task("挂课 1/2", detail="https://example.com/a"):
+                with progress_task("视频学习进度", total=60):
+                    self.assertEqual(len(dashboard.rows), 2)
+                with progress_task("挂课 2/2") as task:
+                    task.update(detail="https://example.com/b")
+                    self.assertEqual(
+                        [row.detail for row in dashboard.rows.values()],
+                        ["https://example.com/a", "https://example.com/b"],
+                    )
+            self.assertEqual(dashboard.rows, {})
+
+        self.assertEqual(len(FakeLive.instances), 1)
+        live = FakeLive.instances[0]
+        self.assertTrue(live.started)
+        self.assertTrue(live.stopped)
+        self.assertEqual(live.kwargs["refresh_per_second"], DASHBOARD_REFRESH_PER_SECOND)
+        self.assertLessEqual(DASHBOARD_REFRESH_PER_SECOND, 4)
+        self.assertTrue(live.kwargs["transient"])
+
+    def test_dashboard_render_derives_timed_progress_from_elapsed_time(self):
+        from core.progress import PROGRESS_START, ProgressEvent
+        from core.ui import ProgressDashboard
+
+        dashboard = ProgressDashboard()
+        with patch.object(ProgressDashboard, "_start"):
+            dashboard.handle(ProgressEvent(PROGRESS_START, 1, description="视频学习进度", total=60, at=100.0))
+            dashboard.handle(ProgressEvent(PROGRESS_START, 2, description="挂课 1/1", at=100.0))
+
+        with patch("core.ui.time.monotonic", return_value=130.0):
+            table = dashboard.render()
+
+        self.assertEqual(table.row_count, 2)
+        progress_cells = table.columns[1]._cells
+        self.assertEqual(progress_cells[0].completed, 30.0)
+        self.assertEqual(progress_cells[0].total, 60)
+        self.assertIsNone(progress_cells[1].total)
+        self.assertEqual(str(table.columns[2]._cells[0]), "00:30/01:00")
 
     def test_prompt_yes_no_uses_uppercase_choices_and_case_insensitive_input(self):
         from core.ui import prompt_yes_no